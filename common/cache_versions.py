@@ -0,0 +1,155 @@
+"""
+Per-model data versions: a generation counter per model in the cache
+backend, moved on by every committed write. Cached values built from a
+model's rows embed version_for(model) in their keys, so one counter
+increment retires all of them, for every user and worker.
+
+Writes reach the counter through
+- the post_save / post_delete receivers of common.custom_signals,
+- VersionedQuerySet, for bulk_create / bulk_update / update / delete,
+  which send no per-row signals,
+- explicit bump_data_version calls where SQL bypasses the ORM (fast wipe).
+
+Versions only reach other processes through a shared cache backend; see
+data_versions_shared.
+"""
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+
+
+# Cache key of the data-version counter of a model (its model_name, e.g. 'customer').
+DATA_VERSION_KEY = 'data_version:{name}'
+
+
+def _version_name(model):
+    return model if isinstance(model, str) else model._meta.model_name
+
+
+def data_versions_shared():
+    """
+    Whether data versions are seen by every process (settings.DATA_CACHE_SHARED).
+    With a per-process cache, bumps made by other processes (Celery imports,
+    other web workers) never arrive, so values cached under a version would
+    be served stale. Callers skip such caches when this is False.
+    """
+    return settings.DATA_CACHE_SHARED
+
+
+def get_data_version(name):
+    """
+    Current data version of `name`. Cached values built from the data embed it
+    in their keys, so a bump makes them unreachable instead of deleting them.
+
+    A missing counter (first use, eviction, cache restart) starts from the
+    current time in milliseconds, never from a value an older entry may
+    already carry.
+    """
+    key = DATA_VERSION_KEY.format(name=name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def version_for(model):
+    """Data version of a model class, instance or model_name – embed it in cache keys."""
+    return get_data_version(_version_name(model))
+
+
+class _DataVersionBump:
+    """
+    on_commit callback moving one data version on, at most once: every write
+    of a transaction registers the same instance, so only the first call of
+    the commit increments the counter.
+    """
+
+    def __init__(self, name, pending):
+        self.name = name
+        self.pending = pending
+        self.done = False
+
+    def __call__(self):
+        if self.done:
+            return
+        self.done = True
+        if self.pending.get(self.name) is self:
+            del self.pending[self.name]
+
+        key = DATA_VERSION_KEY.format(name=self.name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # counter missing – start a fresh one (see get_data_version)
+            cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+# Per database connection: model_name -> the _DataVersionBump its writes register.
+_pending_bumps = weakref.WeakKeyDictionary()
+
+
+def bump_data_version(name, using=None):
+    """
+    Moves the data version of `name` (a model_name or model) on once the
+    current transaction commits (right away outside a transaction), so no
+    reader can cache rows of the uncommitted state under the new version.
+
+    Bumps are coalesced per transaction: every write registers the same
+    pending callback, which increments the counter once, so deleting 10,000
+    rows one signal at a time still costs a single cache increment. A
+    rolled-back transaction or savepoint drops its registrations together
+    with its writes, and the next write registers the callback again.
+    """
+    name = _version_name(name)
+    pending = _pending_bumps.setdefault(transaction.get_connection(using), {})
+    bump = pending.get(name)
+    if bump is None:
+        bump = pending[name] = _DataVersionBump(name, pending)
+    transaction.on_commit(bump, using=using)
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    QuerySet of models whose cached data follows their data version: the
+    bulk writes below send no per-row signals, so they bump it themselves
+    (when they changed any rows). update() also sets the model's auto_now
+    fields (updated_at), as save() does. Use as `objects = VersionedQuerySet.as_manager()`.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            bump_data_version(self.model, using=self.db)
+        return created
+
+    def bulk_update(self, objs, *args, **kwargs):
+        updated = super().bulk_update(objs, *args, **kwargs)
+        if updated:
+            bump_data_version(self.model, using=self.db)
+        return updated
+
+    def update(self, **kwargs):
+        # update() skips auto_now; stamp it so change cursors (delta exports) see the rows
+        for field in self.model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) and field.name not in kwargs and field.attname not in kwargs:
+                kwargs[field.name] = timezone.now()
+        updated = super().update(**kwargs)
+        if updated:
+            bump_data_version(self.model, using=self.db)
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        deleted, per_model = super().delete()
+        if deleted:
+            bump_data_version(self.model, using=self.db)
+        return deleted, per_model
+
+    delete.alters_data = True
+    delete.queryset_only = True
@@ -103,13 +103,22 @@ class CustomModelBase(models.Model):
         :return: None
         """
         if not self.slug:
-            self.slug = (
-                    str(self.id)
-                    + '-'
-                    + self.full_name.lower().replace(' ', '-')
-            )
+            self.slug = self.build_slug()
         super().save(*args, **kwargs)
 
+    def build_slug(self) -> str:
+        """
+        Builds the slug that save() assigns when none is set yet.
+        Exposed separately so bulk paths (bulk_create skips save()) can
+        assign the same value.
+        :return: the slug string
+        """
+        return (
+                str(self.id)
+                + '-'
+                + self.full_name.lower().replace(' ', '-')
+        )
+
     def __str__(self) -> str:
         """
         String representation of the model instance.
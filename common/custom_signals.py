@@ -1,9 +1,15 @@
 import logging
 
 from django.contrib.auth.signals import user_logged_in
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from common import customer_typeahead
+from common.cache_versions import bump_data_version
+from ohmi_audit.main_app.models import Audit, Auditor, Customer, CustomerTombstone
+
 logger = logging.getLogger('ohmi_audit')
 
 
@@ -12,3 +18,33 @@ def log_user_login(sender, request, user, **kwargs):
     logger.info("User %s logged in at %s", user.username, timezone.now())
     # You can also log to a database:
     # LoginLog.objects.create(user=user, timestamp=timezone.now())
+
+
+@receiver(post_delete, sender=Customer)
+def record_customer_tombstone(sender, instance, origin=None, **kwargs):
+    # delta exports report deletions from these rows; queryset deletes
+    # record theirs set-based (CustomerQuerySet.delete)
+    if isinstance(origin, QuerySet):
+        return
+    CustomerTombstone.objects.create(BG_Vor_Nr=instance.BG_Vor_Nr)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+@receiver(post_save, sender=Audit)
+@receiver(post_delete, sender=Audit)
+@receiver(post_save, sender=Auditor)
+@receiver(post_delete, sender=Auditor)
+def bump_model_data_version(sender, **kwargs):
+    # cached search pages and row counts of the previous version are no longer served
+    bump_data_version(sender)
+
+
+@receiver(post_save, sender=Customer)
+def update_typeahead_on_save(sender, instance, **kwargs):
+    customer_typeahead.customer_saved(instance)
+
+
+@receiver(post_delete, sender=Customer)
+def update_typeahead_on_delete(sender, instance, **kwargs):
+    customer_typeahead.customer_deleted(instance.pk)
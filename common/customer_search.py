@@ -0,0 +1,137 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from common.cache_versions import data_versions_shared, get_data_version
+from common.row_counts import row_count
+
+
+# Customer fields matched (case-insensitive substring) by the search box.
+SEARCH_FIELDS = ('company_name_bg', 'company_name_en', 'BG_Vor_Nr', 'company_id', 'year', 'VAT_number')
+
+CUSTOMER_TABLE = 'main_app_customer'
+
+# SQLite: FTS5 table with the trigram tokenizer (substring matching, SQLite 3.34+),
+# kept in sync with the customer table by triggers (created by migration 0003).
+SEARCH_TABLE = 'main_app_customer_search'
+
+# Trigram indexes only answer queries of at least this many characters.
+MIN_INDEXED_QUERY_LENGTH = 3
+
+# Search responses: the columns customer_table.html shows, rows per page
+# (default / maximum), and how far the matches are counted before the
+# count is reported as an estimate ("1000+").
+SEARCH_RESULT_FIELDS = ('id', 'year', 'BG_Vor_Nr', 'company_name_bg', 'company_name_en', 'company_id', 'VAT_number')
+SEARCH_PAGE_SIZE = 50
+SEARCH_MAX_PAGE_SIZE = 200
+SEARCH_COUNT_LIMIT = 1000
+
+# Cached search pages live this long (seconds); edits make them unreachable
+# sooner by bumping the customer data version.
+SEARCH_CACHE_TIMEOUT = 60 * 10
+
+
+def _icontains_condition(search_query):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': search_query})
+    return condition
+
+
+def has_search_index(db=connection):
+    """
+    True when the SQLite FTS5 search table exists. On PostgreSQL the trigram
+    indexes serve the icontains lookups directly, so nothing is detected there.
+    """
+    if db.vendor != 'sqlite':
+        return False
+    with db.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+        return cursor.fetchone() is not None
+
+
+def search_customers(search_query, queryset=None):
+    """
+    Filters customers by the search box query. Shared by the index page search
+    and the search-scoped export, so an export holds exactly the rows found;
+    the query is normalized here (normalize_search_query) for every caller.
+
+    PostgreSQL: case-insensitive substring lookups, answered by the GIN
+    trigram indexes on UPPER(column::text) (migration 0003).
+    SQLite: a MATCH on the FTS5 trigram table when it is installed and the
+    query is long enough; otherwise the same lookups as on PostgreSQL.
+    :param search_query: The text typed into the search box.
+    :param queryset: Customer queryset to narrow down. Defaults to all customers.
+    :return: The filtered queryset (still lazy).
+    """
+    from ohmi_audit.main_app.models import Customer
+
+    if queryset is None:
+        queryset = Customer.objects.all()
+
+    search_query = normalize_search_query(search_query)
+    if len(search_query) >= MIN_INDEXED_QUERY_LENGTH and has_search_index():
+        # a quoted FTS5 string is a phrase; with the trigram tokenizer it
+        # matches any substring of the indexed columns
+        phrase = '"' + search_query.replace('"', '""') + '"'
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", [phrase],
+        ))
+
+    return queryset.filter(_icontains_condition(search_query))
+
+
+def search_page(search_query, limit=SEARCH_PAGE_SIZE, cursor=None):
+    """
+    One page of search results for the index page, ordered by id.
+    :param search_query: The text typed into the search box.
+    :param limit: Rows per page, capped at SEARCH_MAX_PAGE_SIZE.
+    :param cursor: The next_cursor of the previous page (None for the first page).
+    :return: dict with the rows (SEARCH_RESULT_FIELDS only), next_cursor (None
+             on the last page) and, on the first page, the count – exact up to
+             SEARCH_COUNT_LIMIT, beyond that count_is_estimate is True.
+    """
+    limit = max(1, min(limit, SEARCH_MAX_PAGE_SIZE))
+    matches = search_customers(search_query)
+
+    # keyset pagination: the id index finds the page start, however deep the page is
+    page = matches.order_by('id')
+    if cursor is not None:
+        page = page.filter(id__gt=cursor)
+    rows = list(page.values(*SEARCH_RESULT_FIELDS)[:limit + 1])
+    next_cursor = rows[limit - 1]['id'] if len(rows) > limit else None
+
+    result = {'results': rows[:limit], 'next_cursor': next_cursor}
+    if cursor is None:
+        # counted up to SEARCH_COUNT_LIMIT + 1 rows, and shared by every page size of the query
+        result['count'], result['count_is_estimate'] = row_count(matches, limit=SEARCH_COUNT_LIMIT)
+    return result
+
+
+def normalize_search_query(search_query):
+    """Trims the query and collapses runs of whitespace, so retyped searches share a cache entry."""
+    return ' '.join(search_query.split())
+
+
+def cached_search_page(search_query, limit=SEARCH_PAGE_SIZE, cursor=None):
+    """
+    search_page through the cache. The key holds the query (normalize it
+    first), the page (limit, cursor) and the customer data version, which
+    every Customer write bumps on commit – so a cached page is never older
+    than the last committed edit or import. Without a shared cache
+    (data_versions_shared) the page is searched every time.
+    """
+    limit = max(1, min(limit, SEARCH_MAX_PAGE_SIZE))
+    if not data_versions_shared():
+        return search_page(search_query, limit=limit, cursor=cursor)
+    digest = hashlib.sha1(search_query.encode('utf-8')).hexdigest()
+    key = f"customer_search:{get_data_version('customer')}:{digest}:{limit}:{cursor}"
+
+    page = cache.get(key)
+    if page is None:
+        page = search_page(search_query, limit=limit, cursor=cursor)
+        cache.set(key, page, SEARCH_CACHE_TIMEOUT)
+    return page
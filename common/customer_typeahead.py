@@ -0,0 +1,262 @@
+"""
+Customer typeahead: prefix suggestions for the search box, answered from a
+sorted in-memory key index kept by every worker process.
+"""
+import bisect
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from common.cache_versions import data_versions_shared, get_data_version
+
+logger = logging.getLogger('ohmi_audit')
+
+
+# Customer fields whose beginnings are suggested.
+TYPEAHEAD_FIELDS = ('BG_Vor_Nr', 'VAT_number', 'company_name_bg', 'company_name_en')
+
+# Suggestions per response (default / maximum).
+TYPEAHEAD_LIMIT = 10
+TYPEAHEAD_MAX_LIMIT = 50
+
+# Seconds between two checks of the customer data version. Writes made by
+# this process are applied at once; those of other workers within this delay.
+TYPEAHEAD_REFRESH_INTERVAL = 2.0
+
+# A refresh changing more than this fraction of the indexed customers
+# rebuilds the index: one sort beats thousands of insort/del on a long list.
+TYPEAHEAD_REBUILD_FRACTION = 0.005
+
+# Separates the parts of an index entry; sorts before every printable character.
+_SEP = '\x00'
+
+
+class CustomerTypeaheadIndex:
+    """
+    Sorted list of entries '<casefolded value>\\0<customer id>\\0<field index>'
+    – one per non-empty TYPEAHEAD_FIELDS value – plus the original values per
+    customer id. All entries starting with a prefix are adjacent in the list,
+    so a query is one bisect and a short forward scan.
+
+    Small changes are applied entry by entry (bisect.insort / del), so the
+    index is built once per process and then only follows the changed
+    customers; large ones (an import) rebuild it.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._rows = {}         # customer id -> TYPEAHEAD_FIELDS values
+        self._ids_by_key = {}   # BG_Vor_Nr -> customer id, to apply tombstones
+        self._lock = threading.Lock()
+        self.version = None
+        self.refreshed_at = None
+        self.checked_at = 0.0
+
+    @staticmethod
+    def _clean(values):
+        return tuple(str(value) if value is not None else '' for value in values)
+
+    @staticmethod
+    def _row_entries(customer_id, values):
+        return [
+            f"{value.casefold()}{_SEP}{customer_id}{_SEP}{field_index}"
+            for field_index, value in enumerate(values)
+            if value
+        ]
+
+    # ------------------------------------------------------------------
+    # Building and incremental changes
+    # ------------------------------------------------------------------
+    def build(self, rows):
+        """Replaces the content with `rows` – (id, *TYPEAHEAD_FIELDS values) tuples."""
+        entries, row_map, ids_by_key = [], {}, {}
+        for customer_id, *values in rows:
+            values = self._clean(values)
+            row_map[customer_id] = values
+            ids_by_key[values[0]] = customer_id
+            entries.extend(self._row_entries(customer_id, values))
+        entries.sort()
+
+        with self._lock:
+            self._entries, self._rows, self._ids_by_key = entries, row_map, ids_by_key
+
+    def _remove_locked(self, customer_id):
+        values = self._rows.pop(customer_id, None)
+        if values is None:
+            return
+        if self._ids_by_key.get(values[0]) == customer_id:
+            del self._ids_by_key[values[0]]
+        for entry in self._row_entries(customer_id, values):
+            position = bisect.bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+    def upsert(self, customer_id, values):
+        values = self._clean(values)
+        with self._lock:
+            self._remove_locked(customer_id)
+            self._rows[customer_id] = values
+            self._ids_by_key[values[0]] = customer_id
+            for entry in self._row_entries(customer_id, values):
+                bisect.insort(self._entries, entry)
+
+    def remove(self, customer_id):
+        with self._lock:
+            self._remove_locked(customer_id)
+
+    def remove_key(self, bg_vor_nr):
+        with self._lock:
+            customer_id = self._ids_by_key.get(bg_vor_nr)
+            if customer_id is not None:
+                self._remove_locked(customer_id)
+
+    def differences(self, rows, deleted_keys):
+        """
+        What a refresh has to change: the `rows` (customer id -> values) the
+        index holds differently, and the ids of indexed customers whose
+        BG_Vor_Nr is in `deleted_keys` and that are not among `rows`.
+        """
+        changed = {}
+        with self._lock:
+            for customer_id, values in rows.items():
+                values = self._clean(values)
+                if self._rows.get(customer_id) != values:
+                    changed[customer_id] = values
+            removed = {self._ids_by_key[key] for key in deleted_keys if key in self._ids_by_key} - rows.keys()
+        return changed, removed
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def suggest(self, prefix, limit=TYPEAHEAD_LIMIT):
+        """
+        Up to `limit` customers with a TYPEAHEAD_FIELDS value starting with
+        `prefix` (case-insensitive), in value order, one suggestion per customer.
+        """
+        prefix = prefix.strip().casefold()
+        if not prefix:
+            return []
+
+        suggestions, seen = [], set()
+        with self._lock:
+            position = bisect.bisect_left(self._entries, prefix)
+            while len(suggestions) < limit and position < len(self._entries):
+                entry = self._entries[position]
+                if not entry.startswith(prefix):
+                    break
+                position += 1
+
+                _value, customer_id, field_index = entry.rsplit(_SEP, 2)
+                customer_id, field_index = int(customer_id), int(field_index)
+                if customer_id in seen:
+                    continue
+                seen.add(customer_id)
+
+                values = self._rows[customer_id]
+                suggestions.append({
+                    'id': customer_id,
+                    'field': TYPEAHEAD_FIELDS[field_index],
+                    'value': values[field_index],
+                    'BG_Vor_Nr': values[0],
+                })
+        return suggestions
+
+    def __len__(self):
+        return len(self._rows)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _customer_rows(queryset):
+    return queryset.values_list('id', *TYPEAHEAD_FIELDS).iterator(chunk_size=2000)
+
+
+def get_typeahead_index():
+    """
+    The index of this process: built from the database on first use, then
+    brought up to date whenever the customer data version has moved – at most
+    every TYPEAHEAD_REFRESH_INTERVAL seconds – by reading only the customers
+    changed (updated_at) and deleted (CustomerTombstone) since the last refresh.
+    Without a shared cache (data_versions_shared) other processes' writes do
+    not move the version, so every check refreshes.
+
+    Rows become visible at commit but carry the time of their write, so each
+    refresh reads back settings.WRITE_TRANSACTION_MAX_SECONDS before the
+    previous one; rows read again unchanged cost no index update. When more
+    than TYPEAHEAD_REBUILD_FRACTION of the customers differ, the index is
+    rebuilt instead of updated row by row.
+    """
+    global _index
+    from ohmi_audit.main_app.models import Customer, CustomerTombstone
+
+    with _index_lock:
+        if _index is None:
+            index = CustomerTypeaheadIndex()
+            index.refreshed_at = timezone.now()
+            index.version = get_data_version('customer')
+            index.build(_customer_rows(Customer.objects.all()))
+            index.checked_at = time.monotonic()
+            logger.info("customer typeahead index built with %d customer(s)", len(index))
+            _index = index
+            return _index
+
+        index = _index
+        if time.monotonic() - index.checked_at < TYPEAHEAD_REFRESH_INTERVAL:
+            return index
+        index.checked_at = time.monotonic()
+
+        version = get_data_version('customer')
+        if version == index.version and data_versions_shared():
+            return index
+
+        since = index.refreshed_at - timedelta(seconds=settings.WRITE_TRANSACTION_MAX_SECONDS)
+        refreshed_at = timezone.now()
+        deleted_keys = set(
+            CustomerTombstone.objects.filter(deleted_at__gt=since).values_list('BG_Vor_Nr', flat=True)
+        )
+        rows = {
+            customer_id: values
+            for customer_id, *values in _customer_rows(Customer.objects.filter(updated_at__gt=since))
+        }
+        changed, removed = index.differences(rows, deleted_keys)
+
+        if len(changed) + len(removed) > len(index) * TYPEAHEAD_REBUILD_FRACTION:
+            index.build(_customer_rows(Customer.objects.all()))
+            logger.info(
+                "customer typeahead index rebuilt with %d customer(s) after %d change(s)",
+                len(index), len(changed) + len(removed),
+            )
+        else:
+            for customer_id in removed:
+                index.remove(customer_id)
+            for customer_id, values in changed.items():
+                index.upsert(customer_id, values)
+        index.refreshed_at, index.version = refreshed_at, version
+        return index
+
+
+def reset_typeahead_index():
+    """Drops the index of this process; the next query builds it again."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def customer_saved(instance):
+    """Applies a saved customer to this process's index once the save commits."""
+    if _index is not None:
+        values = [getattr(instance, field) for field in TYPEAHEAD_FIELDS]
+        transaction.on_commit(lambda: _index is not None and _index.upsert(instance.pk, values))
+
+
+def customer_deleted(customer_id):
+    """Removes a deleted customer from this process's index once the delete commits."""
+    if _index is not None:
+        transaction.on_commit(lambda: _index is not None and _index.remove(customer_id))
@@ -1,23 +1,263 @@
 """
-Db Management: delete, import from excel, export to excel.
+Db Management: delete, import from excel / csv, export to excel.
 """
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 
 from django.db import transaction
 from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 
+from common.cache_versions import bump_data_version, data_versions_shared, version_for
+from common.common_models_data import CustomModelData
+
 
 logger = logging.getLogger('ohmi_audit')
 
 
+# ----------------------------------------------------------------------
+# Cell converters for the import column maps (they get the stripped cell text)
+# ----------------------------------------------------------------------
+def _to_date(value):
+    """ISO dates (also the 'YYYY-MM-DD HH:MM:SS' text of Excel date cells), or DD.MM.YYYY / DD/MM/YYYY."""
+    import datetime
+
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        pass
+    for date_format in ('%d.%m.%Y', '%d/%m/%Y'):
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError("expected a date like 2026-01-31 or 31.01.2026")
+
+
+def _to_bool(value):
+    """Yes / no cells: true/false, yes/no, 1/0, x (Excel TRUE / FALSE cells read as 'True' / 'False')."""
+    normalised = value.lower()
+    if normalised in ('true', 'yes', 'y', '1', 'x'):
+        return True
+    if normalised in ('false', 'no', 'n', '0'):
+        return False
+    raise ValueError("expected yes / no")
+
+
+def _to_audit_category(value):
+    """An AUDIT_CATEGORY_CHOICES value or label, case-insensitive."""
+    normalised = value.lower()
+    for choice, label in CustomModelData.AUDIT_CATEGORY_CHOICES:
+        if normalised in (choice, label.lower()):
+            return choice
+    raise ValueError(
+        "expected one of " + ', '.join(label for _choice, label in CustomModelData.AUDIT_CATEGORY_CHOICES)
+    )
+
+
+def _build_records_chunk(chunk, header_map, sheet_key='customers'):
+    """
+    Process-pool worker for the parallel import: run _build_record with the
+    column map of `sheet_key` over a chunk of (row_num, row) pairs.
+
+    Module-level so it can be pickled. Returns (records, errors, blank_count):
+      - records – [(row_num, record)] for the validated rows
+      - errors  – [(row_num, row, message)] for the rejected rows
+    Row numbers travel with the rows, so error reports stay accurate no matter
+    which process built the record.
+    """
+    columns = DbManagement.IMPORT_SHEETS[sheet_key]['columns']
+    records, errors, blank_count = [], [], 0
+    for row_num, row in chunk:
+        try:
+            record = DbManagement._build_record(row, header_map, columns)
+        except Exception as row_err:
+            errors.append((row_num, row, str(row_err)))
+            continue
+
+        if record is None:
+            blank_count += 1
+        else:
+            records.append((row_num, record))
+
+    return records, errors, blank_count
+
+
+class ImportErrorReport:
+    """
+    Collects the rows rejected by an import into a CSV report.
+
+    Rows are written to an anonymous temporary file as they are rejected, so
+    memory stays flat however many rows fail. The report has the columns of
+    the uploaded file followed by 'Row' and 'Error' – the operator can fix the
+    values in place and re-import it (the extra columns are ignored).
+    A multi-sheet import gets a section per sheet with rejected rows, each
+    starting with that sheet's header row, and rows numbered 'Sheet!row'.
+    Nothing is stored unless save() is called with at least one row written.
+    """
+    def __init__(self, header=()):
+        self.header = header
+        self.sheet = None
+        self.count = 0
+        self._file = None
+        self._writer = None
+        self._header_written = False
+
+    def start_sheet(self, header, sheet=None):
+        """Rows added from now on come from the sheet titled `sheet` with this header row."""
+        self.header = header
+        self.sheet = sheet
+        self._header_written = False
+
+    def add(self, row_num, row, message):
+        """
+        Append a rejected row. `row` holds the original cell values (None for
+        rows that only failed when written to the database).
+        """
+        import csv
+        import io
+        import tempfile
+
+        if self._writer is None:
+            self._file = io.TextIOWrapper(tempfile.TemporaryFile(), encoding='utf-8-sig', newline='')
+            self._writer = csv.writer(self._file)
+        if not self._header_written:
+            if self.count:
+                self._writer.writerow([])   # blank line between the sheet sections
+            self._writer.writerow([*('' if cell is None else cell for cell in self.header), 'Row', 'Error'])
+            self._header_written = True
+
+        cells = ['' if cell is None else cell for cell in row] if row is not None else []
+        cells += [''] * (len(self.header) - len(cells))
+        self._writer.writerow([*cells, f'{self.sheet}!{row_num}' if self.sheet else row_num, message])
+        self.count += 1
+
+    def save(self, storage, name):
+        """
+        Store the report in `storage` under `name` (the storage may alter it)
+        and return the stored name; None when no row was rejected.
+        """
+        from django.core.files import File
+
+        if not self.count:
+            return None
+        self._file.flush()
+        self._file.buffer.seek(0)
+        return storage.save(name, File(self._file.buffer))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 class DbManagement:
     """
     This class is responsible for managing the database, including deleting records, importing data
     from Excel files, and exporting data to Excel files.
     """
+    # Number of valid rows written per bulk query.
+    IMPORT_BATCH_SIZE = 1000
+
+    # Importable sheets, in dependency order (a sheet is written before the ones below it).
+    #   - sheet_names – accepted worksheet titles (normalised: stripped + lowercase)
+    #   - key         – unique field the rows are upserted on
+    #   - columns     – normalised Excel header → (model field, converter[, default]);
+    #                   columns with a default are optional
+    # --- Edit these column maps when the Excel template changes ---
+    IMPORT_SHEETS = {
+        'customers': {
+            'label': _('Customers'),
+            'model': 'Customer',
+            'key': 'BG_Vor_Nr',
+            'sheet_names': ('customers', 'customer'),
+            'columns': {
+                'year':           ('year',           int),   # A – year
+                'bg vor.nr.':     ('BG_Vor_Nr',       str),   # B – unique identifier
+                'unternehmen-bg': ('company_name_bg', str),   # C – Bulgarian company name
+                'unternehmen-en': ('company_name_en', str),   # D – English company name
+                'company id':     ('company_id',      int),   # E – numeric company ID
+                'vat':            ('VAT_number',       str),   # F – VAT number
+            },
+        },
+        'auditors': {
+            'label': _('Auditors'),
+            'model': 'Auditor',
+            'key': 'email',
+            'sheet_names': ('auditors', 'auditor'),
+            'columns': {
+                'first name': ('first_name', str),
+                'last name':  ('last_name',  str),
+                'email':      ('email',      str),   # unique identifier
+                'phone':      ('phone',      str),
+            },
+        },
+        'audits': {
+            'label': _('Audits'),
+            'model': 'Audit',
+            'key': 'name',
+            'sheet_names': ('audits', 'audit'),
+            'columns': {
+                'name':        ('name',        str),   # unique identifier
+                'date':        ('date',        _to_date),
+                'description': ('description', str,                ''),
+                'category':    ('category',    _to_audit_category, 'other'),
+                'is active':   ('is_active',   _to_bool,           True),
+            },
+        },
+    }
+
+    # Report the peak resident memory of the importing process (getrusage – no
+    # tracing overhead; unavailable on Windows, where it is reported as None).
+    IMPORT_TRACK_MEMORY = True
+
+    # Storage directory where uploads wait for the background import task.
+    IMPORT_SPOOL_DIR = 'import_uploads'
+
+    # Private storage directory for the CSV reports of rejected import rows,
+    # and how long (seconds) a report is kept.
+    IMPORT_REPORT_DIR = 'import_reports'
+    IMPORT_REPORT_MAX_AGE = 60 * 60 * 24 * 7
+
+    # Dry-run preview: keys looked up per query, and examples listed per category.
+    PREVIEW_LOOKUP_SIZE = 10_000
+    PREVIEW_SAMPLE_SIZE = 50
+
+    # Text upload extensions parsed with the csv module instead of openpyxl.
+    IMPORT_TEXT_FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.txt': 'csv'}
+
+    # Fast wipe: threads deleting the media files after the commit.
+    MEDIA_DELETE_WORKERS = 8
+
+    # Customer export columns – the headers must match the customers column map
+    # so an export can be re-imported without edits.
+    EXPORT_HEADERS = ['year', 'BG Vor.Nr.', 'Unternehmen-bg', 'Unternehmen-en', 'Company ID', 'VAT']
+    EXPORT_FIELDS = ['year', 'BG_Vor_Nr', 'company_name_bg', 'company_name_en', 'company_id', 'VAT_number']
+
+    # Streaming export: rows fetched per database round trip, and rows sampled
+    # to estimate the column widths.
+    EXPORT_CHUNK_SIZE = 2000
+    EXPORT_WIDTH_SAMPLE_SIZE = 500
+
+    # Storage directory for the cached export workbooks (see export_to_storage).
+    EXPORT_DIR = 'customer_exports'
+
+    # Streaming text exports: content type per format, and the bytes collected
+    # before a chunk is handed to the response (one write per chunk, not per row).
+    EXPORT_STREAM_FORMATS = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+    }
+    EXPORT_STREAM_BUFFER_SIZE = 64 * 1024
+
     @staticmethod
-    def delete_database():
+    def delete_database(fast=False):
         """
         Deletes all records from the application tables (Audit, Auditor, Customer)
         and removes any associated media files (images / uploaded files).
@@ -26,6 +266,16 @@ class DbManagement:
         All deletions run inside a single atomic transaction so that any
         unexpected error will roll back every change made so far.
 
+        The customers' tombstones (for delta exports) are recorded with one
+        INSERT ... SELECT (CustomerQuerySet.delete). The rows themselves are
+        still loaded and deleted by primary key, because the post_delete
+        receivers of common.custom_signals (data versions, typeahead) need
+        every instance – a cost that grows with the tables.
+
+        With fast=True the tables are wiped set-based, without loading rows or
+        sending signals, and the media files are removed after the commit
+        instead (see _fast_wipe).
+
         Returns a translated success message on completion.
         Raises an exception on failure (the view layer catches it).
         """
@@ -33,6 +283,9 @@ class DbManagement:
         from ohmi_audit.main_app.models import Audit, Auditor, Customer, AppUser
 
         try:
+            if fast:
+                return DbManagement._fast_wipe()
+
             with transaction.atomic():
                 # ------------------------------------------------------------------
                 # Step 1 – remove media files that belong to Audit records BEFORE
@@ -66,21 +319,111 @@ class DbManagement:
                     audit_count, auditor_count, customer_count, user_count,
                 )
 
-            return format_lazy(
-                _(
-                    "Database deleted successfully. "
-                    "Removed {a} audit(s), {au} auditor(s), {c} customer(s), {u} user(s)."
-                ),
-                a=audit_count,
-                au=auditor_count,
-                c=customer_count,
-                u=user_count,
-            )
+            return DbManagement._delete_message(audit_count, auditor_count, customer_count, user_count)
 
         except Exception as exc:
             logger.error("delete_database failed: %s", exc, exc_info=True)
             raise
 
+    @staticmethod
+    def _delete_message(audit_count, auditor_count, customer_count, user_count):
+        return format_lazy(
+            _(
+                "Database deleted successfully. "
+                "Removed {a} audit(s), {au} auditor(s), {c} customer(s), {u} user(s)."
+            ),
+            a=audit_count,
+            au=auditor_count,
+            c=customer_count,
+            u=user_count,
+        )
+
+    @staticmethod
+    def _fast_wipe():
+        """
+        Fast variant of delete_database: the transaction holds no storage
+        calls and no per-row work, so its lock window stays in milliseconds.
+
+        Step 1 – collect the media names of every Audit with one values_list.
+        Step 2 – record CustomerTombstones for the delta export with one
+                 INSERT ... SELECT (the post_delete receiver does not run).
+        Step 3 – empty the Audit, Auditor and Customer tables with the
+                 backend's flush statements (TRUNCATE on PostgreSQL, DELETE
+                 elsewhere) – no rows are loaded and no signals are sent.
+        Step 4 – after the commit, delete the media files on a thread pool
+                 (_delete_media_files). A rollback leaves them untouched.
+
+        Returns the delete_database success message.
+        """
+        import functools
+        from django.core.management.color import no_style
+        from django.db import connection
+        from django.db.models import Q
+        from ohmi_audit.main_app.models import Audit, Auditor, Customer, CustomerTombstone, AppUser
+
+        media_fields = [Audit._meta.get_field('image'), Audit._meta.get_field('file')]
+
+        with transaction.atomic():
+            # ------------------------------------------------------------------
+            # Step 1 – media names (deleted only once the rows are gone for good)
+            # ------------------------------------------------------------------
+            media = [
+                (field.storage, name)
+                for names in Audit.objects.filter(Q(image__gt='') | Q(file__gt='')).values_list('image', 'file')
+                for field, name in zip(media_fields, names)
+                if name
+            ]
+
+            audit_count = Audit.objects.count()
+            auditor_count = Auditor.objects.count()
+            customer_count = Customer.objects.count()
+
+            # ------------------------------------------------------------------
+            # Step 2 – tombstones for every customer key, set-based
+            # ------------------------------------------------------------------
+            CustomerTombstone.record(Customer.objects.all())
+
+            # ------------------------------------------------------------------
+            # Step 3 – set-based wipe of the application tables
+            # ------------------------------------------------------------------
+            tables = [model._meta.db_table for model in (Audit, Auditor, Customer)]
+            connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables))
+
+            # Delete non-superuser / non-staff app users (few rows, and their
+            # group / permission links need the regular cascade).
+            user_count, _d = AppUser.objects.filter(is_superuser=False, is_staff=False).delete()
+
+            transaction.on_commit(functools.partial(DbManagement._delete_media_files, media))
+            for model in (Audit, Auditor, Customer):
+                bump_data_version(model)
+
+        logger.info(
+            "DB fast wipe completed – Audits: %d, Auditors: %d, Customers: %d, Users: %d, media files queued: %d",
+            audit_count, auditor_count, customer_count, user_count, len(media),
+        )
+        return DbManagement._delete_message(audit_count, auditor_count, customer_count, user_count)
+
+    @staticmethod
+    def _delete_media_file(storage, name):
+        try:
+            storage.delete(name)
+        except Exception as file_err:
+            logger.warning("Could not delete media file '%s': %s", name, file_err)
+
+    @staticmethod
+    def _delete_media_files(media):
+        """
+        Deletes the (storage, name) pairs on a thread pool of
+        MEDIA_DELETE_WORKERS threads and returns the futures without waiting
+        for them – the request that ran the wipe is not held up by storage.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=DbManagement.MEDIA_DELETE_WORKERS)
+        futures = [executor.submit(DbManagement._delete_media_file, storage, name) for storage, name in media]
+        executor.shutdown(wait=False)
+        return futures
+
     # ------------------------------------------------------------------
     # Private helpers for import_from_excel
     # ------------------------------------------------------------------
@@ -98,6 +441,102 @@ class DbManagement:
         wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
         return wb.active
 
+    @staticmethod
+    def _detect_import_format(uploaded_file):
+        """
+        Step 1 – Decide how to parse an upload: returns 'xlsx', 'csv' or 'tsv'.
+
+        The file extension decides when there is one; otherwise (e.g. a bare
+        BytesIO) the content is sniffed – .xlsx files are zip archives and
+        start with the 'PK' signature.
+        """
+        import os
+
+        extension = os.path.splitext(getattr(uploaded_file, 'name', None) or '')[1].lower()
+        if extension in DbManagement.IMPORT_TEXT_FORMATS:
+            return DbManagement.IMPORT_TEXT_FORMATS[extension]
+        if extension == '.xlsx':
+            return 'xlsx'
+
+        signature = uploaded_file.read(4)
+        uploaded_file.seek(0)
+        return 'xlsx' if signature == b'PK\x03\x04' else 'csv'
+
+    @staticmethod
+    def _iter_csv_rows(uploaded_file, delimiter=None):
+        """
+        Step 1 – Stream the rows of a CSV / TSV upload as tuples of strings.
+
+        The binary upload is decoded on the fly (utf-8-sig also strips the BOM
+        Excel writes), so the file is never read into memory as a whole.
+        Without an explicit `delimiter`, it is sniffed from the header line
+        (comma, semicolon or tab).
+        """
+        import csv
+        import io
+
+        text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+        try:
+            if delimiter is None:
+                header_line = text.readline()
+                if not header_line:
+                    return   # empty file
+                try:
+                    delimiter = csv.Sniffer().sniff(header_line, delimiters=',;\t').delimiter
+                except csv.Error:
+                    delimiter = ','
+                # Re-parse the header line so quoted titles are handled by the reader
+                yield from (tuple(row) for row in csv.reader([header_line], delimiter=delimiter))
+
+            for row in csv.reader(text, delimiter=delimiter):
+                yield tuple(row)
+        finally:
+            text.detach()   # leave the upload open – its owner closes it
+
+    @staticmethod
+    @contextmanager
+    def _open_import_sheets(uploaded_file):
+        """
+        Step 1 – Open an .xlsx, .csv or .tsv upload and yield its sheets as a
+        list of (sheet_key, title, rows, total) in IMPORT_SHEETS order.
+
+        A workbook is matched sheet by sheet against IMPORT_SHEETS by title;
+        a workbook without any known sheet title (the single-sheet template)
+        and CSV / TSV files are read as customers, with title None.
+        `rows` lazily yields one tuple per line / worksheet row, header first,
+        so every format feeds the same pipeline (_map_headers, _build_record).
+        `total` is the number of data rows the sheet declares, when known
+        (only .xlsx files carry a sheet dimension).
+        """
+        import_format = DbManagement._detect_import_format(uploaded_file)
+
+        if import_format == 'xlsx':
+            ws = DbManagement._load_worksheet(uploaded_file)
+            try:
+                by_title = {}
+                for sheet in ws.parent.worksheets:
+                    by_title.setdefault(str(sheet.title).strip().lower(), sheet)
+
+                sheets = []
+                for sheet_key, spec in DbManagement.IMPORT_SHEETS.items():
+                    sheet = next((by_title[name] for name in spec['sheet_names'] if name in by_title), None)
+                    if sheet is not None:
+                        sheets.append((sheet_key, sheet.title, sheet))
+                if not sheets:
+                    sheets = [('customers', None, ws)]
+
+                yield [
+                    # The sheet dimension is only an estimate (trailing blank rows count)
+                    (sheet_key, title, sheet.iter_rows(values_only=True),
+                     max(sheet.max_row - 1, 0) if sheet.max_row else None)
+                    for sheet_key, title, sheet in sheets
+                ]
+            finally:
+                ws.parent.close()   # read-only workbooks keep the file handle open
+        else:
+            delimiter = '\t' if import_format == 'tsv' else None
+            yield [('customers', None, DbManagement._iter_csv_rows(uploaded_file, delimiter), None)]
+
     @staticmethod
     def _map_headers(header_row):
         """
@@ -114,27 +553,19 @@ class DbManagement:
         }
 
     @staticmethod
-    def _build_customer_record(row, header_map):
+    def _build_record(row, header_map, columns):
         """
-        Step 3 – Convert one worksheet row into a Customer field dict.
+        Step 3 – Convert one worksheet row into a model field dict.
 
-        COLUMN_MAP ties each normalised Excel header to:
-          - the matching Customer model field name
-          - a type converter (str / int) applied to the raw cell value
+        `columns` is the column map of an IMPORT_SHEETS entry, tying each
+        normalised header to the model field and a type converter applied to
+        the stripped cell text. Optional columns (entries with a default) that
+        are missing from the sheet are left out of the record, so re-imports
+        keep the stored values; an empty optional cell gets the default.
 
         Returns None for blank rows (they are silently skipped).
         Raises ValueError with a descriptive message for bad data.
         """
-        # --- Edit this dict when the Excel template changes ---
-        COLUMN_MAP = {
-            'year':           ('year',           int),   # A – year
-            'bg vor.nr.':     ('BG_Vor_Nr',       str),   # B – unique identifier
-            'unternehmen-bg': ('company_name_bg', str),   # C – Bulgarian company name
-            'unternehmen-en': ('company_name_en', str),   # D – English company name
-            'company id':     ('company_id',      int),   # E – numeric company ID
-            'vat':            ('VAT_number',       str),   # F – VAT number
-        }
-
         values = list(row)
 
         # Skip rows where every cell is empty
@@ -142,17 +573,22 @@ class DbManagement:
             return None
 
         record = {}
-        for header_key, (field_name, converter) in COLUMN_MAP.items():
+        for header_key, (field_name, converter, *default) in columns.items():
             col_idx = header_map.get(header_key)
 
             # Guard: required column missing from the file
             if col_idx is None:
+                if default:
+                    continue
                 raise ValueError(f"Required column '{header_key}' not found in the Excel file")
 
             raw = values[col_idx] if col_idx < len(values) else None
 
             # Guard: required field is empty in this row
             if raw is None or str(raw).strip() == '':
+                if default:
+                    record[field_name] = default[0]
+                    continue
                 raise ValueError(f"Empty value for required field '{field_name}'")
 
             # Convert to the correct Python type
@@ -163,92 +599,680 @@ class DbManagement:
 
         return record
 
+    @staticmethod
+    def _build_customer_record(row, header_map):
+        """Step 3 – _build_record with the Customers column map."""
+        return DbManagement._build_record(row, header_map, DbManagement.IMPORT_SHEETS['customers']['columns'])
+
+    @staticmethod
+    def _import_model(sheet_key):
+        """The model class an IMPORT_SHEETS entry writes to."""
+        from ohmi_audit.main_app import models
+        return getattr(models, DbManagement.IMPORT_SHEETS[sheet_key]['model'])
+
+    @staticmethod
+    def _record_digest(values):
+        """
+        Stable digest of a record's non-key values, given in column-map order.
+        An incoming record and the stored row hash the same exactly when a
+        re-import would not change anything.
+        """
+        import hashlib
+        return hashlib.blake2b(repr(tuple(values)).encode('utf-8'), digest_size=16).digest()
+
+    @staticmethod
+    def _write_batch(sheet_key, batch, counts, on_error=None):
+        """
+        Step 4 – Upsert one batch of (row_num, record) pairs of one sheet.
+
+        Existing keys of the batch (the sheet's 'key' field, e.g. BG_Vor_Nr)
+        are loaded with a single query, then new rows go through bulk_create
+        and existing rows through bulk_update – a handful of queries per batch
+        instead of a SELECT plus an INSERT / UPDATE for every row. Only the
+        fields present in the records are updated.
+
+        Existing rows whose stored values hash the same as the incoming record
+        (_record_digest) are counted as 'unchanged' and not written at all, so
+        re-importing the same workbook costs reads only and keeps updated_at.
+
+        A key repeated inside the batch keeps its last record and counts the
+        extra occurrences as updates (as unchanged when the winning record
+        matches the stored row), like consecutive update_or_create calls.
+
+        The batch runs in its own savepoint. If the bulk write fails (e.g. a
+        value the database rejects, or a key inserted concurrently) the batch
+        is rolled back and replayed row by row, so only the offending rows are
+        counted as errors.
+
+        `counts` is updated in place ('created', 'updated', 'unchanged', 'errors');
+        rows rejected by the database are passed to `on_error(row_num, None, message)`.
+        """
+        from collections import Counter
+        from django.utils import timezone
+
+        model = DbManagement._import_model(sheet_key)
+        key_field = DbManagement.IMPORT_SHEETS[sheet_key]['key']
+        # Every record of a sheet has the same fields (those of its header row)
+        fields = [field for field in batch[0][1] if field != key_field]
+
+        # Collapse duplicate keys – the last row in the file wins
+        records_by_key = {}
+        occurrences = Counter()
+        for row_num, record in batch:
+            key = record[key_field]
+            occurrences[key] += 1
+            records_by_key[key] = (row_num, record)
+
+        try:
+            with transaction.atomic():
+                existing = {
+                    key: (pk, DbManagement._record_digest(values))
+                    for key, pk, *values in (
+                        model.objects
+                        .filter(**{f'{key_field}__in': list(records_by_key)})
+                        .values_list(key_field, 'pk', *fields)
+                    )
+                }
+
+                now = timezone.now()
+                to_create, to_update = [], []
+                duplicates = unchanged = 0
+                for key, (_row_num, record) in records_by_key.items():
+                    extra = occurrences[key] - 1
+                    if key not in existing:
+                        obj = model(**record)
+                        obj.slug = obj.build_slug()   # bulk_create skips save()
+                        to_create.append(obj)
+                        duplicates += extra
+                        continue
+
+                    pk, stored_digest = existing[key]
+                    if stored_digest == DbManagement._record_digest(record[field] for field in fields):
+                        unchanged += 1 + extra
+                    else:
+                        # updated_at is set explicitly because bulk_update bypasses auto_now
+                        to_update.append(model(pk=pk, updated_at=now, **record))
+                        duplicates += extra
+
+                if to_create:
+                    model.objects.bulk_create(to_create)
+                if to_update:
+                    model.objects.bulk_update(to_update, [*fields, 'updated_at'])
+
+        except Exception as batch_err:
+            logger.warning(
+                "import_from_excel – %s: bulk write of rows %d-%d failed (%s), retrying row by row",
+                sheet_key, batch[0][0], batch[-1][0], batch_err,
+            )
+            DbManagement._write_rows(sheet_key, batch, counts, on_error)
+            return
+
+        counts['created'] += len(to_create)
+        counts['updated'] += len(to_update) + duplicates
+        counts['unchanged'] += unchanged
+        logger.info(
+            "import_from_excel – %s: rows %d-%d written (created: %d, updated: %d, unchanged: %d)",
+            sheet_key, batch[0][0], batch[-1][0], len(to_create), len(to_update) + duplicates, unchanged,
+        )
+
+    @staticmethod
+    def _write_rows(sheet_key, batch, counts, on_error=None):
+        """
+        Fallback for _write_batch – upsert the rows one at a time
+        (update_or_create on the sheet's key), each in its own savepoint, so a
+        single bad row is logged and skipped without blocking the others.
+        Rows identical to the stored record are counted as unchanged.
+        """
+        model = DbManagement._import_model(sheet_key)
+        key_field = DbManagement.IMPORT_SHEETS[sheet_key]['key']
+
+        for row_num, record in batch:
+            try:
+                with transaction.atomic():
+                    lookup   = {key_field: record[key_field]}
+                    defaults = {k: v for k, v in record.items() if k != key_field}
+                    stored = model.objects.filter(**lookup).values(*defaults).first()
+                    if stored == defaults:
+                        counts['unchanged'] += 1
+                        continue
+
+                    _obj, created = model.objects.update_or_create(**lookup, defaults=defaults)
+
+                counts['created' if created else 'updated'] += 1
+
+            except Exception as row_err:
+                counts['errors'] += 1
+                logger.warning("import_from_excel – %s: row %d skipped: %s", sheet_key, row_num, row_err)
+                if on_error is not None:
+                    on_error(row_num, None, str(row_err))
+
     # ------------------------------------------------------------------
-    # Public method
+    # Streaming pipeline: read → build records → batch → write
     # ------------------------------------------------------------------
     @staticmethod
-    def import_from_excel(uploaded_file):
+    def _iter_records(sheet_key, rows, header_map, counts, on_error=None):
         """
-        Reads an .xlsx file uploaded through the form and upserts Customer
-        records into the database.
+        Pipeline stage – turn data rows into (row_num, record) pairs.
 
-        Strategy – update_or_create keyed on BG_Vor_Nr (the unique identifier):
-          - first import  → creates new rows
-          - re-import     → updates existing rows instead of raising IntegrityError
+        `rows` is the row iterator positioned after the header row, so the
+        first data row is Excel row 2. Every row read is counted in
+        counts['processed']; blank rows and rows rejected by _build_record
+        are counted in `counts` and not yielded.
+        `on_error(row_num, row, message)`, when given, is called for each rejected row.
+        """
+        columns = DbManagement.IMPORT_SHEETS[sheet_key]['columns']
 
-        Row-level errors are logged and skipped so one bad row never blocks
-        the rest of the file from being imported.
+        for row_num, row in enumerate(rows, start=2):
+            counts['processed'] += 1
+            try:
+                record = DbManagement._build_record(row, header_map, columns)
+            except Exception as row_err:
+                counts['errors'] += 1
+                logger.warning("import_from_excel – %s: row %d skipped: %s", sheet_key, row_num, row_err)
+                if on_error is not None:
+                    on_error(row_num, row, str(row_err))
+                continue
+
+            # Blank row – skip silently
+            if record is None:
+                counts['skipped'] += 1
+                continue
+
+            yield row_num, record
 
-        Returns a translated summary message with created / updated / skipped counts.
+    @staticmethod
+    def _iter_records_parallel(sheet_key, rows, header_map, counts, executor, workers, on_error=None):
         """
-        from ohmi_audit.main_app.models import Customer
+        Pipeline stage – same contract as _iter_records, but the record
+        building / validation runs on a process pool.
 
-        # ----------------------------------------------------------------
-        # Step 1 – load the workbook
-        # ----------------------------------------------------------------
-        ws = DbManagement._load_worksheet(uploaded_file)
-        rows = list(ws.iter_rows(values_only=True))
+        Data rows are split into chunks of IMPORT_BATCH_SIZE and sent to
+        `executor`; only validated records (plus the rejected rows and their
+        messages) come back. At most 2 chunks per worker are in flight, so
+        memory stays bounded, and chunks are yielded in file order.
+        """
+        from collections import deque
 
-        if not rows:
-            raise ValueError("The uploaded Excel file is empty.")
+        in_flight = deque()
+        numbered_rows = enumerate(rows, start=2)
 
-        # ----------------------------------------------------------------
-        # Step 2 – map header names → column indices
-        # ----------------------------------------------------------------
-        header_map = DbManagement._map_headers(rows[0])
-        logger.info("Excel headers detected: %s", header_map)
+        def collect(future):
+            records, errors, blank_count = future.result()
+            counts['skipped'] += blank_count
+            for row_num, row, message in errors:
+                counts['errors'] += 1
+                logger.warning("import_from_excel – %s: row %d skipped: %s", sheet_key, row_num, message)
+                if on_error is not None:
+                    on_error(row_num, row, message)
+            return records
+
+        for chunk in DbManagement._iter_batches(numbered_rows, DbManagement.IMPORT_BATCH_SIZE):
+            counts['processed'] += len(chunk)
+            in_flight.append(executor.submit(_build_records_chunk, chunk, header_map, sheet_key))
+            if len(in_flight) >= workers * 2:
+                yield from collect(in_flight.popleft())
+
+        while in_flight:
+            yield from collect(in_flight.popleft())
+
+    @staticmethod
+    def _import_workers():
+        """
+        Number of processes for the parallel import (settings.DB_IMPORT_WORKERS).
+
+        Returns 0 – parse in-process – when the setting is 0/1 or when running
+        inside a daemonic process (e.g. a prefork Celery child), which is not
+        allowed to start a process pool.
+        """
+        import multiprocessing
+        from django.conf import settings
+
+        workers = getattr(settings, 'DB_IMPORT_WORKERS', 0)
+        if workers <= 1:
+            return 0
+        if multiprocessing.current_process().daemon:
+            logger.warning(
+                "import_from_excel – DB_IMPORT_WORKERS=%d ignored in a daemonic process, parsing in-process; "
+                "run imports on a `-P solo` worker of the CELERY_IMPORT_QUEUE queue",
+                workers,
+            )
+            return 0
+        return workers
 
+    @staticmethod
+    def _iter_batches(items, size):
+        """
+        Pipeline stage – group an iterable into lists of at most `size` items,
+        holding only one batch in memory at a time.
+        """
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    @contextmanager
+    def _open_import_records(uploaded_file, counts, on_error=None):
+        """
+        Steps 1-3 of the pipeline, shared by the import and its dry-run
+        preview: open the upload and yield a lazy stream of
+        (sheet_key, title, header_row, records) per sheet, in IMPORT_SHEETS
+        (dependency) order – records being the validated (row_num, record)
+        pairs of the sheet.
+
+        Blank / rejected rows are counted in `counts`, and counts['total'] is
+        set from the file; `on_error(row_num, row, message)` is called for each
+        rejected row. With settings.DB_IMPORT_WORKERS > 1 the records are
+        built on a process pool that lives as long as the context.
+        """
         # ----------------------------------------------------------------
-        # Step 3 – process every data row (starting at row index 1 = Excel row 2)
+        # Step 1 – open the workbook / csv; rows are read lazily
         # ----------------------------------------------------------------
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0   # blank rows
-        error_count   = 0
+        with DbManagement._open_import_sheets(uploaded_file) as sheets, ExitStack() as stack:
+            totals = [total for *_sheet, total in sheets]
+            counts['total'] = None if None in totals else sum(totals)
 
-        with transaction.atomic():
-            for row_num, row in enumerate(rows[1:], start=2):
-                try:
-                    record = DbManagement._build_customer_record(row, header_map)
+            workers = DbManagement._import_workers()
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers)) if workers else None
 
-                    # Blank row – skip silently
-                    if record is None:
-                        skipped_count += 1
+            def iter_sheets():
+                for sheet_key, title, rows, _total in sheets:
+                    header_row = next(rows, None)
+                    if header_row is None:
+                        if len(sheets) == 1:
+                            raise ValueError("The uploaded Excel file is empty.")
+                        logger.info("import_from_excel – sheet '%s' is empty, skipped", title)
                         continue
 
-                    # Upsert: look up by unique BG_Vor_Nr, update everything else
-                    lookup   = {'BG_Vor_Nr': record['BG_Vor_Nr']}
-                    defaults = {k: v for k, v in record.items() if k != 'BG_Vor_Nr'}
+                    # ------------------------------------------------------------
+                    # Step 2 – map header names → column indices
+                    # ------------------------------------------------------------
+                    header_map = DbManagement._map_headers(header_row)
+                    logger.info("Excel headers detected (%s): %s", sheet_key, header_map)
 
-                    _obj, created = Customer.objects.update_or_create(
-                        **lookup,
-                        defaults=defaults,
-                    )
-                    if created:
-                        created_count += 1
-                        logger.info("Row %d – created Customer '%s'", row_num, record['BG_Vor_Nr'])
+                    # ------------------------------------------------------------
+                    # Step 3 – build records, in-process or on a process pool
+                    # ------------------------------------------------------------
+                    if executor is not None:
+                        records = DbManagement._iter_records_parallel(
+                            sheet_key, rows, header_map, counts, executor, workers, on_error,
+                        )
                     else:
-                        updated_count += 1
-                        logger.info("Row %d – updated Customer '%s'", row_num, record['BG_Vor_Nr'])
+                        records = DbManagement._iter_records(sheet_key, rows, header_map, counts, on_error)
+
+                    yield sheet_key, title, header_row, records
+
+            yield iter_sheets()
 
-                except Exception as row_err:
-                    error_count += 1
-                    logger.warning("import_from_excel – row %d skipped: %s", row_num, row_err)
+    @staticmethod
+    def _peak_rss():
+        """Peak resident set size of this process in bytes, None where getrusage is missing (Windows)."""
+        import sys
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    @staticmethod
+    def _import_workbook(uploaded_file, progress=None):
+        """
+        Runs the import pipeline and returns the counts dict
+        ('created', 'updated', 'unchanged', 'skipped', 'errors', 'processed',
+        'total', 'peak_memory', 'error_report', 'sheets').
+
+        Each sheet is written in its own transaction, in IMPORT_SHEETS order;
+        counts['sheets'] maps every imported sheet key to its own
+        created / updated / unchanged / skipped / errors counts.
+
+        `progress`, when given, is called as progress(counts, in_transaction)
+        after every written batch (in_transaction=True – the sheet's
+        transaction is still open) and once more after every sheet commits
+        (in_transaction=False). The Celery import task uses it to publish its
+        progress; see import_customers_task for why the two differ.
+        counts['total'] is the number of data rows the sheets declare (None
+        when the file does not say).
+
+        Every stage is a generator over the read-only worksheet, so only the
+        current batch of rows is held in memory no matter how big the file is.
+        With settings.DB_IMPORT_WORKERS > 1 the record building runs on a
+        process pool while this process stays the single DB writer.
+        The peak resident set size of this process (getrusage ru_maxrss) is
+        logged and returned as 'peak_memory' in bytes when IMPORT_TRACK_MEMORY
+        is on. It is the process high-water mark, so a long-lived worker
+        reports the largest import it has run; process-pool children are not
+        included.
+
+        A sheet whose transaction stays open longer than
+        settings.WRITE_TRANSACTION_MAX_SECONDS is logged as a warning – delta
+        export cursors do not look back further (see stream_export).
+
+        Rejected rows are streamed into an ImportErrorReport while the import
+        runs; when there are any, the report is stored under IMPORT_REPORT_DIR
+        of private_storage and its name returned as 'error_report' (None
+        otherwise). Reports older than IMPORT_REPORT_MAX_AGE are removed then.
+        """
+        import time
+        import uuid
+        from django.conf import settings
+        from django.utils import timezone
+
+        counts = {
+            'created': 0,
+            'updated': 0,
+            'unchanged': 0,   # existing rows identical to the file – not written
+            'skipped': 0,   # blank rows
+            'errors':  0,
+            'processed': 0,
+            'total': None,
+            'peak_memory': None,
+            'error_report': None,
+            'sheets': {},
+        }
+        sheet_count_keys = ('created', 'updated', 'unchanged', 'skipped', 'errors')
+
+        try:
+            with ImportErrorReport() as error_report:
+                with DbManagement._open_import_records(uploaded_file, counts, error_report.add) as sheets:
+                    for sheet_key, title, header_row, records in sheets:
+                        error_report.start_sheet(header_row, title)
+                        before = {key: counts[key] for key in sheet_count_keys}
+
+                        # ------------------------------------------------------------
+                        # Step 4 – write the records batch by batch from this single
+                        #          writer, one transaction per sheet
+                        # ------------------------------------------------------------
+                        sheet_started = time.monotonic()
+                        with transaction.atomic():
+                            for batch in DbManagement._iter_batches(records, DbManagement.IMPORT_BATCH_SIZE):
+                                DbManagement._write_batch(sheet_key, batch, counts, error_report.add)
+                                if progress is not None:
+                                    progress(counts, True)
+
+                        # Delta export cursors only look back this far (see stream_export)
+                        sheet_seconds = time.monotonic() - sheet_started
+                        if sheet_seconds > settings.WRITE_TRANSACTION_MAX_SECONDS:
+                            logger.warning(
+                                "import_from_excel – sheet '%s' was written in one transaction of %.0f s, "
+                                "longer than WRITE_TRANSACTION_MAX_SECONDS (%d s); delta exports taken "
+                                "meanwhile may have missed its rows",
+                                title, sheet_seconds, settings.WRITE_TRANSACTION_MAX_SECONDS,
+                            )
+
+                        if progress is not None:
+                            progress(counts, False)
+                        counts['sheets'][sheet_key] = {key: counts[key] - before[key] for key in sheet_count_keys}
+
+                # ----------------------------------------------------------------
+                # Step 5 – keep the report of rejected rows, if there were any
+                # ----------------------------------------------------------------
+                counts['error_report'] = error_report.save(
+                    DbManagement.private_storage(),
+                    f"{DbManagement.IMPORT_REPORT_DIR}/"
+                    f"import_errors_{timezone.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}.csv"
+                )
+                if counts['error_report']:
+                    DbManagement.expire_import_reports()
+
+        finally:
+            if DbManagement.IMPORT_TRACK_MEMORY:
+                counts['peak_memory'] = DbManagement._peak_rss()
 
         logger.info(
-            "import_from_excel done – created: %d, updated: %d, blank: %d, errors: %d",
-            created_count, updated_count, skipped_count, error_count,
+            "import_from_excel done – created: %d, updated: %d, unchanged: %d, blank: %d, errors: %d, "
+            "sheets: %s, peak memory: %s",
+            counts['created'], counts['updated'], counts['unchanged'], counts['skipped'], counts['errors'],
+            ', '.join(counts['sheets']) or '-',
+            f"{counts['peak_memory'] / 1024 / 1024:.1f} MiB" if counts['peak_memory'] is not None else 'n/a',
         )
+        return counts
 
-        return format_lazy(
+    # ------------------------------------------------------------------
+    # Public method
+    # ------------------------------------------------------------------
+    @staticmethod
+    def import_from_excel(uploaded_file):
+        """
+        Reads an .xlsx (or .csv / .tsv) file uploaded through the form and
+        upserts its records into the database. CSV exports skip the openpyxl
+        parsing and go through the much faster csv module; the header mapping
+        and column map conversion are the same for every format.
+
+        A workbook can hold a sheet per model – 'Customers', 'Auditors' and
+        'Audits' (see IMPORT_SHEETS) – which are imported in that order, each
+        in its own transaction. A workbook without those sheet names is the
+        single-sheet customer template and is read from its active sheet.
+
+        The file is streamed: rows are read lazily from the read-only
+        worksheet, converted, grouped into batches and written, so memory
+        stays flat regardless of the number of rows.
+
+        Strategy – batched upsert keyed on the sheet's unique identifier
+        (BG_Vor_Nr, the auditor's email, the audit name):
+          - valid rows are collected into batches of IMPORT_BATCH_SIZE
+          - each batch looks up its existing keys in one query
+          - new keys     → bulk_create
+          - known keys   → bulk_update instead of raising IntegrityError,
+                           unless the row is unchanged (then nothing is written)
+
+        Row-level errors are logged and skipped so one bad row never blocks
+        the rest of the file from being imported. The rejected rows (original
+        values plus the reason) are saved as a CSV report linked from the
+        message.
+
+        Returns a translated summary message with created / updated / unchanged / skipped counts.
+        """
+        counts = DbManagement._import_workbook(uploaded_file)
+        return DbManagement._import_message(counts)
+
+    @staticmethod
+    def _import_message(counts):
+        """
+        Translated summary message for the counts returned by _import_workbook:
+        the totals, a breakdown per sheet when several sheets were imported,
+        and the URL of the rejected-rows report when there is one.
+        """
+        message = format_lazy(
             _(
                 "Import completed. "
-                "Created: {c}, Updated: {u}, Skipped (blank): {s}, Errors: {e}."
+                "Created: {c}, Updated: {u}, Unchanged: {n}, Skipped (blank): {s}, Errors: {e}."
+            ),
+            c=counts['created'],
+            u=counts['updated'],
+            n=counts['unchanged'],
+            s=counts['skipped'],
+            e=counts['errors'],
+        )
+        if len(counts.get('sheets', ())) > 1:
+            for sheet_key, sheet_counts in counts['sheets'].items():
+                message = format_lazy(
+                    _("{message} {sheet} – Created: {c}, Updated: {u}, Unchanged: {n}, Errors: {e}."),
+                    message=message,
+                    sheet=DbManagement.IMPORT_SHEETS[sheet_key]['label'],
+                    c=sheet_counts['created'],
+                    u=sheet_counts['updated'],
+                    n=sheet_counts['unchanged'],
+                    e=sheet_counts['errors'],
+                )
+        if counts.get('error_report'):
+            message = format_lazy(
+                _("{message} Rejected rows report: {url}"),
+                message=message,
+                url=DbManagement.private_file_url(counts['error_report']),
+            )
+        return message
+
+    @staticmethod
+    def preview_import(uploaded_file):
+        """
+        Dry run of import_from_excel – nothing is written.
+
+        Streams the upload through the same pipeline and, per lookup chunk,
+        fetches the existing rows for the chunk's keys (e.g. BG_Vor_Nr) with a
+        single filter(<key>__in=...) query. The diff is computed in memory, so
+        a 100k-row file costs a few queries (more on SQLite, whose bound
+        parameters are capped).
+
+        Returns a dict with the 'created' / 'updated' / 'unchanged' /
+        'skipped' / 'errors' counts, up to PREVIEW_SAMPLE_SIZE examples in
+        'created_samples' (keys), 'updated_samples' ({'sheet', 'key',
+        'changes': {field: (old, new)}}) and 'error_samples'
+        ((row_num, message)), plus a translated summary 'message'.
+        """
+        from django.db import connection
+
+        lookup_size = min(DbManagement.PREVIEW_LOOKUP_SIZE, connection.features.max_query_params or float('inf'))
+        sample_size = DbManagement.PREVIEW_SAMPLE_SIZE
+
+        counts = {'skipped': 0, 'errors': 0, 'processed': 0, 'total': None}
+        preview = {
+            'created': 0, 'updated': 0, 'unchanged': 0,
+            'created_samples': [], 'updated_samples': [], 'error_samples': [],
+        }
+
+        def sample_error(row_num, _row, message):
+            if len(preview['error_samples']) < sample_size:
+                preview['error_samples'].append((row_num, message))
+
+        with DbManagement._open_import_records(uploaded_file, counts, sample_error) as sheets:
+            for sheet_key, _title, _header_row, records in sheets:
+                model = DbManagement._import_model(sheet_key)
+                key_field = DbManagement.IMPORT_SHEETS[sheet_key]['key']
+                label = DbManagement.IMPORT_SHEETS[sheet_key]['label']
+                seen_keys = set()
+
+                for chunk in DbManagement._iter_batches(records, lookup_size):
+                    fields = [field for field in chunk[0][1] if field != key_field]
+                    keys = {record[key_field] for _row_num, record in chunk}
+                    existing = {
+                        row[key_field]: row
+                        for row in model.objects.filter(**{f'{key_field}__in': keys}).values(key_field, *fields)
+                    }
+
+                    for _row_num, record in chunk:
+                        key = record[key_field]
+
+                        # A key repeated in the file overwrites its earlier row → update
+                        if key in seen_keys:
+                            preview['updated'] += 1
+                            continue
+                        seen_keys.add(key)
+
+                        current = existing.get(key)
+                        if current is None:
+                            preview['created'] += 1
+                            if len(preview['created_samples']) < sample_size:
+                                preview['created_samples'].append(key)
+                            continue
+
+                        changes = {
+                            field: (current[field], record[field])
+                            for field in fields if current[field] != record[field]
+                        }
+                        if not changes:
+                            preview['unchanged'] += 1
+                            continue
+
+                        preview['updated'] += 1
+                        if len(preview['updated_samples']) < sample_size:
+                            preview['updated_samples'].append({'sheet': label, 'key': key, 'changes': changes})
+
+        preview['skipped'] = counts['skipped']
+        preview['errors'] = counts['errors']
+        preview['message'] = format_lazy(
+            _(
+                "Dry run – nothing was written. "
+                "Would create: {c}, update: {u}, leave unchanged: {n}. Skipped (blank): {s}, Errors: {e}."
             ),
-            c=created_count,
-            u=updated_count,
-            s=skipped_count,
-            e=error_count,
+            c=preview['created'],
+            u=preview['updated'],
+            n=preview['unchanged'],
+            s=preview['skipped'],
+            e=preview['errors'],
+        )
+
+        logger.info(
+            "preview_import done – create: %d, update: %d, unchanged: %d, blank: %d, errors: %d",
+            preview['created'], preview['updated'], preview['unchanged'], preview['skipped'], preview['errors'],
+        )
+        return preview
+
+    @staticmethod
+    def private_storage():
+        """
+        Storage of the files only logged-in users may download – rejected-row
+        reports and customer exports – and of the spooled import uploads, under
+        settings.PRIVATE_MEDIA_ROOT, which no URL serves. Reports and exports
+        are downloaded through private_file_url; spools never are.
+        """
+        from django.conf import settings
+        from django.core.files.storage import FileSystemStorage
+
+        return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
+
+    @staticmethod
+    def private_file_url(name):
+        """URL of the login-protected download of private_storage file `name`."""
+        from django.urls import reverse
+
+        return reverse('db_private_file', args=[name])
+
+    @staticmethod
+    def expire_import_reports(max_age=None):
+        """
+        Deletes the rejected-row reports older than `max_age` seconds
+        (IMPORT_REPORT_MAX_AGE by default) and returns how many were deleted.
+        Called whenever an import stores a new report.
+        """
+        from datetime import timedelta
+        from django.utils import timezone
+
+        storage = DbManagement.private_storage()
+        max_age = DbManagement.IMPORT_REPORT_MAX_AGE if max_age is None else max_age
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+
+        try:
+            _dirs, files = storage.listdir(DbManagement.IMPORT_REPORT_DIR)
+        except FileNotFoundError:
+            return 0
+
+        deleted = 0
+        for file_name in files:
+            name = f"{DbManagement.IMPORT_REPORT_DIR}/{file_name}"
+            try:
+                if storage.get_modified_time(name) < cutoff:
+                    storage.delete(name)
+                    deleted += 1
+            except FileNotFoundError:
+                continue   # removed by a concurrent import
+
+        if deleted:
+            logger.info("expire_import_reports – deleted %d report(s) older than %d s", deleted, max_age)
+        return deleted
+
+    @staticmethod
+    def spool_import_file(uploaded_file):
+        """
+        Saves an uploaded import file to private_storage (never served, as the
+        file holds customer data) so a Celery worker can process it after the
+        web request has returned.
+
+        The stored name gets a random prefix and is returned for passing to
+        import_customers_task or preview_import_task, which open it from
+        private_storage and delete it when they are done.
+        """
+        import os
+        import uuid
+
+        base_name = os.path.basename(uploaded_file.name or 'import.xlsx')
+        return DbManagement.private_storage().save(
+            f"{DbManagement.IMPORT_SPOOL_DIR}/{uuid.uuid4().hex}_{base_name}", uploaded_file,
         )
 
     @staticmethod
@@ -267,9 +1291,8 @@ class DbManagement:
         ws = wb.active
         ws.title = 'Customers'
 
-        # Header row – must match the COLUMN_MAP keys in _build_customer_record
-        headers = ['year', 'BG Vor.Nr.', 'Unternehmen-bg', 'Unternehmen-en', 'Company ID', 'VAT']
-        ws.append(headers)
+        # Header row – must match the customers column map in IMPORT_SHEETS
+        ws.append(DbManagement.EXPORT_HEADERS)
 
         # Bold the header row to match the import file appearance
         for cell in ws[1]:
@@ -345,3 +1368,389 @@ class DbManagement:
 
         logger.info("export_to_excel – exported %d customer(s) as '%s'", count, filename)
         return response
+
+    @staticmethod
+    def _export_column_widths(rows):
+        """
+        Step 2 – Column widths for the streaming export, from the headers and a
+        sample of rows (the same fit as _build_export_workbook, minimum 14).
+        """
+        widths = [len(header) for header in DbManagement.EXPORT_HEADERS]
+        for row in rows:
+            widths = [max(width, len(str(value if value is not None else ''))) for width, value in zip(widths, row)]
+        return [max(width + 2, 14) for width in widths]
+
+    @staticmethod
+    def _iter_export_rows(queryset=None):
+        """
+        Lazily fetches the customers (all, or those of `queryset`) as tuples in
+        EXPORT_FIELDS order – a server-side cursor via .iterator(),
+        EXPORT_CHUNK_SIZE rows per round trip, no model instances.
+        """
+        from ohmi_audit.main_app.models import Customer
+
+        if queryset is None:
+            queryset = Customer.objects.all()
+
+        return (
+            queryset.order_by('id')
+            .values_list(*DbManagement.EXPORT_FIELDS)
+            .iterator(chunk_size=DbManagement.EXPORT_CHUNK_SIZE)
+        )
+
+    @staticmethod
+    def _write_export_workbook(target, rows):
+        """
+        Step 2 – Write `rows` (tuples in EXPORT_FIELDS order) as a write-only
+        workbook into the binary file object `target`.
+
+        Write-only worksheets stream every appended row straight to disk, so
+        only the width sample (EXPORT_WIDTH_SAMPLE_SIZE rows) is ever held in
+        memory. Widths have to be set before the first row is written, hence
+        the sample instead of a second pass over all cells.
+        """
+        import itertools
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        rows = iter(rows)
+        sample = list(itertools.islice(rows, DbManagement.EXPORT_WIDTH_SAMPLE_SIZE))
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('Customers')
+        for idx, width in enumerate(DbManagement._export_column_widths(sample), start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+
+        # Bold header row to match the import file appearance
+        header_cells = []
+        for header in DbManagement.EXPORT_HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = Font(bold=True)
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        count = 0
+        for row in itertools.chain(sample, rows):
+            ws.append(row)
+            count += 1
+
+        wb.save(target)
+        return count
+
+    @staticmethod
+    def stream_export_to_excel():
+        """
+        Memory-bounded variant of export_to_excel, used by the DB management
+        page.
+
+        Customers are read with values_list(...).iterator(chunk_size=...) –
+        plain tuples, EXPORT_CHUNK_SIZE per round trip, no model instances –
+        and appended to a write-only workbook that is saved into an anonymous
+        temporary file. The file is then sent as a FileResponse, which streams
+        it in blocks, so neither the workbook nor the file bytes are ever
+        held in memory as a whole.
+
+        An .xlsx is a zip archive whose sheet part is only complete once every
+        row has been written, so the first byte leaves after the last row is
+        read; memory, not time to first byte, is what this bounds.
+        """
+        import tempfile
+        from datetime import datetime
+        from django.http import FileResponse
+
+        # ----------------------------------------------------------------
+        # Step 1 – lazily fetch the customers as tuples
+        # ----------------------------------------------------------------
+        rows = DbManagement._iter_export_rows()
+
+        # ----------------------------------------------------------------
+        # Step 2 – write the workbook into a temporary file
+        # ----------------------------------------------------------------
+        target = tempfile.TemporaryFile()
+        try:
+            count = DbManagement._write_export_workbook(target, rows)
+            target.seek(0)
+        except Exception:
+            target.close()
+            raise
+
+        # ----------------------------------------------------------------
+        # Step 3 – stream the file to the client (closed once it is sent)
+        # ----------------------------------------------------------------
+        filename = f"customers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        response = FileResponse(
+            target,
+            as_attachment=True,
+            filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+
+        logger.info("stream_export_to_excel – exported %d customer(s) as '%s'", count, filename)
+        return response
+
+    @staticmethod
+    def export_version():
+        """
+        Change version of the Customer table – its data version (see
+        common.cache_versions), which every committed ORM write moves on,
+        bulk and update() writes included. Reading it costs no query.
+
+        Without a shared cache (data_versions_shared) this process does not
+        see the writes of the others, so a new value is returned on every
+        call and no stored export is reused.
+        """
+        import time
+        from ohmi_audit.main_app.models import Customer
+
+        if not data_versions_shared():
+            return f"local{time.time_ns()}"
+        return version_for(Customer)
+
+    @staticmethod
+    def export_to_storage():
+        """
+        Writes the customer export workbook to private_storage and returns
+        (storage_name, created); private_file_url(storage_name) downloads it.
+
+        The artifact is named after export_version(), so while no Customer row
+        changes, repeated exports return the stored file (created=False)
+        without reading the table again. When a new version is written, the
+        artifacts of older versions are removed.
+        """
+        import tempfile
+        from django.core.files import File
+
+        storage = DbManagement.private_storage()
+        version = DbManagement.export_version()
+        prefix = f"customers_{version}"
+        name = f"{DbManagement.EXPORT_DIR}/{prefix}.xlsx"
+
+        # ----------------------------------------------------------------
+        # Step 1 – unchanged table → serve the stored artifact
+        # ----------------------------------------------------------------
+        if storage.exists(name):
+            logger.info("export_to_storage – version %s unchanged, reusing '%s'", version, name)
+            return name, False
+
+        # ----------------------------------------------------------------
+        # Step 2 – write the workbook into a temporary file, then store it
+        # ----------------------------------------------------------------
+        rows = DbManagement._iter_export_rows()
+        with tempfile.TemporaryFile() as target:
+            count = DbManagement._write_export_workbook(target, rows)
+            target.seek(0)
+            saved_name = storage.save(name, File(target))
+
+        # ----------------------------------------------------------------
+        # Step 3 – drop the artifacts of older versions
+        # ----------------------------------------------------------------
+        _dirs, files = storage.listdir(DbManagement.EXPORT_DIR)
+        for file_name in files:
+            if not file_name.startswith(prefix):
+                storage.delete(f"{DbManagement.EXPORT_DIR}/{file_name}")
+
+        logger.info("export_to_storage – exported %d customer(s) as '%s'", count, saved_name)
+        return saved_name, True
+
+    @staticmethod
+    def parse_export_since(value):
+        """
+        Turns the `since` of a delta export – an ISO 8601 timestamp or the
+        cursor token of a previous delta export – into an aware datetime.
+        Raises ValueError when it is neither.
+        """
+        import base64
+        import binascii
+        from django.utils import timezone
+        from django.utils.dateparse import parse_datetime
+
+        try:
+            moment = parse_datetime(value)
+        except ValueError:
+            moment = None
+        if moment is None:
+            try:
+                moment = parse_datetime(base64.urlsafe_b64decode(value.encode('ascii')).decode('ascii'))
+            except (ValueError, binascii.Error, UnicodeError):
+                moment = None
+        if moment is None:
+            raise ValueError(f"Invalid 'since' value '{value}'.")
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment, timezone.get_default_timezone())
+        return moment
+
+    @staticmethod
+    def export_cursor(moment):
+        """Opaque cursor token for `moment`; pass it back as `since` to get the next delta."""
+        import base64
+
+        return base64.urlsafe_b64encode(moment.isoformat().encode('ascii')).decode('ascii')
+
+    @staticmethod
+    def _iter_delta_rows(since, queryset=None):
+        """
+        Rows of a delta export: the customers with updated_at > since (in
+        EXPORT_FIELDS order, deleted=False), then one row per customer key
+        deleted since then that does not exist again (deleted=True, other
+        fields None).
+
+        `queryset` narrows the changed customers (e.g. to a search result);
+        tombstones are not filtered, as the deleted rows cannot be matched.
+
+        Both lookups are range scans – on the (updated_at, id) index of
+        Customer and the deleted_at index of CustomerTombstone – so their cost
+        follows the size of the delta, not of the table.
+        """
+        from django.db.models import Exists, OuterRef
+        from ohmi_audit.main_app.models import Customer, CustomerTombstone
+
+        if queryset is None:
+            queryset = Customer.objects.all()
+
+        changed = (
+            queryset.filter(updated_at__gt=since)
+            .order_by('updated_at', 'id')
+            .values_list(*DbManagement.EXPORT_FIELDS)
+            .iterator(chunk_size=DbManagement.EXPORT_CHUNK_SIZE)
+        )
+        for row in changed:
+            yield (*row, False)
+
+        key_index = DbManagement.EXPORT_FIELDS.index('BG_Vor_Nr')
+        deleted = (
+            CustomerTombstone.objects.filter(deleted_at__gt=since)
+            .exclude(Exists(Customer.objects.filter(BG_Vor_Nr=OuterRef('BG_Vor_Nr'))))
+            .order_by('BG_Vor_Nr')
+            .values_list('BG_Vor_Nr', flat=True)
+            .distinct()
+            .iterator(chunk_size=DbManagement.EXPORT_CHUNK_SIZE)
+        )
+        for key in deleted:
+            row = [None] * len(DbManagement.EXPORT_FIELDS)
+            row[key_index] = key
+            yield (*row, True)
+
+    @staticmethod
+    def _iter_export_lines(export_format, rows, delta=False):
+        """
+        Yields the encoded lines of a text export: a CSV with the EXPORT_HEADERS
+        header row (re-importable like the workbook), or one JSON object per
+        line keyed by EXPORT_FIELDS.
+
+        Delta rows (see _iter_delta_rows) carry an extra 'deleted' column;
+        in NDJSON a deletion is written as just its key and "deleted": true.
+        """
+        import csv
+        import io
+        import itertools
+        import json
+
+        headers = DbManagement.EXPORT_HEADERS + ['deleted'] if delta else DbManagement.EXPORT_HEADERS
+        fields = DbManagement.EXPORT_FIELDS + ['deleted'] if delta else DbManagement.EXPORT_FIELDS
+
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in itertools.chain([headers], rows):
+                writer.writerow(row)
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            for row in rows:
+                record = dict(zip(fields, row))
+                if delta and record['deleted']:
+                    record = {'BG_Vor_Nr': record['BG_Vor_Nr'], 'deleted': True}
+                line = json.dumps(record, ensure_ascii=False, default=str)
+                yield f"{line}\n".encode('utf-8')
+
+    @staticmethod
+    def _iter_chunks(lines, size):
+        """Joins `lines` into chunks of at least `size` bytes (the last one may be shorter)."""
+        chunk, length = [], 0
+        for line in lines:
+            chunk.append(line)
+            length += len(line)
+            if length >= size:
+                yield b''.join(chunk)
+                chunk, length = [], 0
+        if chunk:
+            yield b''.join(chunk)
+
+    @staticmethod
+    def _gzip_chunks(chunks):
+        """
+        Compresses a byte stream into one gzip member on the fly. Every chunk
+        is sync-flushed, so the client receives data as it is produced instead
+        of after zlib's internal buffer fills up.
+        """
+        import zlib
+
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+    @staticmethod
+    def stream_export(export_format, gzip=False, since=None, search_query=None):
+        """
+        Streams the customers as CSV or newline-delimited JSON in a
+        StreamingHttpResponse, optionally gzip-compressed.
+
+        Rows go from the server-side cursor (_iter_export_rows) through the
+        line encoder straight to the client, so the first bytes leave after
+        the first database round trip and memory stays at one chunk no matter
+        how large the table is.
+
+        With `since` (an aware datetime, see parse_export_since) only the
+        delta is exported – changed customers plus tombstones for deletions –
+        and the X-Export-Cursor header holds the token for the next delta.
+        updated_at / deleted_at are stamped when a row is written but the row
+        is visible only once its transaction commits, so the cursor lags
+        settings.WRITE_TRANSACTION_MAX_SECONDS behind the export: rows of
+        transactions still open now are sent next time, and the rows changed
+        within that window are sent again (consumers upsert by key).
+
+        With `search_query` only the customers the index page search finds
+        are exported (search_customers), so the cost follows the result size.
+        """
+        from datetime import datetime, timedelta
+        from django.conf import settings
+        from django.http import StreamingHttpResponse
+        from django.utils import timezone
+        from common.customer_search import normalize_search_query, search_customers
+
+        if export_format not in DbManagement.EXPORT_STREAM_FORMATS:
+            raise ValueError(f"Unsupported export format '{export_format}'.")
+
+        search_query = normalize_search_query(search_query or '')
+        queryset = search_customers(search_query) if search_query else None
+
+        cursor = DbManagement.export_cursor(
+            timezone.now() - timedelta(seconds=settings.WRITE_TRANSACTION_MAX_SECONDS)
+        )
+        if since is None:
+            rows = DbManagement._iter_export_rows(queryset)
+        else:
+            rows = DbManagement._iter_delta_rows(since, queryset)
+
+        lines = DbManagement._iter_export_lines(export_format, rows, delta=since is not None)
+        chunks = DbManagement._iter_chunks(lines, DbManagement.EXPORT_STREAM_BUFFER_SIZE)
+        if gzip:
+            chunks = DbManagement._gzip_chunks(chunks)
+
+        kind = 'customers' if since is None else 'customers_delta'
+        filename = f"{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+        response = StreamingHttpResponse(chunks, content_type=DbManagement.EXPORT_STREAM_FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['X-Export-Cursor'] = cursor
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+
+        logger.info(
+            "stream_export – streaming %s as '%s' (since=%s, search=%r, gzip=%s)",
+            kind, filename, since, search_query, gzip,
+        )
+        return response
@@ -0,0 +1,183 @@
+"""
+Media Management: sweep media files no Audit refers to any more.
+"""
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger('ohmi_audit')
+
+
+class MediaManagement:
+    # Orphans deleted / reported per batch.
+    SWEEP_BATCH_SIZE = 500
+
+    # Files younger than this (seconds) are left alone: their Audit row may
+    # not be committed yet.
+    SWEEP_MIN_AGE = 60 * 60
+
+    # State of the last sweep (directory mtimes and referenced paths), kept
+    # next to the swept directories so it follows the media volume.
+    SWEEP_STATE_NAME = '.media_sweep.json'
+
+    @staticmethod
+    def _media_fields():
+        from ohmi_audit.main_app.models import Audit
+
+        return [Audit._meta.get_field('image'), Audit._meta.get_field('file')]
+
+    @staticmethod
+    def _referenced_paths():
+        """
+        Step 1 – The manifest: every media name stored on an Audit, read with
+        one values_list query, as a set for O(1) membership checks.
+        """
+        from django.db.models import Q
+        from ohmi_audit.main_app.models import Audit
+
+        referenced = set()
+        for names in Audit.objects.filter(Q(image__gt='') | Q(file__gt='')).values_list('image', 'file'):
+            referenced.update(name for name in names if name)
+        return referenced
+
+    @staticmethod
+    def _load_state(state_path):
+        try:
+            with open(state_path, encoding='utf-8') as state_file:
+                state = json.load(state_file)
+            return state['dirs'], set(state['referenced'])
+        except (OSError, ValueError, KeyError):
+            return {}, set()
+
+    @staticmethod
+    def _save_state(state_path, dirs, referenced):
+        with open(state_path, 'w', encoding='utf-8') as state_file:
+            json.dump({'dirs': dirs, 'referenced': sorted(referenced)}, state_file)
+
+    @staticmethod
+    def _iter_candidates(root, upload_dir, previous_dirs, dirs, counts, incremental):
+        """
+        Step 2 – Walks `upload_dir` (relative to `root`) with os.scandir and
+        yields the media names of files old enough to be swept.
+
+        In incremental mode the files of a directory whose mtime is the one
+        recorded by the last sweep are not listed – a file is only added to
+        or removed from a directory by changing its mtime. Subdirectories are
+        still descended into. The mtime is read before listing, so a change
+        made during the sweep is picked up next time. A directory holding a
+        file too young to judge keeps its old mtime, so it is listed again.
+        """
+        cutoff = time.time() - MediaManagement.SWEEP_MIN_AGE
+        pending = [upload_dir]
+        while pending:
+            rel_dir = pending.pop()
+            path = os.path.join(root, rel_dir)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            unchanged = incremental and previous_dirs.get(rel_dir) == mtime
+            counts['skipped_dirs' if unchanged else 'scanned_dirs'] += 1
+            complete = True
+
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = f"{rel_dir}/{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(name)
+                    elif not unchanged and entry.is_file(follow_symlinks=False):
+                        counts['files'] += 1
+                        if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                            yield name
+                        else:
+                            complete = False
+
+            if complete:
+                dirs[rel_dir] = mtime
+            elif rel_dir in previous_dirs:
+                dirs[rel_dir] = previous_dirs[rel_dir]
+
+    @staticmethod
+    def sweep_orphaned_media(delete=False, incremental=False, report=None):
+        """
+        Finds the files in the Audit upload directories (Audit.image /
+        Audit.file upload_to) that no Audit refers to, and reports them or,
+        with delete=True, deletes them.
+
+        Orphans are handled in batches of SWEEP_BATCH_SIZE; `report` is called
+        with each batch (a list of media names) before it is deleted.
+
+        With incremental=True only directories changed since the last
+        deleting sweep are listed. Files in unchanged directories can still
+        become orphans when their Audit is deleted or re-pointed, so the names
+        referenced at that sweep but not any more are checked as well.
+        Only delete=True runs record the sweep state: a report-only run leaves
+        its orphans in place, so they must be listed again by the next run. A
+        file that could not be deleted keeps its directory (and name) due for
+        the next run.
+
+        Returns the counts: scanned_dirs, skipped_dirs, files, orphans, deleted.
+        Only local (path-based) storages can be swept.
+        """
+        from common.db_management import DbManagement
+
+        fields = MediaManagement._media_fields()
+        storage = fields[0].storage
+        root = storage.path('')
+        state_path = os.path.join(root, MediaManagement.SWEEP_STATE_NAME)
+
+        referenced = MediaManagement._referenced_paths()
+        previous_dirs, previous_referenced = MediaManagement._load_state(state_path) if incremental else ({}, set())
+
+        counts = {'scanned_dirs': 0, 'skipped_dirs': 0, 'files': 0, 'orphans': 0, 'deleted': 0}
+        dirs = {}
+        failed = set()
+
+        # ----------------------------------------------------------------
+        # Step 2 – candidates: files of changed directories, plus files
+        # whose Audit reference disappeared since the last sweep
+        # ----------------------------------------------------------------
+        def iter_orphans():
+            seen = set()
+            for upload_dir in sorted({field.upload_to.strip('/') for field in fields}):
+                for name in MediaManagement._iter_candidates(
+                        root, upload_dir, previous_dirs, dirs, counts, incremental):
+                    seen.add(name)
+                    if name not in referenced:
+                        yield name
+            for name in sorted(previous_referenced - referenced - seen):
+                if storage.exists(name):
+                    yield name
+
+        # ----------------------------------------------------------------
+        # Step 3 – report / delete the orphans batch by batch
+        # ----------------------------------------------------------------
+        for batch in DbManagement._iter_batches(iter_orphans(), MediaManagement.SWEEP_BATCH_SIZE):
+            counts['orphans'] += len(batch)
+            if report:
+                report(batch)
+            if delete:
+                for name in batch:
+                    try:
+                        storage.delete(name)
+                        counts['deleted'] += 1
+                    except OSError as file_err:
+                        logger.warning("Could not delete orphaned media file '%s': %s", name, file_err)
+                        failed.add(name)
+
+        # ----------------------------------------------------------------
+        # Step 4 – record the swept state; only a deleting run leaves its
+        # directories free of orphans
+        # ----------------------------------------------------------------
+        if delete:
+            for name in failed:
+                dirs.pop(os.path.dirname(name), None)
+            MediaManagement._save_state(state_path, dirs, referenced | failed)
+
+        logger.info(
+            "sweep_orphaned_media – dirs scanned: %d, skipped: %d, files: %d, orphans: %d, deleted: %d",
+            counts['scanned_dirs'], counts['skipped_dirs'], counts['files'], counts['orphans'], counts['deleted'],
+        )
+        return counts
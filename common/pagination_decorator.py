@@ -1,12 +1,166 @@
-from django.core.paginator import Paginator
+import base64
+import binascii
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import get_language
 from functools import wraps
 
+from common.cache_versions import data_versions_shared, version_for
+from common.row_counts import CachedCountPaginator
+
+
+class CursorPage:
+    """
+    One page of keyset (cursor) pagination – the counterpart of Django's Page
+    for paginate_results(cursor_ordering=...). Rows are found with
+    WHERE <ordering> > <last row> LIMIT n, so every page costs the same
+    index seek however deep it is, and no COUNT(*) is run. In exchange there
+    are no page numbers: the template links the next/previous cursor tokens.
+    """
+    is_cursor_page = True
+
+    def __init__(self, object_list, ordering, has_next, has_previous):
+        self.object_list = object_list
+        self.ordering = ordering
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_cursor(self):
+        """Token of the page after this one (?after=...), None on the last page."""
+        return encode_cursor(self.object_list[-1], self.ordering) if self._has_next else None
+
+    def previous_cursor(self):
+        """Token of the page before this one (?before=...), None on the first page."""
+        return encode_cursor(self.object_list[0], self.ordering) if self._has_previous else None
+
+
+def _ordering_fields(model, ordering):
+    """(field, descending) pairs of `ordering`, ending with the primary key so every row has a unique position."""
+    pk_name = model._meta.pk.name
+    names = [pk_name if name.lstrip('-') == 'pk' else name.lstrip('-') for name in ordering]
+    fields = [(model._meta.get_field(name), raw.startswith('-')) for name, raw in zip(names, ordering)]
+    if pk_name not in names:
+        fields.append((model._meta.pk, False))
+    return fields
+
+
+def encode_cursor(obj, ordering):
+    """Opaque cursor token for the position of `obj` in `ordering`."""
+    values = [field.value_to_string(obj) for field, _descending in _ordering_fields(type(obj), ordering)]
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(model, token, ordering):
+    """Ordering values of a cursor token; raises ValueError when the token is not one of `ordering`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError(f"Invalid cursor: {token!r}")
 
-def paginate_results(model=None, items_per_page=10):
+    fields = _ordering_fields(model, ordering)
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    try:
+        return [field.to_python(value) for (field, _descending), value in zip(fields, values)]
+    except ValidationError:
+        raise ValueError(f"Invalid cursor: {token!r}")
+
+
+def _seek_condition(fields, values, backwards=False):
+    """
+    Rows strictly after (before, when `backwards`) the position `values`:
+    (a > x) OR (a = x AND b > y) OR ... – flipped per descending field.
+    """
+    condition = Q()
+    for position, ((field, descending), value) in enumerate(zip(fields, values)):
+        lookup = 'lt' if descending != backwards else 'gt'
+        step = Q(**{f'{field.attname}__{lookup}': value})
+        for (earlier_field, _descending), earlier_value in zip(fields[:position], values):
+            step &= Q(**{earlier_field.attname: earlier_value})
+        condition |= step
+    return condition
+
+
+def cursor_page(queryset, ordering, per_page, after=None, before=None):
+    """
+    Keyset pagination of `queryset` in `ordering` (field names, '-' for
+    descending; use indexed fields). `after` / `before` are cursor tokens of
+    the previous page; invalid tokens show the first page, as
+    Paginator.get_page does for invalid page numbers.
+    :return: CursorPage of up to `per_page` rows.
+    """
+    model = queryset.model
+    fields = _ordering_fields(model, ordering)
+    order_by = [f"{'-' if descending else ''}{field.attname}" for field, descending in fields]
+    reverse_order_by = [f"{'' if descending else '-'}{field.attname}" for field, descending in fields]
+
+    try:
+        if before:
+            values = decode_cursor(model, before, ordering)
+            rows = list(queryset.filter(_seek_condition(fields, values, backwards=True))
+                        .order_by(*reverse_order_by)[:per_page + 1])
+            if rows:
+                has_previous = len(rows) > per_page
+                return CursorPage(rows[:per_page][::-1], ordering, has_next=True, has_previous=has_previous)
+
+        elif after:
+            values = decode_cursor(model, after, ordering)
+            rows = list(queryset.filter(_seek_condition(fields, values)).order_by(*order_by)[:per_page + 1])
+            if rows:
+                return CursorPage(rows[:per_page], ordering, has_next=len(rows) > per_page, has_previous=True)
+    except ValueError:
+        pass
+
+    # no token, an invalid one, or nothing left beyond it (rows deleted meanwhile)
+
+    rows = list(queryset.order_by(*order_by)[:per_page + 1])
+    return CursorPage(rows[:per_page], ordering, has_next=len(rows) > per_page, has_previous=False)
+
+
+def _page_cache_key(model, request, items_per_page, cursor_ordering):
+    """
+    Cache key of one list page: the model's data version (bumped by every
+    committed write, so invalidation is one counter increment for all users),
+    the language, the page size / ordering and the page requested.
+    """
+    page = repr([request.GET.get(name) for name in ('page', 'after', 'before')])
+    digest = hashlib.sha1(f"{items_per_page}:{cursor_ordering}:{page}".encode('utf-8')).hexdigest()
+    return f"page_data:{model._meta.model_name}:{version_for(model)}:{get_language()}:{digest}"
+
+
+def paginate_results(model=None, items_per_page=10, cursor_ordering=None, cache_timeout=None):
     """
     Decorator to paginate results for a view method.
     :param model: The model to paginate results from. If None, no pagination is applied.
     :param items_per_page: Number of items to display per page.
+    :param cursor_ordering: Field names (e.g. ('id',)) to switch to keyset pagination on
+                            (?after= / ?before= tokens, see cursor_page) instead of page numbers.
+                            Page latency then stays the same at any depth; the fields should be indexed.
+    :param cache_timeout: Seconds to cache the rows of each page (None: no cache). The cache is
+                          shared by all users and dropped on the next committed write of the model;
+                          it is skipped without a shared cache backend (data_versions_shared).
     :return: A decorator that wraps the view method to add pagination functionality.
     """
     def decorator(view_method):
@@ -16,11 +170,38 @@ def paginate_results(model=None, items_per_page=10):
             context = view_method(view_instance, *args, **kwargs)
 
             items = model.objects.all().order_by('id') if model else []
+            request = view_instance.request
+
+            cache_key = None
+            if cache_timeout and model and data_versions_shared():
+                cache_key = _page_cache_key(model, request, items_per_page, cursor_ordering)
+                cached_page = cache.get(cache_key)
+            else:
+                cached_page = None
+
+            if cursor_ordering and model:
+                page_obj = cached_page
+                if page_obj is None:
+                    page_obj = cursor_page(
+                        model.objects.all(), cursor_ordering, items_per_page,
+                        after=request.GET.get('after'),
+                        before=request.GET.get('before'),
+                    )
+                    if cache_key:
+                        cache.set(cache_key, page_obj, cache_timeout)
 
-            if items is not []:
-                paginator = Paginator(items, items_per_page)
-                page_number = view_instance.request.GET.get('page')
-                page_obj = paginator.get_page(page_number)
+            elif items is not []:
+                # the page total comes from the count cache, not a COUNT(*) per page view
+                paginator = CachedCountPaginator(items, items_per_page)
+                if cached_page is not None:
+                    number, rows = cached_page
+                    page_obj = paginator._get_page(rows, number, paginator)
+                else:
+                    page_number = request.GET.get('page')
+                    page_obj = paginator.get_page(page_number)
+                    if cache_key:
+                        # the rows only – the paginator holds the unevaluated queryset
+                        cache.set(cache_key, (page_obj.number, list(page_obj.object_list)), cache_timeout)
 
             # Add the paginated items to the context
             context['data_for_content_container_wrapper_bottom'] = page_obj
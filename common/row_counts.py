@@ -0,0 +1,94 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from common.cache_versions import data_versions_shared, version_for
+
+
+# Cached counts live this long (seconds); writes make them unreachable sooner
+# by bumping the data version of the model.
+ROW_COUNT_CACHE_TIMEOUT = 60 * 10
+
+
+def estimated_row_count(model, using='default'):
+    """
+    The planner's row estimate of the model's table (pg_class.reltuples, kept
+    up to date by autovacuum / ANALYZE) – a catalog read instead of a table
+    scan. None on other databases and for tables never analysed.
+    """
+    db = connections[using]
+    if db.vendor != 'postgresql':
+        return None
+    with db.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def row_count(queryset, limit=None):
+    """
+    Count of `queryset` for pagination and result headers.
+
+    - Unfiltered querysets of tables larger than settings.ROW_COUNT_ESTIMATE_THRESHOLD
+      (0 disables it) are answered from estimated_row_count on PostgreSQL.
+    - Otherwise the exact count is cached under the query and the model's
+      data version, so it is counted again only after a committed write
+      (with a shared cache only, see data_versions_shared).
+    :param queryset: The queryset to count.
+    :param limit: Count at most this many rows; beyond it the count is reported as an estimate.
+    :return: (count, is_estimate)
+    """
+    model = queryset.model
+    threshold = getattr(settings, 'ROW_COUNT_ESTIMATE_THRESHOLD', 0)
+    if threshold and not queryset.query.has_filters():
+        estimate = estimated_row_count(model, using=queryset.db)
+        if estimate is not None and estimate >= threshold:
+            return (min(estimate, limit), True) if limit is not None else (estimate, True)
+
+    if not data_versions_shared():
+        return _count(queryset, limit)
+
+    try:
+        sql = repr(queryset.order_by().query.sql_with_params())
+    except EmptyResultSet:
+        return 0, False
+    digest = hashlib.sha1(f"{queryset.db}:{sql}".encode('utf-8')).hexdigest()
+    key = f"row_count:{model._meta.model_name}:{version_for(model)}:{digest}:{limit}"
+
+    result = cache.get(key)
+    if result is None:
+        result = _count(queryset, limit)
+        cache.set(key, result, ROW_COUNT_CACHE_TIMEOUT)
+    return tuple(result)
+
+
+def _count(queryset, limit):
+    if limit is None:
+        return queryset.order_by().count(), False
+    # stops at limit + 1 rows instead of reading every match
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count > limit
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator whose count comes from row_count – cached per data version, or
+    estimated for large tables – instead of a COUNT(*) on every page view.
+    count_is_estimate tells the template to print the page total as approximate.
+    """
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.count_is_estimate = row_count(self.object_list)
+        return count
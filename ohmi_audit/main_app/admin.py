@@ -2,12 +2,23 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 
+from common.row_counts import CachedCountPaginator
 from .models import Audit, Auditor, Customer
 
 
 UserModel = get_user_model()
 
 
+class CachedCountAdminMixin:
+    """
+    Change lists whose result counts come from the count cache
+    (common.row_counts); the extra unfiltered "N total" count of filtered
+    pages is skipped.
+    """
+    paginator = CachedCountPaginator
+    show_full_result_count = False
+
+
 @admin.register(UserModel)
 class AppUserAdmin(UserAdmin):
     # Display fields in list view
@@ -39,7 +50,7 @@ class AppUserAdmin(UserAdmin):
 
 
 @admin.register(Audit)
-class AuditAdmin(admin.ModelAdmin):
+class AuditAdmin(CachedCountAdminMixin, admin.ModelAdmin):
     # Display fields in list view
     list_display = ('name', 'category', 'date', 'is_active', 'created_at', 'updated_at')
 
@@ -64,7 +75,7 @@ class AuditAdmin(admin.ModelAdmin):
 
 
 @admin.register(Auditor)
-class AuditorAdmin(admin.ModelAdmin):
+class AuditorAdmin(CachedCountAdminMixin, admin.ModelAdmin):
     # Display fields in list view
     list_display = ('first_name', 'last_name', 'email', 'phone', 'created_at', 'updated_at')
 
@@ -88,7 +99,7 @@ class AuditorAdmin(admin.ModelAdmin):
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(CachedCountAdminMixin, admin.ModelAdmin):
     # Display fields in list view
     list_display = ('BG_Vor_Nr', 'company_name_en', 'company_name_bg', 'year', 'VAT_number', 'created_at', 'updated_at')
 
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import AuthenticationForm
+from django.core.validators import FileExtensionValidator
 from django.utils.translation import gettext_lazy as _
 
 from common.common_forms_data import *
@@ -92,13 +93,26 @@ class LoginForm(AuthenticationForm, ChangeLabelsMixin, FormWidgetStylesMixin):
 # DB Forms
 # ------------------------------------------------------------------------------------------
 class DeleteDatabaseForm(forms.Form):
-    pass
+    # set-based wipe, media files are removed in the background after the commit
+    fast_wipe = forms.BooleanField(label=_('Fast wipe'), required=False)
 
 
 class ImportDatabaseForm(forms.Form):
+    # .xlsx is parsed with openpyxl, the text formats with the (much faster) csv module
+    ALLOWED_EXTENSIONS = ['xlsx', 'csv', 'tsv', 'txt']
 
     select_file = forms.FileField(
         label=_('Select file'),
+        validators=[FileExtensionValidator(allowed_extensions=ALLOWED_EXTENSIONS)],
+        widget=forms.ClearableFileInput(attrs={
+            'accept': ','.join(f'.{extension}' for extension in ALLOWED_EXTENSIONS),
+        }),
+    )
+
+    # Dry run: show what the import would create / update, without writing anything
+    dry_run = forms.BooleanField(
+        label=_('Preview only (dry run)'),
+        required=False,
     )
 
 
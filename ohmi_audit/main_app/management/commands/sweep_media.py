@@ -0,0 +1,31 @@
+"""
+python manage.py sweep_media                           # list orphaned media files
+python manage.py sweep_media --delete                  # delete them
+python manage.py sweep_media --delete --incremental    # only directories changed since the last --delete sweep
+"""
+from django.core.management.base import BaseCommand
+
+from common.media_management import MediaManagement
+
+
+class Command(BaseCommand):
+    help = "Reports (or deletes) files in the Audit upload directories that no Audit refers to."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help="Delete the orphaned files instead of listing them.")
+        parser.add_argument(
+            '--incremental', action='store_true', help="Only list directories changed since the last --delete sweep.",
+        )
+
+    def handle(self, *args, **options):
+        def report(batch):
+            for name in batch:
+                self.stdout.write(name)
+
+        counts = MediaManagement.sweep_orphaned_media(
+            delete=options['delete'], incremental=options['incremental'], report=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Directories scanned: {counts['scanned_dirs']}, skipped: {counts['skipped_dirs']}, "
+            f"files: {counts['files']}, orphans: {counts['orphans']}, deleted: {counts['deleted']}"
+        ))
@@ -0,0 +1,112 @@
+# Customer search indexes: GIN trigram indexes on PostgreSQL, an FTS5 trigram
+# table on SQLite (queried by common.customer_search.search_customers).
+#
+# The DDL is spelled out here, not imported from the app, so this migration
+# keeps doing what it did when it was written.
+
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger('ohmi_audit')
+
+CUSTOMER_TABLE = 'main_app_customer'
+SEARCH_TABLE = 'main_app_customer_search'
+SEARCH_FIELDS = ('company_name_bg', 'company_name_en', 'BG_Vor_Nr', 'company_id', 'year', 'VAT_number')
+
+
+def _execute(db, sql):
+    with db.cursor() as cursor:
+        cursor.execute(sql)
+
+
+def install_search_index(db):
+    """
+    Creates the search indexes on the `db` connection:
+    - PostgreSQL: the pg_trgm extension and one GIN trigram index per
+      searched column, on the UPPER(column::text) expression icontains uses;
+    - SQLite 3.34+: the FTS5 trigram table, its sync triggers, and a rebuild
+      from the existing rows.
+    Other databases, and a customer table without the searched columns (a
+    schema behind the model – logged as a warning), keep the plain lookups.
+    """
+    with db.cursor() as cursor:
+        columns = {column.name for column in db.introspection.get_table_description(cursor, CUSTOMER_TABLE)}
+    missing = [field for field in SEARCH_FIELDS if field not in columns]
+    if missing:
+        logger.warning(
+            "Customer search index not installed: %s has no column(s) %s. Searches use plain "
+            "lookups; migrate main_app back to 0002 and forward again once the table is fixed.",
+            CUSTOMER_TABLE, ', '.join(missing),
+        )
+        return
+
+    if db.vendor == 'postgresql':
+        _execute(db, "CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for field in SEARCH_FIELDS:
+            _execute(
+                db,
+                f'CREATE INDEX IF NOT EXISTS customer_{field.lower()}_trgm ON {CUSTOMER_TABLE} '
+                f'USING gin ((UPPER("{field}"::text)) gin_trgm_ops)'
+            )
+
+    elif db.vendor == 'sqlite' and db.Database.sqlite_version_info >= (3, 34, 0):
+        columns = ', '.join(f'"{field}"' for field in SEARCH_FIELDS)
+        new_values = ', '.join(f'new."{field}"' for field in SEARCH_FIELDS)
+        old_values = ', '.join(f'old."{field}"' for field in SEARCH_FIELDS)
+        delete_old = (
+            f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+        )
+        insert_new = f"INSERT INTO {SEARCH_TABLE} (rowid, {columns}) VALUES (new.id, {new_values});"
+
+        _execute(
+            db,
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            f"{columns}, content='{CUSTOMER_TABLE}', content_rowid='id', tokenize='trigram')"
+        )
+        _execute(
+            db,
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {CUSTOMER_TABLE} "
+            f"BEGIN {insert_new} END"
+        )
+        _execute(
+            db,
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {CUSTOMER_TABLE} "
+            f"BEGIN {delete_old} END"
+        )
+        _execute(
+            db,
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE ON {CUSTOMER_TABLE} "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        _execute(db, f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(db):
+    if db.vendor == 'postgresql':
+        for field in SEARCH_FIELDS:
+            _execute(db, f"DROP INDEX IF EXISTS customer_{field.lower()}_trgm")
+
+    elif db.vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            _execute(db, f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{suffix}")
+        _execute(db, f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_customer_updated_at_index_customertombstone'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
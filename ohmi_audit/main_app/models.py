@@ -1,12 +1,14 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models, transaction
 from django.urls import reverse
+from django.utils import timezone
 from django.core.validators import MaxLengthValidator
 
+from common.cache_versions import VersionedQuerySet
 from common.common_models_data import *
 
-__all__ = ['Audit', 'Auditor', 'Customer', 'AppUser']
+__all__ = ['Audit', 'Auditor', 'Customer', 'CustomerTombstone', 'AppUser']
 
 
 """
@@ -31,6 +33,8 @@ class Audit(CustomModelBase):
     """
     Represents an audit record in the system.
     """
+    objects = VersionedQuerySet.as_manager()
+
     # blank is used to allow empty values in forms, null is used to allow NULL in the database
     name = models.CharField(
         max_length=CustomModelData.MAX_CHARFIELD_LENGTH,
@@ -118,6 +122,8 @@ class Auditor(CustomModelBase):
     """
     Represents an auditor in the system.
     """
+    objects = VersionedQuerySet.as_manager()
+
     first_name = models.CharField(
         max_length=CustomModelData.MAX_FIRST_NAME_CHARFIELD_LENGTH,
         blank=False,
@@ -175,10 +181,28 @@ class Auditor(CustomModelBase):
         return reverse('auditor-detail', kwargs={'pk': self.pk})
 
 
+class CustomerQuerySet(VersionedQuerySet):
+    """
+    Customer queryset: delete() records the tombstones of the deleted keys
+    with one INSERT ... SELECT instead of one INSERT per row in the
+    post_delete receiver (which skips queryset deletes).
+    """
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            CustomerTombstone.record(self)
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class Customer(CustomModelBase):
     """
     Represents a customer in the system.
     """
+    objects = CustomerQuerySet.as_manager()
+
     year = models.IntegerField(
         blank=False,
         null=False,
@@ -220,6 +244,10 @@ class Customer(CustomModelBase):
         verbose_name = "Customer"
         verbose_name_plural = "Customers"
         ordering = ['id']
+        indexes = [
+            # delta exports: updated_at > since, ordered by (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='customer_updated_at_idx'),
+        ]
 
     @property
     def full_name(self) -> str:
@@ -236,6 +264,48 @@ class Customer(CustomModelBase):
         return reverse('customer-detail', kwargs={'pk': self.pk})
 
 
+class CustomerTombstone(models.Model):
+    """
+    Records the key of a deleted Customer, so delta exports can report
+    deletions (see DbManagement.stream_export).
+    """
+    BG_Vor_Nr = models.CharField(
+        max_length=CustomModelData.MAX_CHARFIELD_LENGTH,
+        blank=False,
+        null=False,
+    )
+
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+    )
+
+    class Meta:
+        verbose_name = "Customer tombstone"
+        verbose_name_plural = "Customer tombstones"
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        return f"Deleted customer: {self.BG_Vor_Nr}"
+
+    @classmethod
+    def record(cls, customers):
+        """
+        Records a tombstone for every customer of the queryset `customers`
+        with one INSERT ... SELECT – no rows are loaded.
+        """
+        connection = connections[customers.db]
+        qn = connection.ops.quote_name
+        sql, params = customers.order_by().values('BG_Vor_Nr').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(cls._meta.db_table)} "
+                f"({qn(cls._meta.get_field('BG_Vor_Nr').column)}, {qn(cls._meta.get_field('deleted_at').column)}) "
+                f"SELECT deleted_customers.{qn(Customer._meta.get_field('BG_Vor_Nr').column)}, %s FROM ({sql}) deleted_customers",
+                [timezone.now(), *params],
+            )
+
+
 class AppUser(AbstractUser, CustomModelBase):
     """
     Represents a user in the system.
@@ -2,8 +2,30 @@
 This module defines Celery tasks for the main_app. These tasks can be executed asynchronously to
 perform background processing without blocking the main application.
 """
+import logging
 import time
+from urllib.parse import urlencode
+
 from celery import shared_task
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import translation
+from django.utils.translation import gettext
+
+from common.db_management import DbManagement
+from common.media_management import MediaManagement
+
+logger = logging.getLogger('ohmi_audit')
+
+
+# Cache key of the live progress meta of a task (see import_customers_task).
+TASK_PROGRESS_KEY = 'task_progress:{task_id}'
+TASK_PROGRESS_TIMEOUT = 60 * 60
+
+
+def cached_task_progress(task_id):
+    """The progress meta a task published through the cache, None when there is none."""
+    return cache.get(TASK_PROGRESS_KEY.format(task_id=task_id))
 
 
 @shared_task(bind=True)
@@ -13,3 +35,112 @@ def long_running_task(self, duration=5):
         time.sleep(1)
         self.update_state(state='PROGRESS', meta={'current': i, 'total': duration})
     return f"Completed {duration} second task"
+
+
+@shared_task(bind=True)
+def import_customers_task(self, file_name, language=None):
+    """
+    Imports a spooled upload (see DbManagement.spool_import_file) in the background.
+
+    After every written batch the task reports progress meta:
+    rows processed / total plus the created / updated / unchanged / error counts so far.
+    The spooled file is removed from storage when the import finishes or fails.
+
+    The django-db result backend stores update_state on the default database
+    connection – inside a sheet's transaction that row would stay invisible
+    until the sheet commits (and vanish with a rollback). So batch progress
+    goes to the cache (cached_task_progress, read by task_status), and the
+    PROGRESS state is stored only between sheets, outside any transaction.
+    """
+    def report_progress(counts, in_transaction):
+        meta = {
+            'current': counts['processed'],
+            'total': counts['total'] or counts['processed'],
+            'created': counts['created'],
+            'updated': counts['updated'],
+            'unchanged': counts['unchanged'],
+            'errors': counts['errors'],
+        }
+        cache.set(TASK_PROGRESS_KEY.format(task_id=self.request.id), meta, TASK_PROGRESS_TIMEOUT)
+        if not in_transaction:
+            self.update_state(state='PROGRESS', meta=meta)
+
+    storage = DbManagement.private_storage()
+    try:
+        with translation.override(language), storage.open(file_name, 'rb') as spooled_file:
+            counts = DbManagement._import_workbook(spooled_file, progress=report_progress)
+            message = str(DbManagement._import_message(counts))
+            error_report_url = DbManagement.private_file_url(counts['error_report']) if counts['error_report'] else None
+    finally:
+        storage.delete(file_name)
+
+    logger.info("import_customers_task finished for '%s': %s", file_name, message)
+    return {
+        'message': message,
+        'created': counts['created'],
+        'updated': counts['updated'],
+        'unchanged': counts['unchanged'],
+        'skipped': counts['skipped'],
+        'errors': counts['errors'],
+        'error_report_url': error_report_url,
+    }
+
+
+@shared_task(bind=True)
+def preview_import_task(self, file_name, language=None):
+    """
+    Dry run of a spooled upload (see DbManagement.preview_import) in the background.
+
+    Returns the preview plus 'preview_url', the database management page
+    that renders it (DbIndexView reads the result of this task).
+    The spooled file is removed from storage when the preview finishes or fails.
+    """
+    self.update_state(state='PROGRESS', meta={'current': 0, 'total': 1})
+
+    storage = DbManagement.private_storage()
+    try:
+        with translation.override(language), storage.open(file_name, 'rb') as spooled_file:
+            preview = DbManagement.preview_import(spooled_file)
+            preview['message'] = str(preview['message'])
+            preview['preview_url'] = f"{reverse('db_index')}?{urlencode({'preview': self.request.id})}"
+    finally:
+        storage.delete(file_name)
+
+    logger.info("preview_import_task finished for '%s': %s", file_name, preview['message'])
+    return preview
+
+
+@shared_task(bind=True)
+def export_customers_task(self, language=None):
+    """
+    Writes the customer export workbook to private storage in the background
+    (see DbManagement.export_to_storage) and returns its login-protected download URL.
+
+    While no Customer row changes, the stored workbook of the current table
+    version is returned instead of being rebuilt.
+    """
+    self.update_state(state='PROGRESS', meta={'current': 0, 'total': 1})
+
+    with translation.override(language):
+        file_name, created = DbManagement.export_to_storage()
+        message = gettext("Export ready.") if created else gettext("Export ready (no changes since the last export).")
+        download_url = DbManagement.private_file_url(file_name)
+
+    logger.info("export_customers_task finished: '%s' (%s)", file_name, 'new' if created else 'cached')
+    return {
+        'message': message,
+        'download_url': download_url,
+        'cached': not created,
+    }
+
+
+@shared_task(bind=True)
+def sweep_media_task(self, delete=True, incremental=True):
+    """
+    Deletes (or with delete=False only counts) the media files no Audit refers
+    to (see MediaManagement.sweep_orphaned_media). Incremental by default, so
+    a scheduled run only lists the directories changed since the last one.
+    """
+    counts = MediaManagement.sweep_orphaned_media(delete=delete, incremental=incremental)
+    logger.info("sweep_media_task finished: %s", counts)
+    return counts
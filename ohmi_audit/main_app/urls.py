@@ -5,6 +5,7 @@ from django.http import HttpResponse
 from ohmi_audit.main_app.views import (
     # Main views
     IndexView,
+    CustomerTypeaheadView,
 
     # Auth views
     SignUpView,
@@ -24,7 +25,7 @@ from ohmi_audit.main_app.views import (
     redirect_from_here_view,
 )
 
-from ohmi_audit.main_app.views.db_management_views import DbIndexView
+from ohmi_audit.main_app.views.db_management_views import CustomerExportStreamView, DbIndexView, PrivateFileView
 
 
 urlpatterns = [
@@ -32,9 +33,18 @@ urlpatterns = [
     # path('', index_view, name='index'),
     path('', IndexView.as_view(), name='index'),
 
+    # http://localhost:8000/customers/typeahead/?q=BG-0
+    path('customers/typeahead/', CustomerTypeaheadView.as_view(), name='customer-typeahead'),
+
     # http://localhost:8000/db/
     path('db/', DbIndexView.as_view(), name='db_index'),
 
+    # http://localhost:8000/db/export/csv/ or http://localhost:8000/db/export/ndjson/
+    path('db/export/<str:export_format>/', CustomerExportStreamView.as_view(), name='db_export_stream'),
+
+    # http://localhost:8000/db/files/import_reports/import_errors_20260101_120000_ab12cd34.csv
+    path('db/files/<path:name>', PrivateFileView.as_view(), name='db_private_file'),
+
     #Auth
     # ----------------------------------------------------------------
     # http://localhost:8000/signup/
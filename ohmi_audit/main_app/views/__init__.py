@@ -3,7 +3,7 @@ Views package for the main_app.
 Exposes all views for backward compatibility with existing imports.
 """
 # Main views
-from .main_views import IndexView
+from .main_views import IndexView, CustomerTypeaheadView
 
 # Authentication views
 from .auth_views import SignUpView, LoginView, LogoutView
@@ -22,6 +22,7 @@ from .other_views import about_us_view, redirect_from_here_view
 __all__ = [
     # Main views
     'IndexView',
+    'CustomerTypeaheadView',
     
     # Auth views
     'SignUpView',
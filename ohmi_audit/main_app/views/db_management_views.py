@@ -2,22 +2,32 @@
 Database Management views.
 """
 import logging
+import re
 
+from celery.result import AsyncResult
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpRequest, HttpResponseBadRequest
 from django.shortcuts import render
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
 from django.utils.translation import gettext_lazy as _
+from django.views import View
 
 from common.base_view import BaseView
 from common.db_management import DbManagement
 from ohmi_audit.main_app.forms import *
+from ohmi_audit.main_app.tasks import export_customers_task, import_customers_task, preview_import_task
 
 logger = logging.getLogger('ohmi_audit')
 
 UserModel = get_user_model()
 all_users = []
 
+# same check as django.middleware.gzip.GZipMiddleware
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
 
 class DbIndexView(LoginRequiredMixin, BaseView):
     """
@@ -51,12 +61,36 @@ class DbIndexView(LoginRequiredMixin, BaseView):
             'export_db_form': self.export_db_form,
 
             'message': kwargs.get('message', None),  # Get message from kwargs
+
+            # need to pass the task ID to the template for tracking background imports
+            'task_id': kwargs.get('task_id'),
+
+            # result of a dry-run import (DbManagement.preview_import)
+            'import_preview': kwargs.get('import_preview'),
         }
         return context
 
+    # -----------------------------------------------------------------------
+    def get(self, request: HttpRequest):
+        message = None
+        import_preview = None
+
+        # ?preview=<task id> renders the result of a finished preview_import_task
+        preview_task_id = request.GET.get('preview')
+        if preview_task_id:
+            task_result = AsyncResult(preview_task_id)
+            if task_result.successful() and isinstance(task_result.result, dict):
+                import_preview = task_result.result
+                message = import_preview.get('message')
+
+        return render(request, self.template_name, self.get_context_data(
+            message=message, import_preview=import_preview,
+        ))
+
     # -----------------------------------------------------------------------
     def post(self, request: HttpRequest):
         message = None
+        task_id = None
 
         # -----------------------------------------------------------------------
         # 1. Delete Database
@@ -65,7 +99,7 @@ class DbIndexView(LoginRequiredMixin, BaseView):
                 self.delete_db_form = DeleteDatabaseForm(request.POST)
 
                 if self.delete_db_form.is_valid():
-                    message = DbManagement.delete_database()
+                    message = DbManagement.delete_database(fast=self.delete_db_form.cleaned_data['fast_wipe'])
                     self.delete_db_form = DeleteDatabaseForm()
 
                 self.import_db_form = ImportDatabaseForm()
@@ -84,8 +118,22 @@ class DbIndexView(LoginRequiredMixin, BaseView):
                 self.import_db_form = ImportDatabaseForm(request.POST, request.FILES)
 
                 if self.import_db_form.is_valid():
+                    # Spool the upload and import (or, for a dry run, preview) it in
+                    # a Celery worker, so the request returns immediately whatever the file size.
+                    dry_run = self.import_db_form.cleaned_data['dry_run']
+                    task_function = preview_import_task if dry_run else import_customers_task
+
                     uploaded_file = self.import_db_form.cleaned_data['select_file']
-                    message = DbManagement.import_from_excel(uploaded_file)
+                    file_name = DbManagement.spool_import_file(uploaded_file)
+                    try:
+                        task = task_function.delay(file_name, translation.get_language())
+                    except Exception:
+                        DbManagement.private_storage().delete(file_name)
+                        raise
+
+                    logger.info("%s dispatched with id=%s by user %s", task_function.name, task.id, request.user)
+                    task_id = task.id
+                    message = _("Preview started. Tracking progress...") if dry_run else _("Import started. Tracking progress...")
                     self.import_db_form = ImportDatabaseForm()
 
                 self.delete_db_form = DeleteDatabaseForm()
@@ -104,17 +152,85 @@ class DbIndexView(LoginRequiredMixin, BaseView):
                 self.export_db_form = ExportDatabaseForm(request.POST)
 
                 if self.export_db_form.is_valid():
-                    # export_to_excel() returns an HttpResponse with the file
-                    # attached – return it immediately to trigger the download.
-                    return DbManagement.export_to_excel()
+                    # The workbook is written to media storage by a Celery worker;
+                    # the task status widget shows the download link when it is ready.
+                    task = export_customers_task.delay(translation.get_language())
+                    logger.info("export_customers_task dispatched with id=%s by user %s", task.id, request.user)
+                    task_id = task.id
+                    message = _("Export started. Tracking progress...")
 
                 self.delete_db_form = DeleteDatabaseForm()
                 self.import_db_form = ImportDatabaseForm()
 
             except Exception as e:
-                logger.error("export_to_excel form error: %s", e, exc_info=True)
+                logger.error("export_to_storage form error: %s", e, exc_info=True)
                 self.export_db_form.add_error(None, _("An error occurred during processing."))
                 self.delete_db_form = DeleteDatabaseForm()
                 self.import_db_form = ImportDatabaseForm()
 
-        return render(request, self.template_name, self.get_context_data(message=message))
+        return render(request, self.template_name, self.get_context_data(message=message, task_id=task_id))
+
+
+class CustomerExportStreamView(LoginRequiredMixin, View):
+    """
+    GET endpoint streaming all customers as CSV or newline-delimited JSON
+    (DbManagement.stream_export). The body is gzip-compressed on the fly when
+    the client sends 'Accept-Encoding: gzip'.
+
+    ?since=<ISO timestamp or X-Export-Cursor token> limits the export to the
+    customers changed and deleted since then, and ?search_query=<text> to the
+    customers the index page search finds.
+    """
+    # -----------------------------------------------------------------------
+    login_url = 'login'
+    redirect_field_name = 'next'
+
+    # -----------------------------------------------------------------------
+    def get(self, request: HttpRequest, export_format):
+        if export_format not in DbManagement.EXPORT_STREAM_FORMATS:
+            raise Http404(f"Unsupported export format '{export_format}'.")
+
+        since = request.GET.get('since')
+        if since:
+            try:
+                since = DbManagement.parse_export_since(since)
+            except ValueError as e:
+                return HttpResponseBadRequest(str(e))
+
+        gzip = bool(re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        response = DbManagement.stream_export(
+            export_format, gzip=gzip, since=since or None, search_query=request.GET.get('search_query', ''),
+        )
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        logger.info("customer export stream (%s) started by user %s", export_format, request.user)
+        return response
+
+
+class PrivateFileView(LoginRequiredMixin, View):
+    """
+    GET endpoint sending a file of DbManagement.private_storage – a customer
+    export workbook or a rejected-rows report of an import – as a download,
+    to logged-in users only.
+    """
+    # -----------------------------------------------------------------------
+    login_url = 'login'
+    redirect_field_name = 'next'
+
+    # only these private_storage directories can be downloaded
+    download_dirs = (DbManagement.EXPORT_DIR, DbManagement.IMPORT_REPORT_DIR)
+
+    # -----------------------------------------------------------------------
+    def get(self, request: HttpRequest, name):
+        directory, _sep, file_name = name.partition('/')
+        if directory not in self.download_dirs or not file_name or '/' in file_name:
+            raise Http404("No such file.")
+
+        storage = DbManagement.private_storage()
+        try:
+            file = storage.open(name, 'rb')
+        except (FileNotFoundError, SuspiciousFileOperation):
+            raise Http404("No such file.")
+
+        logger.info("private file '%s' downloaded by user %s", name, request.user)
+        return FileResponse(file, as_attachment=True, filename=file_name)
@@ -10,9 +10,11 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpRequest, JsonResponse
 from django.shortcuts import render, redirect
 from django.utils.translation import gettext_lazy as _
-from django.core.cache import cache
+from django.views import View
 
 from common.base_view import BaseView
+from common.customer_search import SEARCH_PAGE_SIZE, cached_search_page, normalize_search_query
+from common.customer_typeahead import TYPEAHEAD_LIMIT, TYPEAHEAD_MAX_LIMIT, get_typeahead_index
 from common.pagination_decorator import paginate_results
 from ohmi_audit.main_app.forms import *
 from ohmi_audit.main_app.models import *
@@ -52,18 +54,11 @@ class IndexView(LoginRequiredMixin, BaseView):
     # -----------------------------------------------------------------------
     # Audit  # Set the model for pagination and for listing
     # add this decorator only if you want to paginate the results
-    @paginate_results(model=Customer, items_per_page=10)
+    # keyset pagination on the primary key: late pages cost the same as the first.
+    # The page rows are cached for all users until the next committed Customer write.
+    @paginate_results(model=Customer, items_per_page=10, cursor_ordering=('id',), cache_timeout=60 * 5)
     def get_context_data(self, **kwargs):
         """Shared context for both GET and POST"""
-        cache_key = f"audit_list_{self.request.user.id}"  # User-specific cache
-        cached_data = cache.get(cache_key)
-
-        if not cached_data:
-            all_items = Customer.objects.all()
-            cache.set(cache_key, all_items, timeout=60)  # Cache for 5 minutes
-        else:
-            all_items = cached_data
-
         # -----------------------------------------------------------------------
         context = {
             'page_title': self.page_title,
@@ -73,7 +68,7 @@ class IndexView(LoginRequiredMixin, BaseView):
             # Pass the form instance, not the class
 
             'message': None,  # Placeholder for any messages
-            'data_for_content_container_wrapper_bottom': all_items,
+            'data_for_content_container_wrapper_bottom': None,  # the page rows, set by paginate_results
 
             'card_button_1_name': _('New Record'),  # Mark for translation
             'card_button_2_name': _('Search'),
@@ -88,28 +83,27 @@ class IndexView(LoginRequiredMixin, BaseView):
         if request.content_type == 'application/json':
             try:
                 data = json.loads(request.body)
-                search_query = data.get('search_query', '')
+                search_query = normalize_search_query(data.get('search_query', ''))
                 
                 if search_query:
                     # Search across multiple fields in Customer model
-                    from django.db.models import Q
-                    
-                    results = Customer.objects.filter(
-                        Q(company_name_bg__icontains=search_query) |
-                        Q(company_name_en__icontains=search_query) |
-                        Q(BG_Vor_Nr__icontains=search_query) |
-                        Q(company_id__icontains=search_query) |
-                        Q(year__icontains=search_query) |
-                        Q(VAT_number__icontains=search_query)
-                    )
-                    
-                    # Serialize the results
-                    results_data = list(results.values())  # Convert to list of dictionaries
+                    # (the same filter scopes the search result export)
+                    try:
+                        limit = int(data.get('limit') or SEARCH_PAGE_SIZE)
+                        cursor = int(data['cursor']) if data.get('cursor') is not None else None
+                    except (TypeError, ValueError):
+                        return JsonResponse({
+                            'success': False,
+                            'error': 'Invalid limit or cursor'
+                        }, status=400)
+
+                    # One page of the table columns only; next_cursor fetches the next one.
+                    # Repeated searches are served from the cache until a customer changes.
+                    page = cached_search_page(search_query, limit=limit, cursor=cursor)
                     
                     return JsonResponse({
                         'success': True,
-                        'results': results_data,
-                        'count': len(results_data)
+                        **page,
                     })
                 else:
                     return JsonResponse({
@@ -125,9 +119,9 @@ class IndexView(LoginRequiredMixin, BaseView):
                 }, status=400)
         
         # -----------------------------------------------------------------------
-        # 0.5. Invalidate cache when changes are made
-        cache_key = f"audit_list_{request.user.id}"
-        cache.delete(cache_key)
+        # 0.5. Cached list pages need no invalidation here: every committed Customer
+        # write bumps the customer data version (common.custom_signals), which
+        # retires the cached pages of all users at once
 
         # -----------------------------------------------------------------------
         # 1. Delete handling (by the name of the button)
@@ -171,3 +165,23 @@ class IndexView(LoginRequiredMixin, BaseView):
             return redirect('index')
 
         return render(request, self.template_name, self.get_context_data(form=form_data, form_visibility="block"))
+
+
+class CustomerTypeaheadView(LoginRequiredMixin, View):
+    """
+    Prefix suggestions for the search box: GET ?q=<prefix>&limit=<n>.
+    Answered from the in-memory typeahead index of this worker, without a
+    database query once the index is built.
+    """
+    login_url = 'login'
+    redirect_field_name = 'next'
+
+    def get(self, request: HttpRequest):
+        try:
+            limit = int(request.GET.get('limit') or TYPEAHEAD_LIMIT)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Invalid limit'}, status=400)
+        limit = max(1, min(limit, TYPEAHEAD_MAX_LIMIT))
+
+        suggestions = get_typeahead_index().suggest(request.GET.get('q', ''), limit=limit)
+        return JsonResponse({'success': True, 'suggestions': suggestions})
@@ -10,7 +10,7 @@ from django.http import HttpRequest, JsonResponse
 from django.shortcuts import render
 from django.views.generic import View
 
-from ohmi_audit.main_app.tasks import long_running_task
+from ohmi_audit.main_app.tasks import cached_task_progress, long_running_task
 
 logger = logging.getLogger('ohmi_audit')
 
@@ -19,18 +19,46 @@ def task_status(request, task_id):
     """
     Check the status of a Celery task by its ID.
     Returns JSON with task status, progress, and result.
+
+    The endpoint needs no login, so of a dict result only the plain values
+    (message, counts, links) are returned – never lists such as the customer
+    keys and field values of a dry run's samples, which DbIndexView renders
+    behind its login.
     """
     task_result = AsyncResult(task_id)
 
+    result = task_result.result if task_result.ready() else None
+    if isinstance(result, dict):
+        result = {
+            key: value for key, value in result.items()
+            if value is None or isinstance(value, (str, int, float, bool))
+        }
+
     response_data = {
         'ready': task_result.ready(),
         'status': task_result.status,
-        'result': task_result.result if task_result.ready() else None,
+        'result': result,
     }
 
-    if task_result.status == 'PROGRESS':
-        response_data['progress'] = task_result.info.get('current', 0)
-        response_data['total'] = task_result.info.get('total', 1)
+    # A failed task's result is the exception instance, which is not JSON serialisable
+    if task_result.failed():
+        response_data['result'] = str(task_result.result)
+
+    # Progress a task published through the cache (imports do, while their
+    # transaction keeps the stored PROGRESS state behind) wins when it is further along
+    info = task_result.info if task_result.status == 'PROGRESS' else None
+    cached_info = None if task_result.ready() else cached_task_progress(task_id)
+    if cached_info and (info is None or cached_info.get('current', 0) >= info.get('current', 0)):
+        info = cached_info
+        response_data['status'] = 'PROGRESS'
+
+    if info is not None:
+        response_data['progress'] = info.get('current', 0)
+        response_data['total'] = info.get('total', 1)
+        # Any extra meta the task reports (e.g. created / updated / errors for imports)
+        response_data['details'] = {
+            key: value for key, value in info.items() if key not in ('current', 'total')
+        }
 
     return JsonResponse(response_data)
 
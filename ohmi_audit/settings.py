@@ -226,7 +226,7 @@ restore view.py from above
         - in PyCharm, go to Run -> Edit Configurations -> New -> Python
             - Name: celery
             - Script path: D:/Study/Projects/PycharmProjects/ohmi_audit/.venv/Scripts/celery.exe
-            - Parameters: celery -A ohmi_audit worker --loglevel=info -P solo
+            - Parameters: celery -A ohmi_audit worker --loglevel=info -P solo -Q celery,imports
             - Working directory: D:/Study/Projects/PycharmProjects/ohmi_audit
     - run both celery and ohmi_audit, below 2 terminals will be running
     - create a task in the tasks.py file and use it in a view
@@ -670,6 +670,12 @@ MEDIA_URL = '/media/'
 # but for user content
 MEDIA_ROOT = BASE_DIR / 'media_files'
 
+# Files only logged-in users may download (customer exports, rejected-row
+# reports), and import uploads waiting for a Celery worker. Not served under
+# MEDIA_URL – downloads go through the login-protected db_private_file view
+# (see DbManagement.private_storage).
+PRIVATE_MEDIA_ROOT = BASE_DIR / 'private_files'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # -----------------------------------------------------------------------------
@@ -692,6 +698,67 @@ else:
 # CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'django-db'
 
+# Imports (and their dry runs) go to their own queue, consumed by a `-P solo`
+# worker that may start the DB_IMPORT_WORKERS process pool (see below).
+CELERY_IMPORT_QUEUE = 'imports'
+CELERY_TASK_ROUTES = {
+    'ohmi_audit.main_app.tasks.import_customers_task': {'queue': CELERY_IMPORT_QUEUE},
+    'ohmi_audit.main_app.tasks.preview_import_task': {'queue': CELERY_IMPORT_QUEUE},
+}
+
+# -----------------------------------------------------------------------------
+# DB Management imports
+"""
+    - DB_IMPORT_WORKERS: number of processes that parse and validate import rows
+      in parallel (common.db_management). 0 or 1 parses in the importing process.
+    - size it to the cores of the host that runs the import worker
+    - imports are routed to the CELERY_IMPORT_QUEUE queue. Its worker runs with
+      `-P solo -Q imports` (the celery-imports services of docker-compose.yml
+      and render.yaml): prefork children are daemonic and cannot start a
+      process pool, and forking one from a `-P threads` worker is unsafe. An
+      import run by any other worker parses in-process.
+"""
+DB_IMPORT_WORKERS = int(os.getenv('DB_IMPORT_WORKERS', '0'))
+
+
+# -----------------------------------------------------------------------------
+# Row counts
+"""
+    - ROW_COUNT_ESTIMATE_THRESHOLD: from this many rows on, unfiltered list
+      pages (index pagination, admin changelists) show PostgreSQL's planner
+      estimate (pg_class.reltuples) instead of an exact COUNT(*)
+      (common.row_counts). 0 always counts exactly; exact counts are cached
+      until the next write either way.
+"""
+ROW_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('ROW_COUNT_ESTIMATE_THRESHOLD', '0'))
+
+
+# -----------------------------------------------------------------------------
+# Change tracking
+"""
+    - WRITE_TRANSACTION_MAX_SECONDS: the longest a transaction writing customers
+      may stay open – in practice one sheet of an import, which runs in a single
+      transaction. Rows carry the updated_at of the write but become visible at
+      commit, so change cursors (delta exports) look back this far and send such
+      rows again rather than miss them. The import logs a warning when a sheet
+      takes longer; raise the value for larger imports.
+"""
+WRITE_TRANSACTION_MAX_SECONDS = int(os.getenv('WRITE_TRANSACTION_MAX_SECONDS', str(60 * 15)))
+
+"""
+    - DATA_CACHE_SHARED: whether all web and Celery processes use one cache
+      (Redis). Cached search pages, list pages, row counts and export
+      artifacts are keyed by data versions kept in the cache
+      (common.cache_versions). A per-process LocMemCache never sees the
+      version bumps of other processes, such as a Celery import. Without a
+      shared cache those caches are skipped. The typeahead index then checks
+      for changes on every refresh.
+"""
+DATA_CACHE_SHARED = os.getenv(
+    'DATA_CACHE_SHARED',
+    str(CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache'),
+) == 'True'
+
 
 # -----------------------------------------------------------------------------
 # Logging Configuration
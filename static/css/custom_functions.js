@@ -17,7 +17,41 @@ function handleTableSearch() {
         return;
     }
     
-    // Send the search query to your Django main view
+    fetchSearchPage(searchQuery, null);
+}
+
+let typeaheadTimer = null;
+
+function handleTypeahead() {
+    // Suggest customers whose key, VAT number or name starts with the typed text.
+    // Waits for a short pause in typing, so not every keystroke sends a request
+    clearTimeout(typeaheadTimer);
+    typeaheadTimer = setTimeout(() => {
+        const prefix = document.getElementById("searchInput").value.trim();
+        const datalist = document.getElementById("searchSuggestions");
+        if (!prefix) {
+            datalist.innerHTML = '';
+            return;
+        }
+
+        fetch(`${i18n.typeaheadUrl}?q=${encodeURIComponent(prefix)}`)
+        .then(response => response.json())
+        .then(data => {
+            datalist.innerHTML = '';
+            (data.suggestions || []).forEach(suggestion => {
+                const option = document.createElement('option');
+                option.value = suggestion.value;
+                option.label = suggestion.BG_Vor_Nr;
+                datalist.appendChild(option);
+            });
+        })
+        .catch(error => console.error('Error:', error));
+    }, 150);
+}
+
+function fetchSearchPage(searchQuery, cursor) {
+    // Send the search query to your Django main view.
+    // Results come one page at a time: cursor is the next_cursor of the previous page
     fetch('/', {
         method: 'POST',
         headers: {
@@ -25,17 +59,22 @@ function handleTableSearch() {
             'X-CSRFToken': getCookie('csrftoken')  // Django CSRF protection
         },
         body: JSON.stringify({
-            search_query: searchQuery
+            search_query: searchQuery,
+            cursor: cursor
         })
     })
     .then(response => response.json())
     .then(data => {
         if (data.success) {
             console.log('Search results:', data);
-            updateTableWithResults(data.results);
-            
-            // Show a clear search button or message
-            showSearchStatus(data.count, searchQuery);
+            // the first page replaces the table rows, further pages are appended
+            updateTableWithResults(data.results, cursor !== null);
+            showLoadMoreButton(searchQuery, data.next_cursor);
+
+            // Show a clear search button or message (the count comes with the first page)
+            if (cursor === null) {
+                showSearchStatus(data.count_is_estimate ? `${data.count}+` : data.count, searchQuery);
+            }
         } else {
             showSearchWarning(i18n.searchFailed + ': ' + data.error);
         }
@@ -72,6 +111,7 @@ function showSearchStatus(count, query) {
     `;
     statusDiv.innerHTML = `
         <span style="font-weight: 500; font-size: 0.95rem;">${i18n.searchFoundResults} ${count} ${i18n.searchResultsFor} "${query}"</span>
+        <a href="${i18n.exportUrl}?search_query=${encodeURIComponent(query)}" style="font-size: 0.95rem;">${i18n.exportResults}</a>
         <button onclick="clearSearch()" style="padding: 5px 15px; cursor: pointer; background-color: var(--clr-button-color); color: white; border: none; border-radius: var(--button-border-radius); transition: var(--button-transition-style);" onmouseover="this.style.backgroundColor='var(--hover-color)'; this.style.color='var(--clr-font-color)'" onmouseout="this.style.backgroundColor='var(--clr-button-color)'; this.style.color='white'">${i18n.clearSearch}</button>
     `;
     
@@ -130,7 +170,32 @@ function showSearchWarning(message) {
     }
 }
 
-function updateTableWithResults(results) {
+function showLoadMoreButton(searchQuery, nextCursor) {
+    // Remove the button of the previous page, if any
+    const existingButton = document.querySelector('.search-load-more');
+    if (existingButton) {
+        existingButton.remove();
+    }
+    if (nextCursor === null) {
+        return;
+    }
+
+    const button = document.createElement('button');
+    button.className = 'search-load-more car-buttons-bar-button';
+    button.textContent = i18n.loadMore;
+    button.onclick = () => {
+        button.disabled = true;
+        fetchSearchPage(searchQuery, nextCursor);
+    };
+
+    // Insert after the table
+    const tableContainer = document.querySelector('.content-container-wrapper-bottom');
+    if (tableContainer) {
+        tableContainer.appendChild(button);
+    }
+}
+
+function updateTableWithResults(results, append = false) {
     // Find the table tbody
     const tbody = document.querySelector('.content-container-wrapper-bottom table tbody');
     
@@ -139,11 +204,13 @@ function updateTableWithResults(results) {
         return;
     }
     
-    // Clear existing rows
-    tbody.innerHTML = '';
+    // Clear existing rows (unless a further page is appended)
+    if (!append) {
+        tbody.innerHTML = '';
+    }
     
     // If no results found
-    if (results.length === 0) {
+    if (results.length === 0 && !append) {
         tbody.innerHTML = `<tr><td colspan="9">${i18n.noResultsFound}</td></tr>`;
         return;
     }
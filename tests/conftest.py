@@ -28,6 +28,19 @@ def clear_cache():
     cache.clear()
 
 
+@pytest.fixture(autouse=True)
+def private_media_root(settings, tmp_path):
+    """Keep the files stored in DbManagement.private_storage (reports, exports) out of the project."""
+    settings.PRIVATE_MEDIA_ROOT = tmp_path / 'private_files'
+    return settings.PRIVATE_MEDIA_ROOT
+
+
+@pytest.fixture(autouse=True)
+def shared_data_cache(settings):
+    """Every test runs in one process, so its LocMemCache acts as the shared cache of common.cache_versions."""
+    settings.DATA_CACHE_SHARED = True
+
+
 @pytest.fixture
 def api_client():
     """Provide REST Framework API client for tests"""
@@ -89,6 +102,26 @@ def auditor(db):
     )
 
 
+@pytest.fixture
+def make_customer(db):
+    """
+    Customer factory: make_customer(BG_Vor_Nr, company_name_en='TEST LTD', **fields)
+    creates a customer with the fields of `customer` for the rest;
+    save=False returns it unsaved (for bulk_create).
+    """
+    from ohmi_audit.main_app.models import Customer
+
+    def make(key, name_en='TEST LTD', save=True, **fields):
+        values = dict(
+            year=2026, BG_Vor_Nr=key, company_name_bg='Тест ООД', company_name_en=name_en,
+            company_id=123456789, VAT_number='BG123456789',
+        )
+        values.update(fields)
+        return Customer.objects.create(**values) if save else Customer(**values)
+
+    return make
+
+
 @pytest.fixture
 def customer(db):
     """Create a test customer"""
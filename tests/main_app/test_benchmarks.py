@@ -0,0 +1,198 @@
+"""
+Benchmarks for the DB management hot paths.
+
+They are marked `slow`, which pytest.ini deselects by default, and print
+their measurements – run them with `pytest -m slow -s`. The assertions only
+check the relative ordering, so they stay stable on slow CI machines.
+"""
+import csv
+import io
+import time
+
+import openpyxl
+import pytest
+
+from common.db_management import DbManagement
+
+
+BENCHMARK_ROWS = 20_000
+HEADERS = ('year', 'BG Vor.Nr.', 'Unternehmen-bg', 'Unternehmen-en', 'Company ID', 'VAT')
+
+
+def _benchmark_rows(count=BENCHMARK_ROWS):
+    return [
+        (2026, f'BG-{i:06d}/24', f'Тест {i} ООД', f'TEST {i} LTD', 100000000 + i, f'BG{100000000 + i}')
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def bulk_customers(db):
+    """Creates `count` customers with the values of _benchmark_rows, in one bulk insert."""
+    from ohmi_audit.main_app.models import Customer
+
+    def create(count):
+        Customer.objects.bulk_create(
+            Customer(year=year, BG_Vor_Nr=key, company_name_bg=name_bg, company_name_en=name_en,
+                     company_id=company_id, VAT_number=vat)
+            for year, key, name_bg, name_en, company_id, vat in _benchmark_rows(count)
+        )
+
+    return create
+
+
+def _parse_rows_per_second(upload):
+    """Time the read → header map → record building stages (no DB writes)."""
+    counts = {'skipped': 0, 'errors': 0, 'processed': 0}
+    start = time.perf_counter()
+    with DbManagement._open_import_sheets(upload) as [(sheet_key, _title, rows, _total)]:
+        header_map = DbManagement._map_headers(next(rows))
+        parsed = sum(1 for _record in DbManagement._iter_records(sheet_key, rows, header_map, counts))
+    elapsed = time.perf_counter() - start
+    assert parsed == BENCHMARK_ROWS
+    return parsed / elapsed
+
+
+@pytest.mark.slow
+class TestImportParseBenchmark:
+
+    def test_csv_parses_faster_than_xlsx(self):
+        rows = _benchmark_rows()
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(HEADERS)
+        for row in rows:
+            ws.append(row)
+        xlsx = io.BytesIO()
+        wb.save(xlsx)
+        xlsx.seek(0)
+
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+        csv_upload = io.BytesIO(text.getvalue().encode('utf-8-sig'))
+
+        xlsx_rate = _parse_rows_per_second(xlsx)
+        csv_rate = _parse_rows_per_second(csv_upload)
+
+        print(f"\nimport parse – xlsx: {xlsx_rate:,.0f} rows/s, csv: {csv_rate:,.0f} rows/s "
+              f"({csv_rate / xlsx_rate:.1f}x)")
+        assert csv_rate > xlsx_rate
+
+
+SEARCH_BENCHMARK_ROWS = 50_000
+SEARCH_QUERIES = ('TEST 4242 ', 'BG-031', '100012345', 'тест 777 ', 'NO SUCH COMPANY')
+
+
+def _search_ms_per_query(queries, rounds=5):
+    from common.customer_search import search_customers
+
+    start = time.perf_counter()
+    for _round in range(rounds):
+        for query in queries:
+            list(search_customers(query).values_list('id', flat=True))
+    return (time.perf_counter() - start) * 1000 / (rounds * len(queries))
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCustomerSearchBenchmark:
+
+    def test_fts_index_is_faster_than_the_icontains_chain(self, bulk_customers):
+        import importlib
+        from django.db import connection
+
+        migration = importlib.import_module('ohmi_audit.main_app.migrations.0003_customer_search_index')
+        install_search_index, drop_search_index = migration.install_search_index, migration.drop_search_index
+
+        if connection.vendor != 'sqlite':
+            pytest.skip("compares the SQLite FTS5 fallback with the plain lookups")
+
+        bulk_customers(SEARCH_BENCHMARK_ROWS)
+
+        chain_ms = _search_ms_per_query(SEARCH_QUERIES)
+        install_search_index(connection)
+        try:
+            fts_ms = _search_ms_per_query(SEARCH_QUERIES)
+        finally:
+            drop_search_index(connection)
+
+        print(f"\ncustomer search at {SEARCH_BENCHMARK_ROWS:,} rows – icontains chain: {chain_ms:.1f} ms/query, "
+              f"fts5 trigram: {fts_ms:.1f} ms/query ({chain_ms / fts_ms:.1f}x)")
+        assert fts_ms < chain_ms
+
+
+TYPEAHEAD_PREFIXES = ('BG-0312', 'test 42', 'тест 7', 'BG1000123', 'NO SUCH')
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCustomerTypeaheadBenchmark:
+
+    def test_index_answers_prefixes_faster_than_the_database(self, bulk_customers):
+        from django.db.models import Q
+        from common.customer_typeahead import TYPEAHEAD_FIELDS, get_typeahead_index, reset_typeahead_index
+        from ohmi_audit.main_app.models import Customer
+
+        bulk_customers(SEARCH_BENCHMARK_ROWS)
+        reset_typeahead_index()
+        try:
+            index = get_typeahead_index()
+            start = time.perf_counter()
+            for _round in range(100):
+                for prefix in TYPEAHEAD_PREFIXES:
+                    index.suggest(prefix)
+            index_ms = (time.perf_counter() - start) * 1000 / (100 * len(TYPEAHEAD_PREFIXES))
+        finally:
+            reset_typeahead_index()
+
+        start = time.perf_counter()
+        for prefix in TYPEAHEAD_PREFIXES:
+            condition = Q()
+            for field in TYPEAHEAD_FIELDS:
+                condition |= Q(**{f'{field}__istartswith': prefix})
+            list(Customer.objects.filter(condition).values_list('id', *TYPEAHEAD_FIELDS)[:10])
+        db_ms = (time.perf_counter() - start) * 1000 / len(TYPEAHEAD_PREFIXES)
+
+        print(f"\ncustomer typeahead at {SEARCH_BENCHMARK_ROWS:,} rows – istartswith query: {db_ms:.2f} ms, "
+              f"sorted index: {index_ms:.3f} ms ({db_ms / index_ms:.0f}x)")
+        assert index_ms < db_ms
+
+
+ROW_BENCHMARK_ROWS = 100
+
+
+def _render_table_ms(rf, customers, rounds=20):
+    from django.template.loader import render_to_string
+
+    start = time.perf_counter()
+    for _round in range(rounds):
+        render_to_string(
+            'tables/customer_table.html', {'data_for_content_container_wrapper_bottom': customers},
+            request=rf.get('/'),
+        )
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCustomerRowFragmentBenchmark:
+
+    def test_cached_rows_render_faster_than_fresh_ones(self, rf, clear_cache, bulk_customers):
+        from django.core.cache import cache
+        from ohmi_audit.main_app.models import Customer
+
+        bulk_customers(ROW_BENCHMARK_ROWS)
+        customers = list(Customer.objects.order_by('id'))
+
+        fresh_ms = 0.0
+        for _round in range(20):
+            cache.clear()
+            fresh_ms += _render_table_ms(rf, customers, rounds=1) / 20
+        cached_ms = _render_table_ms(rf, customers)
+
+        print(f"\ncustomer table at {ROW_BENCHMARK_ROWS} rows – rendered: {fresh_ms:.1f} ms, "
+              f"from row fragments: {cached_ms:.1f} ms ({fresh_ms / cached_ms:.1f}x)")
+        assert cached_ms < fresh_ms
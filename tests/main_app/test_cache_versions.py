@@ -0,0 +1,82 @@
+"""
+Tests for common.cache_versions – the per-model data versions.
+"""
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from common.cache_versions import bump_data_version, version_for
+from ohmi_audit.main_app.models import Audit, Customer
+
+
+@pytest.mark.django_db
+class TestDataVersions:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clear_cache):
+        pass
+
+    def test_version_for_accepts_models_instances_and_names(self, make_customer):
+        assert version_for(Customer) == version_for('customer') == version_for(make_customer('X', save=False))
+        assert isinstance(version_for(Customer), int)
+
+    def test_bump_waits_for_the_commit(self, django_capture_on_commit_callbacks):
+        before = version_for(Customer)
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_data_version(Customer)
+            assert version_for(Customer) == before
+        assert version_for(Customer) == before + 1
+
+    def test_bumps_are_coalesced_per_transaction(self, django_capture_on_commit_callbacks, make_customer):
+        before, audits = version_for(Customer), version_for(Audit)
+        with patch.object(cache, 'incr', wraps=cache.incr) as incr:
+            with django_capture_on_commit_callbacks(execute=True):
+                for i in range(3):
+                    make_customer(f'CV-{i:03d}/24')
+                Customer.objects.all().delete()
+                Audit.objects.filter(pk=0).update(name='none')   # no rows changed – no bump
+
+        assert incr.call_count == 1
+        assert version_for(Customer) == before + 1
+        assert version_for(Audit) == audits
+
+    def test_rolled_back_savepoint_keeps_the_later_writes_bump(
+            self, django_capture_on_commit_callbacks, make_customer):
+        before = version_for(Customer)
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    make_customer('CV-001/24')   # its registration is dropped with the savepoint
+                    raise RuntimeError
+
+            make_customer('CV-002/24')
+        assert version_for(Customer) == before + 1
+
+    def test_rolled_back_transaction_does_not_swallow_the_next_bump(
+            self, django_capture_on_commit_callbacks, make_customer):
+        before = version_for(Customer)
+        with django_capture_on_commit_callbacks():
+            make_customer('CV-001/24')   # its commit never comes
+        assert version_for(Customer) == before
+
+        with django_capture_on_commit_callbacks(execute=True):
+            make_customer('CV-002/24')
+        assert version_for(Customer) == before + 1
+
+    @pytest.mark.parametrize('write', [
+        lambda make_customer: Customer.objects.bulk_create([make_customer('CV-010/24', save=False)]),
+        lambda make_customer: Customer.objects.update(company_name_en='RENAMED LTD'),
+        lambda make_customer: Customer.objects.bulk_update(
+            [Customer.objects.get(BG_Vor_Nr='CV-000/24')], ['company_name_en']),
+        lambda make_customer: Customer.objects.filter(BG_Vor_Nr='CV-000/24').delete(),
+    ], ids=['bulk_create', 'update', 'bulk_update', 'delete'])
+    def test_bulk_writes_bump(self, write, django_capture_on_commit_callbacks, make_customer):
+        with django_capture_on_commit_callbacks(execute=True):
+            Customer.objects.bulk_create([make_customer('CV-000/24', save=False)])
+        before = version_for(Customer)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            write(make_customer)
+        assert version_for(Customer) == before + 1
@@ -0,0 +1,87 @@
+"""
+Tests for the customer_rows template tag – the row fragment cache of the customer table.
+"""
+import re
+
+import pytest
+from django.middleware.csrf import _unmask_cipher_token
+from django.template.loader import render_to_string
+from django.utils import translation
+
+from ohmi_audit.main_app.models import Customer
+
+
+TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="([^"]*)"')
+
+
+def _secrets(html):
+    """The CSRF secrets behind the (per render masked) tokens of the row forms."""
+    return {_unmask_cipher_token(token) for token in TOKEN.findall(html)}
+
+
+def _render(rf, items, request=None):
+    request = request or rf.get('/')
+    return render_to_string(
+        'tables/customer_table.html', {'data_for_content_container_wrapper_bottom': items}, request=request,
+    ), request
+
+
+@pytest.fixture
+def customers(db, clear_cache, make_customer):
+    return [make_customer(f'FR-{i:03d}/24', f'FRAGMENT {i} LTD') for i in range(3)]
+
+
+@pytest.mark.django_db
+class TestCustomerRows:
+
+    def test_cached_rows_render_like_fresh_ones(self, rf, customers):
+        request = rf.get('/')
+        first, _request = _render(rf, customers, request)
+        second, _request = _render(rf, customers, request)
+
+        assert TOKEN.sub('', second) == TOKEN.sub('', first)
+        assert first.count('<tr>') == 1 + 2 * len(customers)   # header + two rows per customer
+        assert 'FRAGMENT 2 LTD' in first
+
+    def test_every_request_gets_its_own_csrf_token(self, rf, customers):
+        first, first_request = _render(rf, customers)
+        second, second_request = _render(rf, customers)
+
+        assert len(TOKEN.findall(second)) == 2 * len(customers)
+        assert _secrets(first) == {first_request.META['CSRF_COOKIE']}
+        assert _secrets(second) == {second_request.META['CSRF_COOKIE']}
+        assert 'placeholder' not in second
+
+    def test_rows_are_served_from_the_cache(self, rf, customers):
+        _render(rf, customers)
+        # same updated_at, so the cached fragment still matches
+        Customer.objects.filter(pk=customers[0].pk).update(
+            company_name_en='NOT RENDERED', updated_at=customers[0].updated_at,
+        )
+
+        html, _request = _render(rf, list(Customer.objects.order_by('id')))
+        assert 'FRAGMENT 0 LTD' in html
+        assert 'NOT RENDERED' not in html
+
+    def test_edit_renders_the_row_again(self, rf, customers):
+        _render(rf, customers)
+        customers[0].company_name_en = 'EDITED LTD'
+        customers[0].save()
+
+        html, _request = _render(rf, customers)
+        assert 'EDITED LTD' in html
+        assert 'FRAGMENT 0 LTD' not in html
+
+    def test_languages_are_cached_separately(self, rf, customers, monkeypatch):
+        from ohmi_audit.main_app.templatetags import customer_rows
+
+        keys = []
+        monkeypatch.setattr(customer_rows.cache, 'get_many', lambda k: keys.extend(k) or {})
+        for language in ('en', 'bg'):
+            with translation.override(language):
+                _render(rf, customers[:1])
+        assert keys[0].endswith(':en') and keys[1].endswith(':bg')
+
+    def test_without_a_token_the_hidden_inputs_are_dropped(self, customers):
+        html = render_to_string('tables/customer_table.html', {'data_for_content_container_wrapper_bottom': customers})
+        assert 'csrfmiddlewaretoken' not in html
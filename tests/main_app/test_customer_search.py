@@ -0,0 +1,208 @@
+"""
+Tests for common.customer_search – the plain lookups, the SQLite FTS5 index,
+the paginated search responses and their cache.
+"""
+import importlib
+
+import pytest
+from django.db import connection
+
+import common.customer_search
+from common.customer_search import (
+    cached_search_page, has_search_index, normalize_search_query, search_customers, search_page,
+)
+from ohmi_audit.main_app.models import Customer
+
+# the suite runs without migrations; the index DDL lives in migration 0003
+search_index_migration = importlib.import_module('ohmi_audit.main_app.migrations.0003_customer_search_index')
+install_search_index = search_index_migration.install_search_index
+drop_search_index = search_index_migration.drop_search_index
+
+
+def _keys(queryset):
+    return sorted(queryset.values_list('BG_Vor_Nr', flat=True))
+
+
+@pytest.fixture
+def customers(db, django_capture_on_commit_callbacks, make_customer):
+    # committed, so the later writes of a test register their own data version bump
+    with django_capture_on_commit_callbacks(execute=True):
+        return [
+            make_customer('BG-001/24', 'ALPHA TRADING LTD', company_id=111222333),
+            make_customer('BG-002/24', 'BETA LTD', company_name_bg='Бета ЕООД', year=2025),
+            make_customer('DE-003/24', 'Gamma GmbH', VAT_number='DE998877'),
+        ]
+
+
+@pytest.fixture
+def search_index(db):
+    install_search_index(connection)
+    yield
+    drop_search_index(connection)
+
+
+@pytest.mark.django_db
+class TestSearchCustomers:
+
+    QUERIES = ['alpha', 'LTD', 'gmbh', 'BG-00', '/24', '111222', '2025', 'DE998', 'Бета', 'no match']
+
+    def test_plain_lookups_without_index(self, customers):
+        assert not has_search_index()
+        assert _keys(search_customers('ltd')) == ['BG-001/24', 'BG-002/24']
+
+    def test_index_is_detected(self, search_index):
+        assert has_search_index()
+
+    def test_index_finds_the_same_rows_as_the_plain_lookups(self, customers, search_index):
+        # rows created before the index was installed are picked up by the rebuild
+        expected = {query: _keys(search_customers(query)) for query in self.QUERIES}
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM main_app_customer_search WHERE main_app_customer_search MATCH 'ltd'")
+            assert cursor.fetchone()[0] == 2
+
+        drop_search_index(connection)
+        plain = {query: _keys(search_customers(query)) for query in self.QUERIES}
+        install_search_index(connection)
+
+        assert expected == plain
+
+    def test_triggers_keep_the_index_in_sync(self, search_index, make_customer):
+        customer = make_customer('BG-010/24', 'DELTA LTD')
+        assert _keys(search_customers('delta')) == ['BG-010/24']
+
+        Customer.objects.filter(pk=customer.pk).update(company_name_en='EPSILON LTD')
+        assert _keys(search_customers('delta')) == []
+        assert _keys(search_customers('epsilon')) == ['BG-010/24']
+
+        Customer.objects.filter(pk=customer.pk).delete()
+        assert _keys(search_customers('epsilon')) == []
+
+    def test_short_queries_fall_back_to_plain_lookups(self, customers, search_index):
+        # trigrams cannot answer queries shorter than three characters
+        assert _keys(search_customers('DE')) == ['DE-003/24']
+
+    def test_quotes_in_the_query_are_searched_literally(self, search_index, make_customer):
+        make_customer('BG-011/24', 'THE "QUOTED" LTD')
+        assert _keys(search_customers('"quoted"')) == ['BG-011/24']
+
+    def test_narrows_a_given_queryset(self, customers, search_index):
+        queryset = Customer.objects.filter(year=2026)
+        assert _keys(search_customers('ltd', queryset)) == ['BG-001/24']
+
+    def test_drifted_schema_skips_the_index_with_a_warning(self, db, monkeypatch):
+        from unittest.mock import patch
+
+        describe = connection.introspection.get_table_description
+        monkeypatch.setattr(
+            connection.introspection, 'get_table_description',
+            lambda cursor, table: [column for column in describe(cursor, table) if column.name != 'VAT_number'],
+        )
+        with patch.object(search_index_migration, 'logger') as mock_logger:
+            install_search_index(connection)
+
+        assert not has_search_index()
+        assert 'VAT_number' in mock_logger.warning.call_args.args
+
+
+@pytest.mark.django_db
+class TestSearchPage:
+
+    @pytest.fixture(autouse=True)
+    def many_customers(self, db, clear_cache, make_customer):
+        for i in range(7):
+            make_customer(f'PG-{i:03d}/24', f'PAGED {i} LTD')
+
+    def test_projects_only_the_table_columns(self):
+        row = search_page('paged', limit=1)['results'][0]
+        assert set(row) == {'id', 'year', 'BG_Vor_Nr', 'company_name_bg', 'company_name_en', 'company_id', 'VAT_number'}
+
+    def test_cursor_walks_all_pages_once(self):
+        keys, cursor, pages = [], None, 0
+        while True:
+            page = search_page('paged', limit=3, cursor=cursor)
+            keys += [row['BG_Vor_Nr'] for row in page['results']]
+            pages += 1
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert keys == [f'PG-{i:03d}/24' for i in range(7)]
+
+    def test_count_only_on_the_first_page(self):
+        first = search_page('paged', limit=3)
+        assert first['count'] == 7 and first['count_is_estimate'] is False
+        assert 'count' not in search_page('paged', limit=3, cursor=first['next_cursor'])
+
+    def test_count_beyond_the_limit_is_an_estimate(self, monkeypatch):
+        monkeypatch.setattr(common.customer_search, 'SEARCH_COUNT_LIMIT', 5)
+        page = search_page('paged')
+        assert page['count'] == 5
+        assert page['count_is_estimate'] is True
+
+    def test_limit_is_capped(self, monkeypatch):
+        monkeypatch.setattr(common.customer_search, 'SEARCH_MAX_PAGE_SIZE', 2)
+        assert len(search_page('paged', limit=1000)['results']) == 2
+
+
+@pytest.mark.django_db
+class TestCachedSearchPage:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clear_cache, customers):
+        pass
+
+    @staticmethod
+    def _queries(query):
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            page = cached_search_page(query)
+        return page, len(ctx.captured_queries)
+
+    def test_repeated_query_is_served_from_cache(self):
+        first, first_queries = self._queries('ltd')
+        second, second_queries = self._queries('ltd')
+
+        assert first_queries > 0
+        assert second_queries == 0
+        assert second == first
+
+    def test_edit_is_visible_immediately(self, django_capture_on_commit_callbacks, make_customer):
+        self._queries('ltd')
+        with django_capture_on_commit_callbacks(execute=True):
+            make_customer('BG-020/24', 'NEW LTD')
+
+        page, queries = self._queries('ltd')
+        assert queries > 0
+        assert page['count'] == 3
+
+    def test_delete_is_visible_immediately(self, django_capture_on_commit_callbacks):
+        self._queries('ltd')
+        with django_capture_on_commit_callbacks(execute=True):
+            Customer.objects.get(BG_Vor_Nr='BG-002/24').delete()
+
+        assert self._queries('ltd')[0]['count'] == 1
+
+    def test_import_is_visible_immediately(self, django_capture_on_commit_callbacks):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from common.db_management import DbManagement
+
+        self._queries('imported')
+        upload = SimpleUploadedFile(
+            'customers.csv',
+            'year,BG Vor.Nr.,Unternehmen-bg,Unternehmen-en,Company ID,VAT\n'
+            '2026,BG-021/24,Тест ООД,IMPORTED LTD,123456789,BG123456789\n'.encode('utf-8'),
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            DbManagement.import_from_excel(upload)
+
+        assert self._queries('imported')[0]['count'] == 1
+
+    def test_process_local_cache_searches_every_time(self, settings):
+        settings.DATA_CACHE_SHARED = False
+        self._queries('ltd')
+        assert self._queries('ltd')[1] > 0
+
+    def test_queries_are_normalized(self):
+        assert normalize_search_query('  alpha   trading ') == 'alpha trading'
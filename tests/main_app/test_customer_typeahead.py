@@ -0,0 +1,188 @@
+"""
+Tests for common.customer_typeahead – the sorted prefix index, its updates
+from Customer writes, and the typeahead endpoint.
+"""
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+import common.customer_typeahead
+from common.customer_typeahead import CustomerTypeaheadIndex, get_typeahead_index, reset_typeahead_index
+from ohmi_audit.main_app.models import Customer
+
+
+def _values(suggestions):
+    return [suggestion['value'] for suggestion in suggestions]
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    reset_typeahead_index()
+    yield
+    reset_typeahead_index()
+
+
+class TestCustomerTypeaheadIndex:
+
+    @pytest.fixture
+    def index(self):
+        index = CustomerTypeaheadIndex()
+        index.build([
+            (1, 'BG-002/24', 'BG200', 'Бета ЕООД', 'BETA LTD'),
+            (2, 'BG-001/24', 'BG100', 'Алфа ООД', 'Alpha Trading'),
+            (3, 'DE-003/24', 'DE300', '', 'Alpine GmbH'),
+        ])
+        return index
+
+    def test_prefix_matches_in_value_order(self, index):
+        assert _values(index.suggest('BG-')) == ['BG-001/24', 'BG-002/24']
+
+    def test_matching_is_case_insensitive(self, index):
+        assert _values(index.suggest('alp')) == ['Alpha Trading', 'Alpine GmbH']
+        assert _values(index.suggest('бета')) == ['Бета ЕООД']
+
+    def test_one_suggestion_per_customer(self, index):
+        # 'BG' starts the key and the VAT number of the same two customers
+        suggestions = index.suggest('bg')
+        assert [suggestion['id'] for suggestion in suggestions] == [2, 1]
+        assert suggestions[0] == {'id': 2, 'field': 'BG_Vor_Nr', 'value': 'BG-001/24', 'BG_Vor_Nr': 'BG-001/24'}
+
+    def test_limit_and_empty_prefix(self, index):
+        assert len(index.suggest('a', limit=1)) == 1
+        assert index.suggest('   ') == []
+        assert index.suggest('zzz') == []
+
+    def test_upsert_replaces_the_old_values(self, index):
+        index.upsert(1, ('BG-002/24', 'BG200', 'Бета ЕООД', 'GAMMA LTD'))
+        assert index.suggest('beta') == []
+        assert _values(index.suggest('gamma')) == ['GAMMA LTD']
+        assert len(index) == 3
+
+    def test_remove_and_remove_key(self, index):
+        index.remove(1)
+        index.remove_key('DE-003/24')
+        assert _values(index.suggest('alp')) == ['Alpha Trading']
+        assert index.suggest('beta') == []
+        assert len(index) == 1
+
+
+@pytest.mark.django_db
+class TestTypeaheadUpdates:
+
+    def test_index_is_built_from_the_database(self, make_customer):
+        make_customer('BG-001/24', 'ALPHA LTD')
+        assert _values(get_typeahead_index().suggest('alpha')) == ['ALPHA LTD']
+
+    def test_writes_of_this_process_are_applied_on_commit(self, django_capture_on_commit_callbacks, make_customer):
+        customer = make_customer('BG-001/24', 'ALPHA LTD')
+        index = get_typeahead_index()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            customer.company_name_en = 'OMEGA LTD'
+            customer.save()
+        assert index.suggest('alpha') == []
+        assert _values(index.suggest('omega')) == ['OMEGA LTD']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            customer.delete()
+        assert index.suggest('omega') == []
+
+    def test_writes_of_other_processes_are_read_after_a_version_bump(
+            self, clear_cache, monkeypatch, django_capture_on_commit_callbacks, make_customer):
+        with django_capture_on_commit_callbacks(execute=True):
+            gone = make_customer('BG-001/24', 'ALPHA LTD')
+        index = get_typeahead_index()
+
+        # another worker's writes reach this index only through the data version
+        monkeypatch.setattr(common.customer_typeahead, 'customer_saved', lambda instance: None)
+        monkeypatch.setattr(common.customer_typeahead, 'customer_deleted', lambda customer_id: None)
+        with django_capture_on_commit_callbacks(execute=True):
+            make_customer('BG-002/24', 'ALPINE LTD')
+            gone.delete()
+        assert _values(get_typeahead_index().suggest('alp')) == ['ALPHA LTD']   # not checked again yet
+
+        monkeypatch.setattr(common.customer_typeahead, 'TYPEAHEAD_REFRESH_INTERVAL', 0)
+        assert get_typeahead_index() is index
+        assert _values(index.suggest('alp')) == ['ALPINE LTD']
+
+    @pytest.fixture
+    def other_process(self, clear_cache, monkeypatch, django_capture_on_commit_callbacks, make_customer):
+        """The built index of this process; writes then only reach it through refreshes."""
+        with django_capture_on_commit_callbacks(execute=True):
+            for i in range(10):
+                make_customer(f'BG-{i:03d}/24', f'ALPHA {i} LTD')
+        index = get_typeahead_index()
+        monkeypatch.setattr(common.customer_typeahead, 'customer_saved', lambda instance: None)
+        monkeypatch.setattr(common.customer_typeahead, 'customer_deleted', lambda customer_id: None)
+        monkeypatch.setattr(common.customer_typeahead, 'TYPEAHEAD_REFRESH_INTERVAL', 0)
+        return index
+
+    def test_small_refresh_updates_rows_in_place(
+            self, other_process, monkeypatch, django_capture_on_commit_callbacks, make_customer):
+        monkeypatch.setattr(common.customer_typeahead, 'TYPEAHEAD_REBUILD_FRACTION', 0.5)
+        monkeypatch.setattr(other_process, 'build', lambda rows: pytest.fail('index rebuilt'))
+        with django_capture_on_commit_callbacks(execute=True):
+            Customer.objects.filter(BG_Vor_Nr='BG-001/24').get().delete()
+            make_customer('BG-100/24', 'OMEGA LTD')
+
+        get_typeahead_index()
+        assert _values(other_process.suggest('omega')) == ['OMEGA LTD']
+        assert 'BG-001/24' not in _values(other_process.suggest('bg-'))
+        assert len(other_process) == 10
+
+    def test_large_refresh_rebuilds_the_index(
+            self, other_process, monkeypatch, django_capture_on_commit_callbacks, make_customer):
+        monkeypatch.setattr(common.customer_typeahead, 'TYPEAHEAD_REBUILD_FRACTION', 0.2)
+        monkeypatch.setattr(other_process, 'upsert', lambda customer_id, values: pytest.fail('row upserted'))
+        with django_capture_on_commit_callbacks(execute=True):
+            for i in range(10, 13):
+                make_customer(f'BG-{i:03d}/24', f'OMEGA {i} LTD')
+
+        get_typeahead_index()
+        assert _values(other_process.suggest('omega')) == ['OMEGA 10 LTD', 'OMEGA 11 LTD', 'OMEGA 12 LTD']
+        assert len(other_process) == 13
+
+    def test_rows_committed_after_a_long_transaction_are_found(
+            self, other_process, django_capture_on_commit_callbacks, make_customer):
+        # written ten minutes before the last refresh, visible only now
+        with django_capture_on_commit_callbacks(execute=True):
+            customer = make_customer('BG-100/24', 'LATE LTD')
+            Customer.objects.filter(pk=customer.pk).update(
+                updated_at=other_process.refreshed_at - timedelta(minutes=10)
+            )
+
+        get_typeahead_index()
+        assert _values(other_process.suggest('late')) == ['LATE LTD']
+
+    def test_process_local_cache_refreshes_on_every_check(
+            self, other_process, settings, monkeypatch, django_capture_on_commit_callbacks, make_customer):
+        # a write of another process leaves this process's data version where it was
+        settings.DATA_CACHE_SHARED = False
+        monkeypatch.setattr(common.customer_typeahead, 'get_data_version', lambda name: other_process.version)
+        with django_capture_on_commit_callbacks(execute=True):
+            make_customer('BG-100/24', 'OMEGA LTD')
+
+        get_typeahead_index()
+        assert _values(other_process.suggest('omega')) == ['OMEGA LTD']
+
+
+@pytest.mark.django_db
+class TestCustomerTypeaheadView:
+
+    def test_requires_login(self, client):
+        response = client.get(reverse('customer-typeahead'), {'q': 'bg'})
+        assert response.status_code == 302
+
+    def test_returns_suggestions(self, authenticated_client, make_customer):
+        make_customer('BG-001/24', 'ALPHA LTD')
+        make_customer('BG-002/24', 'BETA LTD')
+
+        response = authenticated_client.get(reverse('customer-typeahead'), {'q': 'bg-00', 'limit': 1})
+
+        assert response.status_code == 200
+        assert _values(response.json()['suggestions']) == ['BG-001/24']
+
+    def test_invalid_limit(self, authenticated_client):
+        response = authenticated_client.get(reverse('customer-typeahead'), {'q': 'bg', 'limit': 'many'})
+        assert response.status_code == 400
@@ -6,8 +6,11 @@ Organisation:
   ├─ TestDeleteDatabase   – @pytest.mark.django_db
   ├─ TestMapHeaders       – pure unit, no DB
   ├─ TestBuildCustomerRecord – pure unit, no DB
-  └─ TestImportFromExcel  – @pytest.mark.django_db
+  ├─ TestImportFromExcel  – @pytest.mark.django_db
+  ├─ TestMultiSheetImport – @pytest.mark.django_db
+  └─ TestImportConverters – pure unit, no DB
 """
+import datetime
 import io
 import pytest
 import openpyxl
@@ -51,6 +54,19 @@ def _make_valid_xlsx(*data_rows):
     return _make_xlsx(VALID_HEADERS, *data_rows)
 
 
+def _make_csv(*rows, delimiter=',', name='customers.csv'):
+    """
+    Build an in-memory CSV upload (UTF-8 with BOM, like Excel's 'CSV UTF-8')
+    from a sequence of row tuples.
+    """
+    import csv
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    text = io.StringIO()
+    csv.writer(text, delimiter=delimiter).writerows(rows)
+    return SimpleUploadedFile(name, text.getvalue().encode('utf-8-sig'))
+
+
 def _customer_row(
     year=2026,
     bg_vor_nr='BG-001/24',
@@ -67,6 +83,13 @@ def _customer_row(
 # Fixtures
 # =============================================================================
 
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Keep the files imports store (e.g. rejected-rows reports) out of MEDIA_ROOT."""
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
 @pytest.fixture
 def superuser(db):
     return UserModel.objects.create_superuser(
@@ -158,6 +181,27 @@ class TestDeleteDatabase:
         DbManagement.delete_database()
         assert Customer.objects.count() == 0
 
+    def test_records_tombstones_with_one_insert(self, db):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from ohmi_audit.main_app.models import CustomerTombstone
+
+        for i in range(3):
+            Customer.objects.create(
+                year=2026, BG_Vor_Nr=f'BG-{i:03d}/24',
+                company_name_bg='Тест', company_name_en='Test',
+                company_id=i, VAT_number=f'BG{i}',
+            )
+        with CaptureQueriesContext(connection) as ctx:
+            DbManagement.delete_database()
+
+        tombstone_table = CustomerTombstone._meta.db_table
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith(f'INSERT INTO "{tombstone_table}"')]
+        assert len(inserts) == 1
+        assert sorted(CustomerTombstone.objects.values_list('BG_Vor_Nr', flat=True)) == [
+            'BG-000/24', 'BG-001/24', 'BG-002/24',
+        ]
+
     # ── preservation ─────────────────────────────────────────────────────────
 
     def test_preserves_superuser(self, superuser):
@@ -218,6 +262,53 @@ class TestDeleteDatabase:
         # Transaction was rolled back – the Audit row must still be there
         assert Audit.objects.filter(pk=sample_audit.pk).exists()
 
+    # ── fast wipe ────────────────────────────────────────────────────────────
+
+    def test_fast_wipe_deletes_rows_and_preserves_staff(
+            self, sample_audit, sample_auditor, sample_customer, regular_user, staff_user):
+        message = str(DbManagement.delete_database(fast=True))
+
+        assert 'Removed 1 audit(s), 1 auditor(s), 1 customer(s), 1 user(s)' in message
+        assert not Audit.objects.exists()
+        assert not Auditor.objects.exists()
+        assert not Customer.objects.exists()
+        assert UserModel.objects.filter(pk=staff_user.pk).exists()
+
+    def test_fast_wipe_records_one_tombstone_per_customer(self, sample_customer):
+        from ohmi_audit.main_app.models import CustomerTombstone
+
+        DbManagement.delete_database(fast=True)
+        assert list(CustomerTombstone.objects.values_list('BG_Vor_Nr', flat=True)) == ['BG-001/24']
+
+    def test_fast_wipe_deletes_media_after_commit(self, db, django_capture_on_commit_callbacks):
+        from concurrent.futures import wait
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+
+        image = default_storage.save('audit_images/fast.jpg', ContentFile(b'img'))
+        document = default_storage.save('audit_files/fast.pdf', ContentFile(b'pdf'))
+        Audit.objects.create(
+            name='Media Audit', date=timezone.now().date(), is_active=True, image=image, file=document,
+        )
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            DbManagement.delete_database(fast=True)
+            # nothing is removed while the transaction is open
+            assert default_storage.exists(image) and default_storage.exists(document)
+
+        wait(callbacks[0]())
+        assert not default_storage.exists(image)
+        assert not default_storage.exists(document)
+
+    def test_fast_wipe_keeps_media_on_rollback(self, sample_audit, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            with patch.object(UserModel.objects, 'filter', side_effect=RuntimeError("forced rollback")):
+                with pytest.raises(RuntimeError, match="forced rollback"):
+                    DbManagement.delete_database(fast=True)
+
+        assert callbacks == []
+        assert Audit.objects.filter(pk=sample_audit.pk).exists()
+
 
 # =============================================================================
 # _map_headers  (pure unit – no DB)
@@ -433,10 +524,16 @@ class TestImportFromExcel:
         assert 'Created: 2' in message
 
     def test_message_contains_updated_count(self, sample_customer):
-        xlsx = _make_valid_xlsx(_customer_row(bg_vor_nr='BG-001/24'))
+        xlsx = _make_valid_xlsx(_customer_row(bg_vor_nr='BG-001/24', name_en='UPDATED LTD'))
         message = str(DbManagement.import_from_excel(xlsx))
         assert 'Updated: 1' in message
 
+    def test_message_contains_unchanged_count(self, sample_customer):
+        xlsx = _make_valid_xlsx(_customer_row(bg_vor_nr='BG-001/24'))
+        message = str(DbManagement.import_from_excel(xlsx))
+        assert 'Updated: 0' in message
+        assert 'Unchanged: 1' in message
+
     def test_message_contains_skipped_blank_count(self, db):
         xlsx = _make_valid_xlsx(
             _customer_row(bg_vor_nr='BG-001/24'),
@@ -472,6 +569,298 @@ class TestImportFromExcel:
         assert Customer.objects.filter(BG_Vor_Nr='BG-001/24').exists()
         assert Customer.objects.filter(BG_Vor_Nr='BG-003/24').exists()
 
+    # ── batched upsert ───────────────────────────────────────────────────────
+
+    def test_rows_spanning_several_batches_are_all_written(self, db):
+        xlsx = _make_valid_xlsx(*(
+            _customer_row(bg_vor_nr=f'BG-{i:03d}/24', company_id=i) for i in range(5)
+        ))
+        with patch.object(DbManagement, 'IMPORT_BATCH_SIZE', 2):
+            message = str(DbManagement.import_from_excel(xlsx))
+        assert Customer.objects.count() == 5
+        assert 'Created: 5' in message
+
+    def test_query_count_does_not_grow_per_row(self, db, django_assert_max_num_queries):
+        xlsx = _make_valid_xlsx(*(
+            _customer_row(bg_vor_nr=f'BG-{i:03d}/24', company_id=i) for i in range(50)
+        ))
+        # savepoint + key lookup + bulk insert, plus the outer transaction
+        with django_assert_max_num_queries(10):
+            DbManagement.import_from_excel(xlsx)
+        assert Customer.objects.count() == 50
+
+    def test_mixed_batch_counts_created_and_updated(self, sample_customer):
+        xlsx = _make_valid_xlsx(
+            _customer_row(bg_vor_nr='BG-001/24', name_en='UPDATED LTD'),
+            _customer_row(bg_vor_nr='BG-002/24'),
+        )
+        message = str(DbManagement.import_from_excel(xlsx))
+        assert 'Created: 1' in message
+        assert 'Updated: 1' in message
+        assert Customer.objects.get(BG_Vor_Nr='BG-001/24').company_name_en == 'UPDATED LTD'
+
+    def test_bulk_update_bumps_updated_at(self, sample_customer):
+        before = sample_customer.updated_at
+        xlsx = _make_valid_xlsx(_customer_row(bg_vor_nr='BG-001/24', name_en='UPDATED LTD'))
+        DbManagement.import_from_excel(xlsx)
+        assert Customer.objects.get(BG_Vor_Nr='BG-001/24').updated_at > before
+
+    def test_duplicate_key_in_file_counts_as_update(self, db):
+        """Same semantics as consecutive update_or_create calls: create, then update."""
+        xlsx = _make_valid_xlsx(
+            _customer_row(bg_vor_nr='BG-001/24', name_en='FIRST'),
+            _customer_row(bg_vor_nr='BG-001/24', name_en='SECOND'),
+        )
+        message = str(DbManagement.import_from_excel(xlsx))
+        assert 'Created: 1' in message
+        assert 'Updated: 1' in message
+        assert Customer.objects.get(BG_Vor_Nr='BG-001/24').company_name_en == 'SECOND'
+
+    # ── skip unchanged rows ──────────────────────────────────────────────────
+
+    def test_unchanged_row_is_not_written(self, sample_customer):
+        before = sample_customer.updated_at
+        DbManagement.import_from_excel(_make_valid_xlsx(_customer_row()))
+        assert Customer.objects.get(pk=sample_customer.pk).updated_at == before
+
+    def test_noop_reimport_issues_no_writes(self, sample_customer):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        xlsx = _make_valid_xlsx(_customer_row())
+        # savepoints around the batch + one SELECT for the existing keys, no INSERT / UPDATE
+        with CaptureQueriesContext(connection) as ctx:
+            DbManagement.import_from_excel(xlsx)
+        sql = ' '.join(q['sql'] for q in ctx.captured_queries).upper()
+        assert 'UPDATE' not in sql
+        assert 'INSERT' not in sql
+
+    def test_duplicate_of_unchanged_row_counts_as_unchanged(self, sample_customer):
+        message = str(DbManagement.import_from_excel(_make_valid_xlsx(_customer_row(), _customer_row())))
+        assert 'Updated: 0' in message
+        assert 'Unchanged: 2' in message
+
+    def test_row_by_row_fallback_skips_unchanged_rows(self, sample_customer):
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+        DbManagement._write_rows('customers', [(2, DbManagement._build_customer_record(
+            _customer_row(), DbManagement._map_headers(VALID_HEADERS),
+        ))], counts)
+        assert counts['unchanged'] == 1
+        assert counts['updated'] == 0
+
+    def test_record_digest_is_stable_and_value_sensitive(self):
+        values = [2026, 'Тест ООД', 'TEST LTD', 123456789, 'BG123456789']
+        assert DbManagement._record_digest(values) == DbManagement._record_digest(list(values))
+        assert DbManagement._record_digest(values) != DbManagement._record_digest([2025, *values[1:]])
+
+    def test_bulk_created_customer_gets_slug(self, db):
+        xlsx = _make_valid_xlsx(_customer_row())
+        DbManagement.import_from_excel(xlsx)
+        assert Customer.objects.get(BG_Vor_Nr='BG-001/24').slug
+
+    def test_failed_bulk_write_falls_back_to_row_by_row(self, db):
+        xlsx = _make_valid_xlsx(
+            _customer_row(bg_vor_nr='BG-001/24'),
+            _customer_row(bg_vor_nr='BG-002/24'),
+        )
+        with patch.object(Customer.objects, 'bulk_create', side_effect=RuntimeError("bulk failed")):
+            message = str(DbManagement.import_from_excel(xlsx))
+        assert Customer.objects.count() == 2
+        assert 'Created: 2' in message
+        assert 'Errors: 0' in message
+
+    # ── streaming pipeline ───────────────────────────────────────────────────
+
+    def test_rows_are_written_before_the_sheet_is_fully_read(self, db):
+        """The first batch must be written while later rows are still unread."""
+        yielded = []
+
+        def lazy_rows(*args, **kwargs):
+            yield VALID_HEADERS
+            for i in range(6):
+                yielded.append(i)
+                yield _customer_row(bg_vor_nr=f'BG-{i:03d}/24', company_id=i)
+
+        fake_ws = MagicMock()
+        fake_ws.iter_rows.side_effect = lazy_rows
+        fake_ws.max_row = None
+        rows_read_at_first_write = []
+        original_write = DbManagement._write_batch
+
+        def spy_write(sheet_key, batch, counts, on_error=None):
+            rows_read_at_first_write.append(len(yielded))
+            original_write(sheet_key, batch, counts, on_error)
+
+        with patch.object(DbManagement, '_load_worksheet', return_value=fake_ws), \
+             patch.object(DbManagement, 'IMPORT_BATCH_SIZE', 2), \
+             patch.object(DbManagement, '_write_batch', side_effect=spy_write):
+            DbManagement.import_from_excel(io.BytesIO(b'PK\x03\x04'))   # sniffed as .xlsx
+
+        assert rows_read_at_first_write[0] == 2
+        assert Customer.objects.count() == 6
+
+    def test_reports_peak_memory(self, db):
+        counts = DbManagement._import_workbook(_make_valid_xlsx(_customer_row()))
+        assert counts['peak_memory'] > 0
+
+    def test_peak_memory_tracking_can_be_disabled(self, db):
+        with patch.object(DbManagement, 'IMPORT_TRACK_MEMORY', False):
+            counts = DbManagement._import_workbook(_make_valid_xlsx(_customer_row()))
+        assert counts['peak_memory'] is None
+
+    def test_header_only_file_imports_nothing(self, db):
+        message = str(DbManagement.import_from_excel(_make_xlsx(VALID_HEADERS)))
+        assert 'Created: 0' in message
+        assert Customer.objects.count() == 0
+
+    # ── parallel parse-and-validate ──────────────────────────────────────────
+
+    def test_parallel_import_writes_all_rows(self, db, settings):
+        settings.DB_IMPORT_WORKERS = 2
+        xlsx = _make_valid_xlsx(*(
+            _customer_row(bg_vor_nr=f'BG-{i:03d}/24', company_id=i) for i in range(7)
+        ))
+        with patch.object(DbManagement, 'IMPORT_BATCH_SIZE', 2):
+            message = str(DbManagement.import_from_excel(xlsx))
+        assert Customer.objects.count() == 7
+        assert 'Created: 7' in message
+
+    def test_parallel_import_reports_accurate_row_numbers(self, db, settings):
+        settings.DB_IMPORT_WORKERS = 2
+        xlsx = _make_valid_xlsx(
+            _customer_row(bg_vor_nr='BG-001/24'),
+            _customer_row(bg_vor_nr='BG-002/24'),
+            (None, None, None, None, None, None),               # row 4 – blank
+            ('bad_year', None, None, None, None, None),         # row 5 – error
+            _customer_row(bg_vor_nr='BG-006/24'),
+        )
+        with patch.object(DbManagement, 'IMPORT_BATCH_SIZE', 2), \
+             patch('common.db_management.logger') as mock_logger:
+            message = str(DbManagement.import_from_excel(xlsx))
+
+        assert 'Created: 3' in message
+        assert 'Skipped (blank): 1' in message
+        assert 'Errors: 1' in message
+        skipped_rows = [c.args[2] for c in mock_logger.warning.call_args_list if 'skipped' in c.args[0]]
+        assert skipped_rows == [5]
+
+    def test_single_worker_setting_parses_in_process(self, settings):
+        settings.DB_IMPORT_WORKERS = 1
+        assert DbManagement._import_workers() == 0
+
+    def test_daemonic_process_parses_in_process(self, settings):
+        settings.DB_IMPORT_WORKERS = 4
+        with patch('multiprocessing.current_process') as mock_current:
+            mock_current.return_value.daemon = True
+            assert DbManagement._import_workers() == 0
+
+    # ── csv / tsv uploads ────────────────────────────────────────────────────
+
+    def test_imports_csv_upload(self, db):
+        upload = _make_csv(VALID_HEADERS, _customer_row(), _customer_row(bg_vor_nr='BG-002/24'))
+        message = str(DbManagement.import_from_excel(upload))
+        assert 'Created: 2' in message
+        c = Customer.objects.get(BG_Vor_Nr='BG-001/24')
+        assert c.company_name_bg == 'Тест ООД'   # BOM stripped, Cyrillic decoded
+        assert c.company_id == 123456789
+
+    def test_imports_tsv_upload(self, db):
+        upload = _make_csv(VALID_HEADERS, _customer_row(), delimiter='\t', name='customers.tsv')
+        DbManagement.import_from_excel(upload)
+        assert Customer.objects.filter(BG_Vor_Nr='BG-001/24').exists()
+
+    def test_sniffs_semicolon_delimiter(self, db):
+        upload = _make_csv(VALID_HEADERS, _customer_row(), delimiter=';')
+        DbManagement.import_from_excel(upload)
+        assert Customer.objects.filter(BG_Vor_Nr='BG-001/24').exists()
+
+    def test_csv_blank_and_bad_rows_are_counted(self, db):
+        upload = _make_csv(VALID_HEADERS, _customer_row(), (), ('not_int', '', '', '', '', ''))
+        message = str(DbManagement.import_from_excel(upload))
+        assert 'Created: 1' in message
+        assert 'Skipped (blank): 1' in message
+        assert 'Errors: 1' in message
+
+    def test_empty_csv_raises_value_error(self, db):
+        with pytest.raises(ValueError, match="empty"):
+            DbManagement.import_from_excel(_make_csv())
+
+    def test_csv_without_name_is_sniffed(self, db):
+        upload = io.BytesIO(_make_csv(VALID_HEADERS, _customer_row()).read())
+        DbManagement.import_from_excel(upload)
+        assert Customer.objects.filter(BG_Vor_Nr='BG-001/24').exists()
+
+    # ── rejected-rows report ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _read_report(name):
+        import csv
+        with DbManagement.private_storage().open(name, 'rb') as report:
+            return list(csv.reader(io.StringIO(report.read().decode('utf-8-sig'))))
+
+    def test_no_report_without_errors(self, db, private_media_root):
+        counts = DbManagement._import_workbook(_make_valid_xlsx(_customer_row()))
+        assert counts['error_report'] is None
+        assert not (private_media_root / DbManagement.IMPORT_REPORT_DIR).exists()
+
+    def test_report_is_not_stored_under_media_root(self, db, media_root, private_media_root):
+        counts = DbManagement._import_workbook(_make_valid_xlsx(_customer_row(year='not_int')))
+        assert (private_media_root / counts['error_report']).exists()
+        assert not (media_root / DbManagement.IMPORT_REPORT_DIR).exists()
+
+    def test_old_reports_expire_when_a_new_one_is_stored(self, db, private_media_root):
+        import os
+        import time
+
+        old = DbManagement._import_workbook(_make_valid_xlsx(_customer_row(year='not_int')))['error_report']
+        stale = time.time() - DbManagement.IMPORT_REPORT_MAX_AGE - 60
+        os.utime(private_media_root / old, (stale, stale))
+
+        new = DbManagement._import_workbook(_make_valid_xlsx(_customer_row(year='not_int')))['error_report']
+
+        assert not (private_media_root / old).exists()
+        assert (private_media_root / new).exists()
+
+    def test_report_lists_rejected_rows_with_original_values(self, db):
+        upload = _make_valid_xlsx(_customer_row(), _customer_row(bg_vor_nr='BG-002/24', year='not_int'))
+        counts = DbManagement._import_workbook(upload)
+        header, *rows = self._read_report(counts['error_report'])
+        assert header == [*VALID_HEADERS, 'Row', 'Error']
+        assert len(rows) == 1
+        assert rows[0][:2] == ['not_int', 'BG-002/24']
+        assert rows[0][6] == '3'
+        assert rows[0][7]   # the reason
+
+    def test_report_is_valid_import_input(self, db):
+        upload = _make_valid_xlsx(_customer_row(year='not_int'))
+        name = DbManagement._import_workbook(upload)['error_report']
+        header, row = self._read_report(name)
+        row[0] = '2026'   # fix the value in place and re-import the report
+        DbManagement.import_from_excel(_make_csv(header, row))
+        assert Customer.objects.filter(BG_Vor_Nr='BG-001/24').exists()
+
+    def test_message_links_the_report(self, db):
+        message = str(DbManagement.import_from_excel(_make_valid_xlsx(_customer_row(year='not_int'))))
+        assert 'Rejected rows report: ' + DbManagement.private_file_url(DbManagement.IMPORT_REPORT_DIR) in message
+        assert message.endswith('.csv')
+
+    def test_parallel_import_reports_original_values(self, db, settings):
+        settings.DB_IMPORT_WORKERS = 2
+        upload = _make_valid_xlsx(_customer_row(), _customer_row(bg_vor_nr='BG-002/24', company_id='x'))
+        _header, row = self._read_report(DbManagement._import_workbook(upload)['error_report'])
+        assert row[1] == 'BG-002/24'
+        assert row[6] == '3'
+
+    def test_rows_rejected_by_the_database_are_reported(self, db):
+        from unittest.mock import patch
+        from ohmi_audit.main_app.models import Customer as CustomerModel
+
+        with patch.object(CustomerModel.objects, 'bulk_create', side_effect=Exception('boom')), \
+                patch.object(CustomerModel.objects, 'update_or_create', side_effect=Exception('db says no')):
+            counts = DbManagement._import_workbook(_make_valid_xlsx(_customer_row()))
+        _header, row = self._read_report(counts['error_report'])
+        assert row[6:] == ['2', 'db says no']
+
     # ── end-to-end with real file ─────────────────────────────────────────────
 
     @pytest.mark.integration
@@ -489,6 +878,270 @@ class TestImportFromExcel:
         assert 'Created: 3' in message
 
 
+# =============================================================================
+# multi-sheet import: Customers, Auditors, Audits  (needs DB)
+# =============================================================================
+
+AUDITOR_HEADERS = ('First name', 'Last name', 'Email', 'Phone')
+AUDIT_HEADERS = ('Name', 'Date', 'Description', 'Category', 'Is active')
+
+
+def _make_workbook(**sheets):
+    """
+    Build an in-memory .xlsx with one named worksheet per keyword argument,
+    e.g. _make_workbook(Customers=[VALID_HEADERS, _customer_row()]).
+    """
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(list(row))
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+@pytest.mark.django_db
+class TestMultiSheetImport:
+
+    @staticmethod
+    def _office_workbook(**overrides):
+        sheets = {
+            'Customers': [VALID_HEADERS, _customer_row()],
+            'Auditors': [AUDITOR_HEADERS, ('Ivan', 'Petrov', 'ivan@example.com', '+359888000001')],
+            'Audits': [AUDIT_HEADERS, ('ISO 9001 – Sofia', '2026-03-15', 'Annual', 'Compliance', 'yes')],
+        }
+        return _make_workbook(**{**sheets, **overrides})
+
+    # ── every sheet is imported ──────────────────────────────────────────────
+
+    def test_imports_every_known_sheet(self, db):
+        DbManagement.import_from_excel(self._office_workbook())
+        assert Customer.objects.filter(BG_Vor_Nr='BG-001/24').exists()
+        assert Auditor.objects.get(email='ivan@example.com').phone == '+359888000001'
+        audit = Audit.objects.get(name='ISO 9001 – Sofia')
+        assert audit.date == datetime.date(2026, 3, 15)
+        assert audit.category == 'compliance'
+        assert audit.is_active is True
+
+    def test_sheet_titles_are_matched_case_insensitively(self, db):
+        DbManagement.import_from_excel(_make_workbook(
+            **{' auditors ': [AUDITOR_HEADERS, ('Ivan', 'Petrov', 'ivan@example.com', '1')]},
+        ))
+        assert Auditor.objects.count() == 1
+        assert Customer.objects.count() == 0
+
+    def test_unknown_sheets_are_ignored(self, db):
+        DbManagement.import_from_excel(self._office_workbook(Notes=[('anything',)]))
+        assert Customer.objects.count() == 1
+
+    def test_workbook_without_known_sheets_imports_active_sheet_as_customers(self, db):
+        DbManagement.import_from_excel(_make_workbook(Sheet1=[VALID_HEADERS, _customer_row()]))
+        assert Customer.objects.count() == 1
+
+    def test_empty_sheet_is_skipped(self, db):
+        DbManagement.import_from_excel(self._office_workbook(**{'Audits': []}))
+        assert Audit.objects.count() == 0
+        assert Customer.objects.count() == 1
+
+    # ── upserts keyed per sheet ──────────────────────────────────────────────
+
+    def test_reimport_updates_auditor_by_email(self, sample_auditor):
+        DbManagement.import_from_excel(_make_workbook(
+            Auditors=[AUDITOR_HEADERS, ('John', 'Smith', 'john@example.com', '+1234567890')],
+        ))
+        assert Auditor.objects.count() == 1
+        assert Auditor.objects.get(email='john@example.com').last_name == 'Smith'
+
+    def test_missing_optional_column_keeps_stored_value(self, sample_audit):
+        sample_audit.description = 'keep me'
+        sample_audit.save()
+        DbManagement.import_from_excel(_make_workbook(
+            Audits=[('Name', 'Date'), ('Test Audit', '01.02.2026')],
+        ))
+        sample_audit.refresh_from_db()
+        assert sample_audit.date == datetime.date(2026, 2, 1)
+        assert sample_audit.description == 'keep me'
+
+    def test_blank_optional_cell_gets_default(self, db):
+        DbManagement.import_from_excel(_make_workbook(
+            Audits=[AUDIT_HEADERS, ('New Audit', '2026-01-01', None, None, None)],
+        ))
+        audit = Audit.objects.get(name='New Audit')
+        assert (audit.description, audit.category, audit.is_active) == ('', 'other', True)
+
+    def test_unchanged_rows_are_not_rewritten_on_any_sheet(self, db):
+        DbManagement.import_from_excel(self._office_workbook())
+        message = str(DbManagement.import_from_excel(self._office_workbook()))
+        assert 'Unchanged: 3' in message
+
+    # ── transactions / errors ────────────────────────────────────────────────
+
+    def test_each_sheet_is_written_in_its_own_transaction(self, db):
+        from unittest.mock import patch
+
+        def fail_on_audits(sheet_key, batch, counts, on_error=None):
+            if sheet_key == 'audits':
+                raise RuntimeError('boom')
+            original_write(sheet_key, batch, counts, on_error)
+
+        original_write = DbManagement._write_batch
+        with patch.object(DbManagement, '_write_batch', side_effect=fail_on_audits), pytest.raises(RuntimeError):
+            DbManagement.import_from_excel(self._office_workbook())
+        assert Customer.objects.count() == 1   # earlier sheets stay committed
+        assert Auditor.objects.count() == 1
+        assert Audit.objects.count() == 0
+
+    def test_invalid_category_is_rejected(self, db):
+        message = str(DbManagement.import_from_excel(_make_workbook(
+            Audits=[AUDIT_HEADERS, ('Bad', '2026-01-01', '', 'astrology', 'yes')],
+        )))
+        assert 'Errors: 1' in message
+        assert Audit.objects.count() == 0
+
+    def test_message_breaks_down_counts_per_sheet(self, db):
+        message = str(DbManagement.import_from_excel(self._office_workbook()))
+        assert 'Created: 3' in message
+        assert 'Customers – Created: 1' in message
+        assert 'Auditors – Created: 1' in message
+        assert 'Audits – Created: 1' in message
+
+    def test_counts_are_reported_per_sheet(self, db):
+        counts = DbManagement._import_workbook(self._office_workbook())
+        assert list(counts['sheets']) == ['customers', 'auditors', 'audits']
+        assert counts['sheets']['auditors']['created'] == 1
+
+    def test_error_report_has_a_section_per_sheet(self, db):
+        import csv
+
+        upload = _make_workbook(
+            Customers=[VALID_HEADERS, _customer_row(year='bad')],
+            Audits=[AUDIT_HEADERS, ('Bad', 'not a date', '', '', '')],
+        )
+        name = DbManagement._import_workbook(upload)['error_report']
+        with DbManagement.private_storage().open(name, 'rb') as report:
+            rows = list(csv.reader(io.StringIO(report.read().decode('utf-8-sig'))))
+        assert rows[0][-2:] == ['Row', 'Error']
+        assert rows[1][-2] == 'Customers!2'
+        assert rows[2] == []
+        assert rows[3][:2] == ['Name', 'Date']
+        assert rows[4][-2] == 'Audits!2'
+
+    def test_preview_covers_every_sheet(self, sample_auditor):
+        preview = DbManagement.preview_import(_make_workbook(
+            Auditors=[AUDITOR_HEADERS, ('John', 'Smith', 'john@example.com', '+1234567890')],
+            Audits=[AUDIT_HEADERS, ('New', '2026-01-01', '', '', '')],
+        ))
+        assert preview['created_samples'] == ['New']
+        assert preview['updated_samples'] == [
+            {'sheet': 'Auditors', 'key': 'john@example.com', 'changes': {'last_name': ('Doe', 'Smith')}},
+        ]
+
+
+# =============================================================================
+# import cell converters  (pure unit – no DB)
+# =============================================================================
+
+class TestImportConverters:
+
+    @pytest.mark.parametrize('value', ['2026-03-15', '2026-03-15 00:00:00', '15.03.2026', '15/03/2026'])
+    def test_to_date_formats(self, value):
+        from common.db_management import _to_date
+        assert _to_date(value) == datetime.date(2026, 3, 15)
+
+    def test_to_date_rejects_garbage(self):
+        from common.db_management import _to_date
+        with pytest.raises(ValueError):
+            _to_date('soon')
+
+    @pytest.mark.parametrize('value, expected', [('yes', True), ('True', True), ('x', True), ('0', False), ('No', False)])
+    def test_to_bool(self, value, expected):
+        from common.db_management import _to_bool
+        assert _to_bool(value) is expected
+
+    def test_to_audit_category_accepts_value_or_label(self):
+        from common.db_management import _to_audit_category
+        assert _to_audit_category('health_and_safety') == 'health_and_safety'
+        assert _to_audit_category('Information Security') == 'information_security'
+
+
+# =============================================================================
+# preview_import  (dry run – needs DB)
+# =============================================================================
+
+@pytest.mark.django_db
+class TestPreviewImport:
+
+    # ── nothing is written ───────────────────────────────────────────────────
+
+    def test_does_not_create_customers(self, db):
+        DbManagement.preview_import(_make_valid_xlsx(_customer_row()))
+        assert Customer.objects.count() == 0
+
+    def test_does_not_modify_existing_customer(self, sample_customer):
+        DbManagement.preview_import(_make_valid_xlsx(_customer_row(name_en='NEW NAME')))
+        sample_customer.refresh_from_db()
+        assert sample_customer.company_name_en == 'TEST LTD'
+
+    # ── diff ─────────────────────────────────────────────────────────────────
+
+    def test_counts_new_changed_and_unchanged_rows(self, sample_customer):
+        Customer.objects.create(
+            year=2025, BG_Vor_Nr='BG-002/24', company_name_bg='Б', company_name_en='B',
+            company_id=2, VAT_number='BG2',
+        )
+        upload = _make_valid_xlsx(
+            _customer_row(),                                           # identical
+            _customer_row(bg_vor_nr='BG-002/24', year=2026, name_bg='Б', name_en='B',
+                          company_id=2, vat='BG2'),                    # year changed
+            _customer_row(bg_vor_nr='BG-003/24'),                      # new
+        )
+        preview = DbManagement.preview_import(upload)
+        assert (preview['created'], preview['updated'], preview['unchanged']) == (1, 1, 1)
+        assert preview['created_samples'] == ['BG-003/24']
+
+    def test_updated_sample_lists_old_and_new_values(self, sample_customer):
+        preview = DbManagement.preview_import(_make_valid_xlsx(_customer_row(name_en='NEW NAME')))
+        assert preview['updated_samples'] == [
+            {'sheet': 'Customers', 'key': 'BG-001/24', 'changes': {'company_name_en': ('TEST LTD', 'NEW NAME')}},
+        ]
+
+    def test_duplicate_key_in_file_counts_as_update(self, db):
+        preview = DbManagement.preview_import(_make_valid_xlsx(_customer_row(), _customer_row()))
+        assert (preview['created'], preview['updated']) == (1, 1)
+
+    def test_blank_and_bad_rows_are_reported(self, db):
+        upload = _make_valid_xlsx(_customer_row(), (None,) * 6, ('not_int', '', '', '', '', ''))
+        preview = DbManagement.preview_import(upload)
+        assert preview['skipped'] == 1
+        assert preview['errors'] == 1
+        assert preview['error_samples'][0][0] == 4
+
+    def test_samples_are_capped(self, db, monkeypatch):
+        monkeypatch.setattr(DbManagement, 'PREVIEW_SAMPLE_SIZE', 2)
+        upload = _make_valid_xlsx(*(_customer_row(bg_vor_nr=f'BG-{i:03d}/24') for i in range(5)))
+        preview = DbManagement.preview_import(upload)
+        assert preview['created'] == 5
+        assert len(preview['created_samples']) == 2
+
+    def test_existing_rows_are_fetched_per_lookup_chunk(self, db, monkeypatch, django_assert_num_queries):
+        monkeypatch.setattr(DbManagement, 'PREVIEW_LOOKUP_SIZE', 10)
+        upload = _make_valid_xlsx(*(_customer_row(bg_vor_nr=f'BG-{i:03d}/24') for i in range(25)))
+        with django_assert_num_queries(3):
+            DbManagement.preview_import(upload)
+
+    def test_message_mentions_dry_run(self, db):
+        message = str(DbManagement.preview_import(_make_valid_xlsx(_customer_row()))['message'])
+        assert 'Dry run' in message
+        assert 'Would create: 1' in message
+
+    def test_empty_file_raises_value_error(self, db):
+        with pytest.raises(ValueError, match="empty"):
+            DbManagement.preview_import(_make_xlsx())
+
+
 # =============================================================================
 # export_to_excel  (integration – needs DB)
 # =============================================================================
@@ -589,6 +1242,317 @@ class TestExportToExcel:
         assert isinstance(data_row[4].value, int)   # company_id
 
 
+# =============================================================================
+# stream_export_to_excel  (integration – needs DB)
+# =============================================================================
+
+@pytest.mark.django_db
+class TestStreamExportToExcel:
+
+    @staticmethod
+    def _workbook(response, **kwargs):
+        return openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), **kwargs)
+
+    @staticmethod
+    def _create_customers(count):
+        Customer.objects.bulk_create([
+            Customer(
+                year=2026, BG_Vor_Nr=f'EX-{i:03d}/24', company_name_bg='Тест',
+                company_name_en='Test', company_id=i, VAT_number=f'BG{i}', slug=f'c-{i}',
+            )
+            for i in range(count)
+        ])
+
+    # ── response structure ────────────────────────────────────────────────────
+
+    def test_returns_streaming_file_response(self, db):
+        from django.http import FileResponse
+        response = DbManagement.stream_export_to_excel()
+        assert isinstance(response, FileResponse)
+        assert response.streaming
+
+    def test_content_type_and_attachment(self, db):
+        response = DbManagement.stream_export_to_excel()
+        assert response['Content-Type'] == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        assert 'attachment' in response['Content-Disposition']
+        assert 'customers_' in response['Content-Disposition']
+
+    # ── workbook content ──────────────────────────────────────────────────────
+
+    def test_header_row_matches_import_template_and_is_bold(self, db):
+        wb = self._workbook(DbManagement.stream_export_to_excel())
+        header = list(wb['Customers'].iter_rows(max_row=1))[0]
+        assert [cell.value for cell in header] == DbManagement.EXPORT_HEADERS
+        assert all(cell.font.bold for cell in header)
+
+    def test_rows_match_db_in_id_order(self, sample_customer):
+        self._create_customers(3)
+        rows = list(self._workbook(DbManagement.stream_export_to_excel(), read_only=True).active.iter_rows(values_only=True))
+        assert len(rows) == 5
+        assert rows[1] == (2026, 'BG-001/24', 'Тест ООД', 'TEST LTD', 123456789, 'BG123456789')
+        assert rows[2][1] == 'EX-000/24'
+
+    def test_rows_beyond_the_width_sample_are_exported(self, db, monkeypatch):
+        monkeypatch.setattr(DbManagement, 'EXPORT_WIDTH_SAMPLE_SIZE', 2)
+        monkeypatch.setattr(DbManagement, 'EXPORT_CHUNK_SIZE', 2)
+        self._create_customers(5)
+        rows = list(self._workbook(DbManagement.stream_export_to_excel(), read_only=True).active.iter_rows(values_only=True))
+        assert [row[1] for row in rows[1:]] == [f'EX-{i:03d}/24' for i in range(5)]
+
+    def test_column_widths_are_estimated_from_the_sample(self, sample_customer):
+        sample_customer.company_name_en = 'A' * 40
+        sample_customer.save()
+        ws = self._workbook(DbManagement.stream_export_to_excel())['Customers']
+        assert ws.column_dimensions['D'].width == 42
+        assert ws.column_dimensions['A'].width == 14
+
+    def test_export_round_trips_through_import(self, sample_customer):
+        exported = b''.join(DbManagement.stream_export_to_excel().streaming_content)
+        Customer.objects.all().delete()
+        DbManagement.import_from_excel(io.BytesIO(exported))
+        assert Customer.objects.get(BG_Vor_Nr='BG-001/24').company_id == 123456789
+
+
+# =============================================================================
+# stream_export – CSV / NDJSON  (integration – needs DB)
+# =============================================================================
+
+@pytest.mark.django_db
+class TestStreamExport:
+
+    def test_csv_export_round_trips_through_import(self, sample_customer):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        exported = b''.join(DbManagement.stream_export('csv').streaming_content)
+        Customer.objects.all().delete()
+        DbManagement.import_from_excel(SimpleUploadedFile('customers.csv', exported))
+        assert Customer.objects.get(BG_Vor_Nr='BG-001/24').company_id == 123456789
+
+    def test_rows_are_grouped_into_buffered_chunks(self, db, monkeypatch):
+        monkeypatch.setattr(DbManagement, 'EXPORT_STREAM_BUFFER_SIZE', 1)
+        for i in range(3):
+            Customer.objects.create(
+                year=2026, BG_Vor_Nr=f'EX-{i:03d}/24', company_name_bg='Б', company_name_en='B',
+                company_id=i, VAT_number=f'BG{i}',
+            )
+        chunks = list(DbManagement.stream_export('ndjson').streaming_content)
+        assert len(chunks) == 3   # one line per chunk once a line fills the buffer
+
+    def test_gzip_stream_decompresses_to_the_plain_stream(self, sample_customer):
+        import gzip
+
+        plain = b''.join(DbManagement.stream_export('csv').streaming_content)
+        compressed = b''.join(DbManagement.stream_export('csv', gzip=True).streaming_content)
+        assert gzip.decompress(compressed) == plain
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(ValueError):
+            DbManagement.stream_export('xml')
+
+    def test_search_query_limits_the_export_to_matching_rows(self, sample_customer):
+        import json
+
+        Customer.objects.create(
+            year=2026, BG_Vor_Nr='EX-002/24', company_name_bg='Б', company_name_en='OTHER LTD',
+            company_id=2, VAT_number='BG2',
+        )
+        body = b''.join(DbManagement.stream_export('ndjson', search_query='other').streaming_content)
+        assert [json.loads(line)['BG_Vor_Nr'] for line in body.splitlines()] == ['EX-002/24']
+
+    # ── delta export (since) ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _delta(since, export_format='ndjson'):
+        import json
+
+        response = DbManagement.stream_export(export_format, since=since)
+        body = b''.join(response.streaming_content).decode('utf-8')
+        if export_format == 'ndjson':
+            return response, [json.loads(line) for line in body.splitlines()]
+        return response, body.splitlines()
+
+    def test_delta_contains_only_rows_changed_since(self, sample_customer):
+        from django.utils import timezone
+
+        since = timezone.now()
+        Customer.objects.create(
+            year=2026, BG_Vor_Nr='EX-002/24', company_name_bg='Б', company_name_en='B',
+            company_id=2, VAT_number='BG2',
+        )
+        _response, records = self._delta(since)
+        assert [(r['BG_Vor_Nr'], r['deleted']) for r in records] == [('EX-002/24', False)]
+
+    def test_delta_reports_deletions_as_tombstones(self, sample_customer):
+        from django.utils import timezone
+
+        since = timezone.now()
+        sample_customer.delete()
+        _response, records = self._delta(since)
+        assert records == [{'BG_Vor_Nr': 'BG-001/24', 'deleted': True}]
+
+    def test_recreated_key_is_not_reported_deleted(self, sample_customer):
+        from django.utils import timezone
+
+        since = timezone.now()
+        sample_customer.delete()
+        Customer.objects.create(
+            year=2026, BG_Vor_Nr='BG-001/24', company_name_bg='Б', company_name_en='B',
+            company_id=2, VAT_number='BG2',
+        )
+        _response, records = self._delta(since)
+        assert [(r['BG_Vor_Nr'], r['deleted']) for r in records] == [('BG-001/24', False)]
+
+    def test_csv_delta_has_deleted_column(self, sample_customer):
+        from django.utils import timezone
+
+        since = timezone.now()
+        sample_customer.delete()
+        _response, lines = self._delta(since, 'csv')
+        assert lines == [
+            'year,BG Vor.Nr.,Unternehmen-bg,Unternehmen-en,Company ID,VAT,deleted',
+            ',BG-001/24,,,,,True',
+        ]
+
+    def test_cursor_token_continues_where_the_last_export_stopped(self, sample_customer, settings):
+        settings.WRITE_TRANSACTION_MAX_SECONDS = 0
+        response, _records = self._delta(DbManagement.parse_export_since('2000-01-01T00:00:00'))
+        since = DbManagement.parse_export_since(response['X-Export-Cursor'])
+
+        _response, records = self._delta(since)
+        assert records == []
+
+        sample_customer.company_name_en = 'RENAMED'
+        sample_customer.save()
+        _response, records = self._delta(since)
+        assert [r['company_name_en'] for r in records] == ['RENAMED']
+
+    def test_cursor_lags_behind_open_write_transactions(self, sample_customer, settings):
+        import datetime as dt
+
+        settings.WRITE_TRANSACTION_MAX_SECONDS = 600
+        response, _records = self._delta(DbManagement.parse_export_since('2000-01-01T00:00:00'))
+        since = DbManagement.parse_export_since(response['X-Export-Cursor'])
+        assert timezone.now() - since >= dt.timedelta(seconds=600)
+
+        # an import batch stamped 5 minutes before that export, committed only after it
+        Customer.objects.bulk_create([Customer(
+            year=2026, BG_Vor_Nr='EX-LATE/24', company_name_bg='Б', company_name_en='LATE',
+            company_id=2, VAT_number='BG2', slug='late', updated_at=timezone.now() - dt.timedelta(minutes=5),
+        )])
+        _response, records = self._delta(since)
+        assert 'EX-LATE/24' in [r['BG_Vor_Nr'] for r in records]
+
+    def test_queryset_update_is_in_the_delta(self, sample_customer):
+        since = timezone.now()
+        Customer.objects.filter(pk=sample_customer.pk).update(company_name_en='UPDATED')
+        _response, records = self._delta(since)
+        assert [r['company_name_en'] for r in records] == ['UPDATED']
+
+    def test_long_sheet_transaction_is_logged(self, db, settings):
+        settings.WRITE_TRANSACTION_MAX_SECONDS = -1
+        with patch('common.db_management.logger') as mock_logger:
+            DbManagement.import_from_excel(_make_valid_xlsx(_customer_row()))
+        assert 'WRITE_TRANSACTION_MAX_SECONDS' in mock_logger.warning.call_args.args[0]
+
+    def test_invalid_since_raises(self):
+        with pytest.raises(ValueError):
+            DbManagement.parse_export_since('yesterday')
+
+
+# =============================================================================
+# export_version / export_to_storage  (integration – needs DB)
+# =============================================================================
+
+@pytest.mark.django_db
+class TestExportToStorage:
+
+    @pytest.fixture
+    def sample_customer(self, db, django_capture_on_commit_callbacks):
+        # committed, so the later writes of a test register their own data version bump
+        with django_capture_on_commit_callbacks(execute=True):
+            return Customer.objects.create(
+                year=2026, BG_Vor_Nr='BG-001/24', company_name_bg='Тест ООД', company_name_en='TEST LTD',
+                company_id=123456789, VAT_number='BG123456789',
+            )
+
+    # ── table version ─────────────────────────────────────────────────────────
+
+    def test_version_is_stable_without_changes(self, sample_customer):
+        assert DbManagement.export_version() == DbManagement.export_version()
+
+    def test_version_changes_on_create_update_and_delete(self, sample_customer, django_capture_on_commit_callbacks):
+        versions = {DbManagement.export_version()}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            other = Customer.objects.create(
+                year=2026, BG_Vor_Nr='BG-002/24', company_name_bg='Б', company_name_en='B',
+                company_id=2, VAT_number='BG2',
+            )
+        versions.add(DbManagement.export_version())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sample_customer.company_name_en = 'RENAMED'
+            sample_customer.save()
+        versions.add(DbManagement.export_version())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            other.delete()
+        versions.add(DbManagement.export_version())
+
+        assert len(versions) == 4
+
+    def test_version_changes_on_update_only_import_and_queryset_update(
+            self, sample_customer, django_capture_on_commit_callbacks):
+        # neither the row count, the highest id nor (for update()) updated_at move here
+        before = DbManagement.export_version()
+        with django_capture_on_commit_callbacks(execute=True):
+            DbManagement.import_from_excel(_make_valid_xlsx(_customer_row(name_en='RENAMED')))
+        after_import = DbManagement.export_version()
+        assert after_import != before
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Customer.objects.filter(pk=sample_customer.pk).update(company_name_en='UPDATED')
+        assert DbManagement.export_version() != after_import
+
+    # ── cached artifact ───────────────────────────────────────────────────────
+
+    def test_writes_a_valid_workbook_to_storage(self, sample_customer, media_root):
+        name, created = DbManagement.export_to_storage()
+        assert created
+        assert not (media_root / DbManagement.EXPORT_DIR).exists()   # not public
+        with DbManagement.private_storage().open(name, 'rb') as stored:
+            rows = list(openpyxl.load_workbook(stored, read_only=True).active.iter_rows(values_only=True))
+        assert rows[1][1] == 'BG-001/24'
+
+    def test_unchanged_table_reuses_the_artifact_without_reading_rows(self, sample_customer,
+                                                                      django_assert_num_queries):
+        first, _created = DbManagement.export_to_storage()
+        with django_assert_num_queries(0):   # the data version lives in the cache
+            second, created = DbManagement.export_to_storage()
+        assert second == first
+        assert not created
+
+    def test_new_version_replaces_the_old_artifact(self, sample_customer, django_capture_on_commit_callbacks):
+        storage = DbManagement.private_storage()
+        old, _created = DbManagement.export_to_storage()
+        with django_capture_on_commit_callbacks(execute=True):
+            sample_customer.company_name_en = 'RENAMED'
+            sample_customer.save()
+        new, created = DbManagement.export_to_storage()
+        assert created
+        assert new != old
+        assert storage.exists(new)
+        assert not storage.exists(old)
+
+    def test_process_local_cache_writes_every_export(self, sample_customer, settings):
+        # other processes' writes would not move this process's data version
+        settings.DATA_CACHE_SHARED = False
+        first, _created = DbManagement.export_to_storage()
+        second, created = DbManagement.export_to_storage()
+        assert created
+        assert second != first
+
+
 # =============================================================================
 # export → delete → import  round-trip
 # =============================================================================
@@ -713,12 +1677,61 @@ class TestExportImportRoundTrip:
     # ── idempotency ───────────────────────────────────────────────────────────
 
     def test_double_import_updates_not_duplicates(self, sample_customer):
-        """Importing the same exported file twice must update rows, never duplicate them."""
+        """Importing the same exported file twice must never duplicate rows – nor rewrite them."""
         exported = self._export_bytes()
         DbManagement.delete_database()
         DbManagement.import_from_excel(io.BytesIO(exported))       # first import → create
-        msg = str(DbManagement.import_from_excel(io.BytesIO(exported)))  # second → update
+        msg = str(DbManagement.import_from_excel(io.BytesIO(exported)))  # second → no-op
         assert Customer.objects.count() == 1
-        assert 'Updated: 1' in msg
+        assert 'Unchanged: 1' in msg
 
 
+
+
+# =============================================================================
+# _iter_batches  (pure unit – no DB)
+# =============================================================================
+
+class TestIterBatches:
+
+    def test_groups_items_into_batches(self):
+        assert list(DbManagement._iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_empty_input_yields_nothing(self):
+        assert list(DbManagement._iter_batches([], 3)) == []
+
+    def test_consumes_input_lazily(self):
+        consumed = []
+
+        def source():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+
+        batches = DbManagement._iter_batches(source(), 3)
+        next(batches)
+        assert consumed == [0, 1, 2]
+
+
+# =============================================================================
+# _build_records_chunk  (pure unit – no DB)
+# =============================================================================
+
+class TestBuildRecordsChunk:
+
+    def test_splits_records_errors_and_blanks(self):
+        from common.db_management import _build_records_chunk
+
+        header_map = DbManagement._map_headers(VALID_HEADERS)
+        chunk = [
+            (2, _customer_row()),
+            (3, (None, None, None, None, None, None)),
+            (4, ('bad_year', None, None, None, None, None)),
+        ]
+        records, errors, blank_count = _build_records_chunk(chunk, header_map)
+
+        assert [row_num for row_num, _record in records] == [2]
+        assert records[0][1]['BG_Vor_Nr'] == 'BG-001/24'
+        assert [row_num for row_num, _row, _message in errors] == [4]
+        assert errors[0][1][0] == 'bad_year'   # original values travel back for the report
+        assert blank_count == 1
@@ -1,8 +1,9 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 
-from ohmi_audit.main_app.forms import AuditForm, SignUpForm, LoginForm
+from ohmi_audit.main_app.forms import AuditForm, SignUpForm, LoginForm, ImportDatabaseForm
 from ohmi_audit.main_app.models import Audit
 
 
@@ -65,3 +66,15 @@ class TestLoginForm:
     def test_login_form_has_custom_label(self):
         form = LoginForm()
         assert form.fields['username'].label == 'Username or Email'
+
+
+class TestImportDatabaseForm:
+    @pytest.mark.parametrize('file_name', ['customers.xlsx', 'customers.csv', 'customers.tsv'])
+    def test_accepts_supported_formats(self, file_name):
+        form = ImportDatabaseForm(files={'select_file': SimpleUploadedFile(file_name, b'data')})
+        assert form.is_valid(), form.errors
+
+    def test_rejects_other_formats(self):
+        form = ImportDatabaseForm(files={'select_file': SimpleUploadedFile('customers.pdf', b'data')})
+        assert not form.is_valid()
+        assert 'select_file' in form.errors
@@ -0,0 +1,169 @@
+"""
+Tests for MediaManagement.sweep_orphaned_media and the sweep_media command.
+"""
+import io
+import os
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from common.media_management import MediaManagement
+from ohmi_audit.main_app.models import Audit
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = tmp_path
+    monkeypatch.setattr(MediaManagement, 'SWEEP_MIN_AGE', 0)
+    return tmp_path
+
+
+def _media_file(media_root, name, age=3600 * 24):
+    path = media_root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'x')
+    old = timezone.now().timestamp() - age
+    os.utime(path, (old, old))
+    return name
+
+
+def _audit(name, **files):
+    return Audit.objects.create(name=name, date=timezone.now().date(), is_active=True, **files)
+
+
+@pytest.mark.django_db
+class TestSweepOrphanedMedia:
+
+    def test_report_only_lists_orphans_without_deleting(self, media_root):
+        kept = _media_file(media_root, 'audit_files/8266.docx')
+        orphan = _media_file(media_root, 'audit_files/8266_gfrO6cX.docx')
+        _audit('A', file=kept)
+
+        reported = []
+        counts = MediaManagement.sweep_orphaned_media(report=reported.extend)
+
+        assert reported == [orphan]
+        assert counts['orphans'] == 1 and counts['deleted'] == 0
+        assert (media_root / orphan).exists()
+
+    def test_delete_removes_orphans_only(self, media_root):
+        image = _media_file(media_root, 'audit_images/a.jpg')
+        orphan_image = _media_file(media_root, 'audit_images/a_alia5fd.jpg')
+        orphan_file = _media_file(media_root, 'audit_files/nested/old.pdf')
+        _audit('A', image=image)
+
+        counts = MediaManagement.sweep_orphaned_media(delete=True)
+
+        assert counts['deleted'] == 2
+        assert (media_root / image).exists()
+        assert not (media_root / orphan_image).exists()
+        assert not (media_root / orphan_file).exists()
+
+    def test_files_outside_the_upload_dirs_are_ignored(self, media_root):
+        _media_file(media_root, 'customer_exports/customers_abc.xlsx')
+        counts = MediaManagement.sweep_orphaned_media(delete=True)
+        assert counts['files'] == 0
+        assert (media_root / 'customer_exports/customers_abc.xlsx').exists()
+
+    def test_young_files_are_left_alone(self, media_root, monkeypatch):
+        monkeypatch.setattr(MediaManagement, 'SWEEP_MIN_AGE', 3600)
+        young = _media_file(media_root, 'audit_files/upload_in_progress.pdf', age=0)
+
+        counts = MediaManagement.sweep_orphaned_media(delete=True)
+
+        assert counts['orphans'] == 0
+        assert (media_root / young).exists()
+
+    def test_orphans_are_handled_in_batches(self, media_root, monkeypatch):
+        monkeypatch.setattr(MediaManagement, 'SWEEP_BATCH_SIZE', 2)
+        for i in range(5):
+            _media_file(media_root, f'audit_files/orphan_{i}.pdf')
+
+        batches = []
+        MediaManagement.sweep_orphaned_media(report=batches.append)
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    # ── incremental runs ─────────────────────────────────────────────────────
+
+    def test_incremental_run_skips_unchanged_directories(self, media_root):
+        kept = _media_file(media_root, 'audit_files/kept.pdf')
+        _media_file(media_root, 'audit_images/kept.jpg')
+        _audit('A', file=kept, image='audit_images/kept.jpg')
+        MediaManagement.sweep_orphaned_media(delete=True)
+
+        counts = MediaManagement.sweep_orphaned_media(delete=True, incremental=True)
+
+        assert counts['scanned_dirs'] == 0
+        assert counts['files'] == 0
+
+    def test_incremental_run_finds_orphans_in_changed_directories(self, media_root):
+        MediaManagement.sweep_orphaned_media(delete=True)
+        orphan = _media_file(media_root, 'audit_files/new_orphan.pdf')
+        os.utime(media_root / 'audit_files')   # the new entry moved the directory mtime
+
+        counts = MediaManagement.sweep_orphaned_media(delete=True, incremental=True)
+
+        assert counts['deleted'] == 1
+        assert not (media_root / orphan).exists()
+
+    def test_incremental_run_finds_files_of_deleted_audits(self, media_root):
+        name = _media_file(media_root, 'audit_files/report.pdf')
+        audit = _audit('A', file=name)
+        MediaManagement.sweep_orphaned_media(delete=True)
+
+        Audit.objects.filter(pk=audit.pk).delete()
+        counts = MediaManagement.sweep_orphaned_media(delete=True, incremental=True)
+
+        assert counts['scanned_dirs'] == 0
+        assert counts['deleted'] == 1
+        assert not (media_root / name).exists()
+
+    def test_report_only_run_does_not_hide_orphans_from_the_next_run(self, media_root):
+        MediaManagement.sweep_orphaned_media(delete=True)
+        orphan = _media_file(media_root, 'audit_files/orphan.pdf')
+        os.utime(media_root / 'audit_files')
+
+        reported = []
+        MediaManagement.sweep_orphaned_media(report=reported.extend, incremental=True)
+        counts = MediaManagement.sweep_orphaned_media(delete=True, incremental=True)
+
+        assert reported == [orphan]
+        assert counts['deleted'] == 1
+        assert not (media_root / orphan).exists()
+
+    def test_failed_delete_is_retried_by_the_next_run(self, media_root, monkeypatch):
+        from django.core.files.storage import FileSystemStorage
+
+        orphan = _media_file(media_root, 'audit_files/locked.pdf')
+        original_delete = FileSystemStorage.delete
+
+        def failing_delete(storage, name):
+            raise PermissionError(name)
+
+        monkeypatch.setattr(FileSystemStorage, 'delete', failing_delete)
+        assert MediaManagement.sweep_orphaned_media(delete=True, incremental=True)['deleted'] == 0
+
+        monkeypatch.setattr(FileSystemStorage, 'delete', original_delete)
+        counts = MediaManagement.sweep_orphaned_media(delete=True, incremental=True)
+        assert counts['deleted'] == 1
+        assert not (media_root / orphan).exists()
+
+
+@pytest.mark.django_db
+class TestSweepMediaCommand:
+
+    def test_lists_orphans_and_summary(self, media_root):
+        orphan = _media_file(media_root, 'audit_files/orphan.pdf')
+        out = io.StringIO()
+
+        call_command('sweep_media', stdout=out)
+
+        assert orphan in out.getvalue()
+        assert 'orphans: 1, deleted: 0' in out.getvalue()
+        assert (media_root / orphan).exists()
+
+    def test_delete_flag_deletes(self, media_root):
+        orphan = _media_file(media_root, 'audit_files/orphan.pdf')
+        call_command('sweep_media', '--delete', stdout=io.StringIO())
+        assert not (media_root / orphan).exists()
@@ -0,0 +1,169 @@
+"""
+Tests for common.pagination_decorator – keyset (cursor) pagination.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.pagination_decorator import cursor_page
+from ohmi_audit.main_app.models import Customer
+
+
+def _keys(page):
+    return [customer.BG_Vor_Nr for customer in page]
+
+
+@pytest.fixture
+def customers(db, django_capture_on_commit_callbacks):
+    # committed, so the later writes of a test register their own data version bump
+    with django_capture_on_commit_callbacks(execute=True):
+        return [
+            Customer.objects.create(
+                year=2020 + i % 3, BG_Vor_Nr=f'PG-{i:03d}/24', company_name_bg='Тест ООД',
+                company_name_en=f'PAGED {i} LTD', company_id=123456789, VAT_number='BG123456789',
+            )
+            for i in range(7)
+        ]
+
+
+@pytest.mark.django_db
+class TestCursorPage:
+
+    def _walk(self, ordering, per_page=3):
+        keys, page = [], cursor_page(Customer.objects.all(), ordering, per_page)
+        keys += _keys(page)
+        while page.has_next():
+            page = cursor_page(Customer.objects.all(), ordering, per_page, after=page.next_cursor())
+            keys += _keys(page)
+        return keys, page
+
+    def test_next_cursors_walk_every_row_once(self, customers):
+        keys, last = self._walk(('id',))
+        assert keys == [f'PG-{i:03d}/24' for i in range(7)]
+        assert last.has_previous() and not last.has_next()
+
+    def test_previous_cursor_returns_to_the_previous_page(self, customers):
+        first = cursor_page(Customer.objects.all(), ('id',), 3)
+        second = cursor_page(Customer.objects.all(), ('id',), 3, after=first.next_cursor())
+        back = cursor_page(Customer.objects.all(), ('id',), 3, before=second.previous_cursor())
+
+        assert not first.has_previous() and first.previous_cursor() is None
+        assert _keys(back) == _keys(first)
+        assert not back.has_previous() and back.has_next()
+
+    def test_non_unique_descending_ordering_is_made_unique_by_id(self, customers):
+        # several customers share a year; the id keeps their order stable across pages
+        keys, _last = self._walk(('-year',), per_page=2)
+        expected = [c.BG_Vor_Nr for c in sorted(customers, key=lambda c: (-c.year, c.id))]
+        assert keys == expected
+
+    def test_invalid_cursor_shows_the_first_page(self, customers):
+        page = cursor_page(Customer.objects.all(), ('id',), 3, after='not a cursor')
+        assert _keys(page) == ['PG-000/24', 'PG-001/24', 'PG-002/24']
+        assert not page.has_previous()
+
+    def test_no_count_query(self, customers):
+        first = cursor_page(Customer.objects.all(), ('id',), 3)
+        with CaptureQueriesContext(connection) as ctx:
+            list(cursor_page(Customer.objects.all(), ('id',), 3, after=first.next_cursor()))
+        assert len(ctx.captured_queries) == 1
+        assert 'COUNT' not in ctx.captured_queries[0]['sql'].upper()
+
+
+@pytest.mark.django_db
+class TestIndexViewCursorPagination:
+
+    def test_index_links_the_next_page_by_cursor(
+            self, clear_cache, authenticated_client, customers, django_capture_on_commit_callbacks):
+        response = authenticated_client.get(reverse('index'))
+        page = response.context['page_obj']
+
+        assert page.is_cursor_page and len(page) == 7   # fewer customers than a page
+        assert '?after=' not in response.content.decode()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for i in range(7, 12):
+                Customer.objects.create(
+                    year=2026, BG_Vor_Nr=f'PG-{i:03d}/24', company_name_bg='Тест ООД',
+                    company_name_en='PAGED LTD', company_id=123456789, VAT_number='BG123456789',
+                )
+        page = authenticated_client.get(reverse('index')).context['page_obj']
+        response = authenticated_client.get(reverse('index'), {'after': page.next_cursor()})
+
+        assert _keys(response.context['page_obj']) == ['PG-010/24', 'PG-011/24']
+        assert '?before=' in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestPageDataCache:
+
+    @staticmethod
+    def _customer_queries(client, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse('index'), params)
+        return response, [q for q in ctx.captured_queries if 'main_app_customer' in q['sql']]
+
+    @pytest.fixture
+    def other_client(self, clear_cache, db):
+        from django.contrib.auth import get_user_model
+        from django.test import Client
+
+        get_user_model().objects.create_user(username='other', email='o@example.com', password='pass12345')
+        client = Client()
+        client.login(username='other', password='pass12345')
+        return client
+
+    def test_page_rows_are_shared_between_users(self, other_client, authenticated_client, customers):
+        _response, queries = self._customer_queries(authenticated_client)
+        assert queries
+
+        response, queries = self._customer_queries(other_client)
+        assert queries == []
+        assert len(response.context['page_obj']) == 7
+
+    def test_committed_write_reaches_every_user(
+            self, other_client, authenticated_client, customers, django_capture_on_commit_callbacks):
+        self._customer_queries(authenticated_client)
+        with django_capture_on_commit_callbacks(execute=True):
+            Customer.objects.filter(BG_Vor_Nr='PG-000/24').get().delete()
+
+        response, queries = self._customer_queries(other_client)
+        assert queries
+        assert 'PG-000/24' not in _keys(response.context['page_obj'])
+
+    def test_process_local_cache_reads_every_page(self, other_client, authenticated_client, customers, settings):
+        settings.DATA_CACHE_SHARED = False
+        self._customer_queries(authenticated_client)
+        _response, queries = self._customer_queries(other_client)
+        assert queries
+
+    def test_pages_are_cached_separately(self, clear_cache, authenticated_client, customers):
+        for i in range(7, 12):
+            Customer.objects.create(
+                year=2026, BG_Vor_Nr=f'PG-{i:03d}/24', company_name_bg='Тест ООД',
+                company_name_en='PAGED LTD', company_id=123456789, VAT_number='BG123456789',
+            )
+        first = authenticated_client.get(reverse('index')).context['page_obj']
+        second = authenticated_client.get(reverse('index'), {'after': first.next_cursor()}).context['page_obj']
+        assert _keys(first) != _keys(second)
+        assert _keys(authenticated_client.get(reverse('index')).context['page_obj']) == _keys(first)
+
+    def test_page_number_mode_caches_the_rows(self, clear_cache, customers, rf):
+        from common.pagination_decorator import paginate_results
+
+        class View:
+            request = rf.get('/', {'page': 2})
+
+            @paginate_results(model=Customer, items_per_page=3, cache_timeout=60)
+            def get_context_data(self):
+                return {}
+
+        View().get_context_data()
+        with CaptureQueriesContext(connection) as ctx:
+            page = View().get_context_data()['page_obj']
+            rows = _keys(page)
+
+        assert len(ctx.captured_queries) == 0   # rows and count both cached
+        assert rows == ['PG-003/24', 'PG-004/24', 'PG-005/24']
+        assert page.number == 2 and page.has_next() and page.paginator.num_pages == 3
@@ -0,0 +1,95 @@
+"""
+Tests for common.row_counts – cached and estimated row counts.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import common.row_counts
+from common.row_counts import CachedCountPaginator, estimated_row_count, row_count
+from ohmi_audit.main_app.models import Customer
+
+
+def _counted(queryset, **kwargs):
+    with CaptureQueriesContext(connection) as ctx:
+        result = row_count(queryset, **kwargs)
+    return result, len(ctx.captured_queries)
+
+
+@pytest.fixture
+def customers(db, clear_cache, django_capture_on_commit_callbacks, make_customer):
+    # committed, so the later writes of a test register their own data version bump
+    with django_capture_on_commit_callbacks(execute=True):
+        return [make_customer(f'RC-{i:03d}/24', year=2020 + i % 2) for i in range(5)]
+
+
+@pytest.mark.django_db
+class TestRowCount:
+
+    def test_exact_count_is_cached(self, customers):
+        assert _counted(Customer.objects.all()) == ((5, False), 1)
+        assert _counted(Customer.objects.all()) == ((5, False), 0)
+
+    def test_process_local_cache_counts_every_time(self, customers, settings):
+        settings.DATA_CACHE_SHARED = False
+        assert _counted(Customer.objects.all()) == ((5, False), 1)
+        assert _counted(Customer.objects.all()) == ((5, False), 1)
+
+    def test_filters_are_counted_separately(self, customers):
+        assert row_count(Customer.objects.filter(year=2020))[0] == 3
+        assert row_count(Customer.objects.filter(year=2021))[0] == 2
+
+    def test_committed_write_is_counted_again(self, customers, django_capture_on_commit_callbacks, make_customer):
+        row_count(Customer.objects.all())
+        with django_capture_on_commit_callbacks(execute=True):
+            make_customer('RC-100/24')
+        assert _counted(Customer.objects.all()) == ((6, False), 1)
+
+    def test_limit_reports_an_estimate_beyond_it(self, customers):
+        assert row_count(Customer.objects.all(), limit=3) == (3, True)
+        assert row_count(Customer.objects.all(), limit=10) == (5, False)
+
+    def test_empty_queryset(self, customers):
+        assert _counted(Customer.objects.none()) == ((0, False), 0)
+
+    def test_large_unfiltered_tables_use_the_planner_estimate(self, customers, settings, monkeypatch):
+        settings.ROW_COUNT_ESTIMATE_THRESHOLD = 1000
+        monkeypatch.setattr(common.row_counts, 'estimated_row_count', lambda model, using: 125000)
+
+        assert _counted(Customer.objects.all()) == ((125000, True), 0)
+        # filtered querysets are never estimated from the table size
+        assert row_count(Customer.objects.filter(year=2020)) == (3, False)
+
+    def test_small_tables_are_counted_exactly(self, customers, settings, monkeypatch):
+        settings.ROW_COUNT_ESTIMATE_THRESHOLD = 1000
+        monkeypatch.setattr(common.row_counts, 'estimated_row_count', lambda model, using: 5)
+        assert row_count(Customer.objects.all()) == (5, False)
+
+    def test_no_estimate_outside_postgresql(self, customers):
+        if connection.vendor == 'postgresql':
+            pytest.skip("reads pg_class on PostgreSQL")
+        assert estimated_row_count(Customer) is None
+
+
+@pytest.mark.django_db
+class TestCachedCountPaginator:
+
+    def test_page_views_share_one_count(self, customers):
+        paginator = CachedCountPaginator(Customer.objects.order_by('id'), 2)
+        assert paginator.num_pages == 3
+
+        with CaptureQueriesContext(connection) as ctx:
+            page = CachedCountPaginator(Customer.objects.order_by('id'), 2).get_page(2)
+            list(page)
+        assert len(ctx.captured_queries) == 1   # the page rows only
+        assert page.paginator.count_is_estimate is False
+
+    def test_lists_are_counted_by_length(self):
+        assert CachedCountPaginator([1, 2, 3], 2).count == 3
+
+    def test_admin_changelist(self, customers, admin_client):
+        response = admin_client.get(reverse('admin:main_app_customer_changelist'))
+        assert response.status_code == 200
+        assert isinstance(response.context['cl'].paginator, CachedCountPaginator)
+        assert response.context['cl'].result_count == 5
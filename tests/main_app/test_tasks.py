@@ -15,3 +15,204 @@ class TestCeleryTasks:
         result = long_running_task.delay(duration=1)
         assert result.successful()
         assert 'Completed' in result.get()
+
+    def test_imports_are_routed_to_the_import_queue(self, settings):
+        from ohmi_audit.celery import app
+        from ohmi_audit.main_app.tasks import export_customers_task, import_customers_task, preview_import_task
+
+        def queue(task):
+            return app.amqp.router.route({}, task.name, (), {})['queue'].name
+
+        assert queue(import_customers_task) == queue(preview_import_task) == settings.CELERY_IMPORT_QUEUE
+        assert queue(export_customers_task) == app.conf.task_default_queue
+
+
+def _spooled_customer_file(bg_vor_nrs):
+    """Spool an .xlsx with one customer row per BG_Vor_Nr, like DbIndexView does."""
+    import io
+    import openpyxl
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from common.db_management import DbManagement
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['year', 'BG Vor.Nr.', 'Unternehmen-bg', 'Unternehmen-en', 'Company ID', 'VAT'])
+    for i, bg_vor_nr in enumerate(bg_vor_nrs):
+        ws.append([2026, bg_vor_nr, 'Тест', 'Test', i, f'BG{i}'])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return DbManagement.spool_import_file(SimpleUploadedFile('customers.xlsx', buf.getvalue()))
+
+
+@pytest.mark.django_db
+class TestImportCustomersTask:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.CELERY_TASK_EAGER_PROPAGATES = True
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_imports_spooled_file(self):
+        from ohmi_audit.main_app.models import Customer
+        from ohmi_audit.main_app.tasks import import_customers_task
+
+        file_name = _spooled_customer_file(['BG-001/24', 'BG-002/24'])
+        result = import_customers_task.delay(file_name).get()
+
+        assert Customer.objects.count() == 2
+        assert result['created'] == 2
+        assert 'Created: 2' in result['message']
+
+    def test_result_links_rejected_rows_report(self):
+        from ohmi_audit.main_app.tasks import import_customers_task
+
+        file_name = _spooled_customer_file(['BG-001/24', ''])   # missing BG Vor.Nr. → rejected
+        result = import_customers_task.delay(file_name).get()
+        assert result['errors'] == 1
+        assert '/db/files/import_reports/' in result['error_report_url']
+        assert result['error_report_url'] in result['message']
+
+    def test_removes_spooled_file(self):
+        from common.db_management import DbManagement
+        from ohmi_audit.main_app.tasks import import_customers_task
+
+        file_name = _spooled_customer_file(['BG-001/24'])
+        import_customers_task.delay(file_name)
+        assert not DbManagement.private_storage().exists(file_name)
+
+    def test_reports_progress_per_batch(self, clear_cache):
+        from unittest.mock import patch
+        from common.db_management import DbManagement
+        from ohmi_audit.main_app.tasks import cached_task_progress, import_customers_task
+
+        file_name = _spooled_customer_file([f'BG-{i:03d}/24' for i in range(5)])
+        published = []
+        original_write = DbManagement._write_batch
+
+        def spy_write(*args):
+            original_write(*args)
+            published.append(cached_task_progress('import-1'))
+
+        with patch.object(DbManagement, 'IMPORT_BATCH_SIZE', 2), \
+             patch.object(DbManagement, '_write_batch', side_effect=spy_write), \
+             patch.object(import_customers_task, 'update_state') as mock_update_state:
+            import_customers_task.apply_async(args=[file_name], task_id='import-1')
+
+        # batches of 2 + 2 + 1, each visible through the cache right after it was written
+        assert [meta['current'] for meta in published[1:]] == [2, 4]
+        assert cached_task_progress('import-1')['current'] == 5
+
+        # the result backend is written only after the sheet committed
+        assert mock_update_state.call_count == 1
+        last_meta = mock_update_state.call_args.kwargs['meta']
+        assert last_meta['current'] == 5
+        assert last_meta['total'] == 5
+        assert last_meta['created'] == 5
+        assert last_meta['errors'] == 0
+
+    def test_task_status_serves_the_cached_progress(self, clear_cache, client):
+        from django.core.cache import cache
+        from django.urls import reverse
+        from ohmi_audit.main_app.tasks import TASK_PROGRESS_KEY
+
+        # the import's PROGRESS state is not stored yet while its sheet transaction is open
+        cache.set(TASK_PROGRESS_KEY.format(task_id='import-2'), {'current': 4, 'total': 10, 'errors': 1})
+
+        response = client.get(reverse('celery-example-task-status', args=['import-2']))
+
+        data = response.json()
+        assert data['status'] == 'PROGRESS' and not data['ready']
+        assert (data['progress'], data['total'], data['details']) == (4, 10, {'errors': 1})
+
+    def test_task_status_leaves_out_the_preview_samples(self, client):
+        from unittest.mock import patch
+        from django.urls import reverse
+
+        preview = {
+            'message': 'Dry run', 'created': 1, 'updated': 1, 'preview_url': '/db/?preview=preview-2',
+            'created_samples': ['BG-001/24'],
+            'updated_samples': [{'sheet': 'Customers', 'key': 'BG-002/24', 'changes': {'VAT_number': ('BG1', 'BG2')}}],
+            'error_samples': [],
+        }
+        with patch('ohmi_audit.main_app.views.task_views.AsyncResult') as mock_result:
+            mock_result.return_value.configure_mock(status='SUCCESS', result=preview, info=preview)
+            mock_result.return_value.ready.return_value = True
+            mock_result.return_value.failed.return_value = False
+            data = client.get(reverse('celery-example-task-status', args=['preview-2'])).json()
+
+        assert data['result'] == {
+            'message': 'Dry run', 'created': 1, 'updated': 1, 'preview_url': '/db/?preview=preview-2',
+        }
+
+
+@pytest.mark.django_db
+class TestPreviewImportTask:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.CELERY_TASK_EAGER_PROPAGATES = True
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_previews_spooled_file_without_writing(self):
+        from common.db_management import DbManagement
+        from ohmi_audit.main_app.models import Customer
+        from ohmi_audit.main_app.tasks import preview_import_task
+
+        file_name = _spooled_customer_file(['BG-001/24', 'BG-002/24'])
+        result = preview_import_task.apply_async(args=[file_name], task_id='preview-1').get()
+
+        assert result['created'] == 2
+        assert result['created_samples'] == ['BG-001/24', 'BG-002/24']
+        assert result['preview_url'].endswith('/db/?preview=preview-1')
+        assert isinstance(result['message'], str)
+        assert not Customer.objects.exists()
+        assert not DbManagement.private_storage().exists(file_name)
+
+
+@pytest.mark.django_db
+class TestExportCustomersTask:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.CELERY_TASK_EAGER_PROPAGATES = True
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_returns_download_url_of_stored_workbook(self):
+        from django.urls import reverse
+        from ohmi_audit.main_app.tasks import export_customers_task
+
+        result = export_customers_task.delay().get()
+
+        assert result['download_url'].startswith(reverse('db_private_file', args=['customer_exports/']))
+        assert result['cached'] is False
+
+    def test_second_export_of_unchanged_data_is_cached(self):
+        from ohmi_audit.main_app.tasks import export_customers_task
+
+        first = export_customers_task.delay().get()
+        second = export_customers_task.delay().get()
+
+        assert second['cached'] is True
+        assert second['download_url'] == first['download_url']
+
+
+@pytest.mark.django_db
+class TestSweepMediaTask:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.CELERY_TASK_EAGER_PROPAGATES = True
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_deletes_orphans_and_returns_counts(self, tmp_path, monkeypatch):
+        from common.media_management import MediaManagement
+        from ohmi_audit.main_app.tasks import sweep_media_task
+
+        monkeypatch.setattr(MediaManagement, 'SWEEP_MIN_AGE', 0)
+        (tmp_path / 'audit_files').mkdir()
+        (tmp_path / 'audit_files' / 'orphan.pdf').write_bytes(b'x')
+
+        result = sweep_media_task.delay().get()
+
+        assert result['deleted'] == 1
+        assert not (tmp_path / 'audit_files' / 'orphan.pdf').exists()
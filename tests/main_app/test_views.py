@@ -28,6 +28,50 @@ class TestIndexView:
         resp = client.get(reverse('index'))
         assert resp.status_code == 200
 
+    def test_json_search_returns_matching_customers(self, client, clear_cache):
+        from ohmi_audit.main_app.models import Customer
+
+        for key, name in (('SR-001/24', 'ALPHA LTD'), ('SR-002/24', 'BETA LTD')):
+            Customer.objects.create(
+                year=2026, BG_Vor_Nr=key, company_name_bg='Б', company_name_en=name,
+                company_id=1, VAT_number='BG1',
+            )
+        User.objects.create_user(username='u', email='u@example.com', password='p', first_name='U')
+        client.login(username='u', password='p')
+        resp = client.post(reverse('index'), {'search_query': 'alpha'}, content_type='application/json')
+
+        assert resp.json()['count'] == 1
+        assert resp.json()['results'][0]['BG_Vor_Nr'] == 'SR-001/24'
+        assert 'slug' not in resp.json()['results'][0]
+
+    def test_json_search_pages_with_limit_and_cursor(self, client, clear_cache):
+        from ohmi_audit.main_app.models import Customer
+
+        for i in range(3):
+            Customer.objects.create(
+                year=2026, BG_Vor_Nr=f'SR-{i:03d}/24', company_name_bg='Б', company_name_en='PAGED LTD',
+                company_id=1, VAT_number='BG1',
+            )
+        User.objects.create_user(username='u', email='u@example.com', password='p', first_name='U')
+        client.login(username='u', password='p')
+
+        first = client.post(reverse('index'), {'search_query': 'paged', 'limit': 2}, content_type='application/json')
+        second = client.post(
+            reverse('index'), {'search_query': 'paged', 'limit': 2, 'cursor': first.json()['next_cursor']},
+            content_type='application/json',
+        )
+
+        assert [row['BG_Vor_Nr'] for row in first.json()['results']] == ['SR-000/24', 'SR-001/24']
+        assert first.json()['count'] == 3
+        assert [row['BG_Vor_Nr'] for row in second.json()['results']] == ['SR-002/24']
+        assert second.json()['next_cursor'] is None
+
+    def test_json_search_rejects_invalid_cursor(self, client):
+        User.objects.create_user(username='u', email='u@example.com', password='p', first_name='U')
+        client.login(username='u', password='p')
+        resp = client.post(reverse('index'), {'search_query': 'x', 'cursor': 'abc'}, content_type='application/json')
+        assert resp.status_code == 400
+
 
 @pytest.mark.django_db
 class TestLoginViewRateLimit:
@@ -61,3 +105,213 @@ class TestLoginViewRateLimit:
         # redirect to index on success
         assert resp.status_code == 302
         assert resp.url == reverse('index')
+
+
+@pytest.mark.django_db
+class TestDbIndexViewImport:
+    @pytest.fixture(autouse=True)
+    def setup(self, client, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        User.objects.create_user(username='u', email='u@example.com', password='p', first_name='U')
+        client.login(username='u', password='p')
+        self.client = client
+
+    def test_import_is_dispatched_to_celery(self):
+        from unittest.mock import patch, MagicMock
+        from django.core.files.storage import default_storage
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from common.db_management import DbManagement
+
+        upload = SimpleUploadedFile('customers.xlsx', b'not parsed in the request')
+        with patch('ohmi_audit.main_app.views.db_management_views.import_customers_task') as mock_task:
+            mock_task.delay.return_value = MagicMock(id='task-123')
+            resp = self.client.post(reverse('db_index'), {'import_db': '', 'select_file': upload})
+
+        assert resp.status_code == 200
+        assert resp.context['task_id'] == 'task-123'
+        file_name = mock_task.delay.call_args.args[0]
+        assert DbManagement.private_storage().exists(file_name)
+        assert not default_storage.exists(file_name)   # not under MEDIA_ROOT / MEDIA_URL
+
+    def test_dry_run_is_dispatched_to_celery(self):
+        from unittest.mock import patch, MagicMock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from common.db_management import DbManagement
+
+        upload = SimpleUploadedFile('customers.csv', b'not parsed in the request')
+        with patch('ohmi_audit.main_app.views.db_management_views.import_customers_task') as mock_import, \
+             patch('ohmi_audit.main_app.views.db_management_views.preview_import_task') as mock_preview:
+            mock_preview.delay.return_value = MagicMock(id='preview-123')
+            resp = self.client.post(
+                reverse('db_index'), {'import_db': '', 'select_file': upload, 'dry_run': 'on'},
+            )
+
+        assert resp.status_code == 200
+        assert not mock_import.delay.called
+        assert resp.context['task_id'] == 'preview-123'
+        assert DbManagement.private_storage().exists(mock_preview.delay.call_args.args[0])
+
+    def test_finished_preview_is_rendered(self):
+        from unittest.mock import patch
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from common.db_management import DbManagement
+        from ohmi_audit.main_app.models import Customer
+
+        upload = SimpleUploadedFile(
+            'customers.csv',
+            'year,BG Vor.Nr.,Unternehmen-bg,Unternehmen-en,Company ID,VAT\n'
+            '2026,BG-001/24,Тест ООД,TEST LTD,123456789,BG123456789\n'.encode('utf-8'),
+        )
+        preview = DbManagement.preview_import(upload)
+        preview['message'] = str(preview['message'])
+
+        with patch('ohmi_audit.main_app.views.db_management_views.AsyncResult') as mock_result:
+            mock_result.return_value.successful.return_value = True
+            mock_result.return_value.result = preview
+            resp = self.client.get(reverse('db_index'), {'preview': 'preview-123'})
+
+        mock_result.assert_called_once_with('preview-123')
+        assert resp.context['import_preview']['created_samples'] == ['BG-001/24']
+        assert b'BG-001/24' in resp.content
+        assert not Customer.objects.exists()
+
+    def test_export_is_dispatched_to_celery(self):
+        from unittest.mock import patch, MagicMock
+
+        with patch('ohmi_audit.main_app.views.db_management_views.export_customers_task') as mock_task:
+            mock_task.delay.return_value = MagicMock(id='export-123')
+            resp = self.client.post(reverse('db_index'), {'export_db': ''})
+
+        assert resp.status_code == 200
+        assert resp.context['task_id'] == 'export-123'
+
+
+@pytest.mark.django_db
+class TestPrivateFileView:
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        from django.core.files.base import ContentFile
+        from common.db_management import DbManagement
+
+        User.objects.create_user(username='u', email='u@example.com', password='p', first_name='U')
+        self.name = DbManagement.private_storage().save('import_reports/errors.csv', ContentFile(b'Row,Error\n'))
+        self.client = client
+
+    def test_requires_login(self):
+        resp = self.client.get(reverse('db_private_file', args=[self.name]))
+        assert resp.status_code == 302
+
+    def test_sends_the_file_as_attachment(self):
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_private_file', args=[self.name]))
+
+        assert resp.status_code == 200
+        assert 'attachment' in resp['Content-Disposition']
+        assert b''.join(resp.streaming_content) == b'Row,Error\n'
+
+    def test_sends_a_stored_export(self):
+        from common.db_management import DbManagement
+
+        self.client.login(username='u', password='p')
+        name, _created = DbManagement.export_to_storage()
+        resp = self.client.get(reverse('db_private_file', args=[name]))
+
+        assert resp.status_code == 200
+        assert resp['Content-Disposition'].startswith('attachment; filename="customers_')
+
+    @pytest.mark.parametrize('name', [
+        'import_reports/missing.csv', 'import_uploads/upload.xlsx', 'import_reports/../secret.txt', 'import_reports/',
+    ])
+    def test_other_files_are_404(self, name):
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_private_file', args=[name]))
+        assert resp.status_code == 404
+
+
+@pytest.mark.django_db
+class TestCustomerExportStreamView:
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        from ohmi_audit.main_app.models import Customer
+
+        Customer.objects.create(
+            year=2026, BG_Vor_Nr='ST-001/24', company_name_bg='Тест ООД', company_name_en='TEST LTD',
+            company_id=123456789, VAT_number='BG123456789',
+        )
+        User.objects.create_user(username='u', email='u@example.com', password='p', first_name='U')
+        self.client = client
+
+    def test_requires_login(self):
+        resp = self.client.get(reverse('db_export_stream', args=['csv']))
+        assert resp.status_code == 302
+
+    def test_csv_is_streamed_in_export_column_order(self):
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_export_stream', args=['csv']))
+
+        assert resp.status_code == 200
+        assert resp.streaming
+        assert resp['Content-Type'].startswith('text/csv')
+        lines = b''.join(resp.streaming_content).decode('utf-8').splitlines()
+        assert lines == [
+            'year,BG Vor.Nr.,Unternehmen-bg,Unternehmen-en,Company ID,VAT',
+            '2026,ST-001/24,Тест ООД,TEST LTD,123456789,BG123456789',
+        ]
+
+    def test_ndjson_is_gzipped_when_accepted(self):
+        import gzip
+        import json
+
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_export_stream', args=['ndjson']), HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        assert resp['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in resp['Vary']
+        body = gzip.decompress(b''.join(resp.streaming_content)).decode('utf-8')
+        assert [json.loads(line) for line in body.splitlines()] == [{
+            'year': 2026, 'BG_Vor_Nr': 'ST-001/24', 'company_name_bg': 'Тест ООД',
+            'company_name_en': 'TEST LTD', 'company_id': 123456789, 'VAT_number': 'BG123456789',
+        }]
+
+    def test_unknown_format_is_404(self):
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_export_stream', args=['xml']))
+        assert resp.status_code == 404
+
+    def test_since_limits_the_export_to_the_delta(self):
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_export_stream', args=['csv']), {'since': '2999-01-01T00:00:00'})
+
+        assert resp.status_code == 200
+        assert resp['X-Export-Cursor']
+        lines = b''.join(resp.streaming_content).decode('utf-8').splitlines()
+        assert lines == ['year,BG Vor.Nr.,Unternehmen-bg,Unternehmen-en,Company ID,VAT,deleted']
+
+    def test_invalid_since_is_400(self):
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_export_stream', args=['csv']), {'since': 'yesterday'})
+        assert resp.status_code == 400
+
+    def test_search_query_exports_only_the_search_result(self):
+        from ohmi_audit.main_app.models import Customer
+
+        Customer.objects.create(
+            year=2026, BG_Vor_Nr='ST-002/24', company_name_bg='Друго ООД', company_name_en='OTHER LTD',
+            company_id=987654321, VAT_number='BG987654321',
+        )
+        self.client.login(username='u', password='p')
+        resp = self.client.get(reverse('db_export_stream', args=['csv']), {'search_query': 'other'})
+
+        lines = b''.join(resp.streaming_content).decode('utf-8').splitlines()
+        assert [line.split(',')[1] for line in lines[1:]] == ['ST-002/24']
+
+    def test_search_query_exports_what_the_search_finds(self, clear_cache):
+        import json
+
+        self.client.login(username='u', password='p')
+        raw_query = '  TEST   LTD '
+        found = self.client.post(reverse('index'), {'search_query': raw_query}, content_type='application/json')
+        resp = self.client.get(reverse('db_export_stream', args=['ndjson']), {'search_query': raw_query})
+
+        exported = [json.loads(line)['BG_Vor_Nr'] for line in b''.join(resp.streaming_content).decode().splitlines()]
+        assert [row['BG_Vor_Nr'] for row in found.json()['results']] == exported == ['ST-001/24']